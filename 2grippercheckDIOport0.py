@@ -4,6 +4,7 @@ import socket
 import rbpodo as rb
 import numpy as np
 import time
+from robotarm_gripper import PulseScheduler
 
 
 ROBOT_IP = "192.168.0.22"
@@ -35,32 +36,29 @@ except socket.error as e:
     print("move_l_relative 함수는 작동하지 않습니다.")
     client_socket = None # 연결 실패 시 None으로 설정
 
+gripper = PulseScheduler(robot, rc)
+
 def grip(ord):
-    if(ord == "release"):
-        robot.set_dout_bit_combination(rc, 0, 3, 1, rb.Endian.LittleEndian)
-        time.sleep(0.1)
-        robot.set_dout_bit_combination(rc, 0, 3, 0, rb.Endian.LittleEndian)
-
-    elif(ord == "grab"):
-        robot.set_dout_bit_combination(rc, 0, 3, 2, rb.Endian.LittleEndian)
-        time.sleep(0.1)
-        robot.set_dout_bit_combination(rc, 0, 3, 0, rb.Endian.LittleEndian)
-        
-    else:
-        return
+    # release → DO0, grab → DO1 펄스 (100 ms 뒤 OFF 는 gripper 작업 스레드가 보냄)
+    return gripper.grip(ord)
 
 # 메인 실행 로직
 def main():
 
-    while True:
+    try:
+        while True:
+
+            grip("grab")
+
+            time.sleep(3)
+
+            grip("release")
+
+            time.sleep(3)
 
-        grip("grab")
+            print(gripper.format_stats()) # 실제 펄스 폭
+    finally:
+        gripper.stop()
 
-        time.sleep(3)
-        
-        grip("release")
-        
-        time.sleep(3)
-        
 if __name__ == "__main__":
     main()
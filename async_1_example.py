@@ -4,26 +4,31 @@ import logging
 import asyncio, datetime
 import rbpodo as rb
 import numpy as np
+from robotarm_telemetry import TelemetryRing, stream_telemetry
 
 logging.basicConfig(format='%(asctime)s.%(msecs)03d %(levelname)s %(message)s',
                     datefmt='%Y-%m-%d,%H:%M:%S',
                     level=logging.INFO)
 ROBOT_IP = "192.168.0.100"
+TELEMETRY_RATE_HZ = 100.0 # 데이터 채널 요청 주기 (None 이면 쉬지 않고 요청)
 
 
 class GLOBAL:
     running = True
     q = np.zeros((6,))
+    telemetry = TelemetryRing()
 
 
 async def get_data():
     data_channel = rb.asyncio.CobotData(ROBOT_IP)
 
-    while GLOBAL.running:
-        data = await data_channel.request_data()
-        logging.info(data.sdata.jnt_ref)
-        GLOBAL.q = data.sdata.jnt_ref
-        await asyncio.sleep(0.1)
+    def on_sample(ring):
+        GLOBAL.q = ring.latest_q()
+        if ring.count % 10 == 0: # 로그는 10개 중 1개만 출력
+            logging.info(GLOBAL.q)
+
+    await stream_telemetry(data_channel, GLOBAL.telemetry, rate_hz=TELEMETRY_RATE_HZ,
+                           is_running=lambda: GLOBAL.running, on_sample=on_sample)
 
 
 async def move_thread():
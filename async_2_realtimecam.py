@@ -3,67 +3,94 @@ import asyncio
 import datetime
 import rbpodo as rb
 import numpy as np
-import cv2  # OpenCV 라이브러리 추가 필요 (pip install opencv-python)
+from robotarm_lazy import lazy_import, is_headless
+from robotarm_telemetry import TelemetryRing, stream_telemetry
+from robotarm_camera import FrameGrabber
+from robotarm_recorder import SessionRecorder
+
+cv2 = lazy_import("cv2") # OpenCV 라이브러리 추가 필요 (pip install opencv-python), 카메라 태스크가 켜질 때 import
 
 logging.basicConfig(format='%(asctime)s.%(msecs)03d %(levelname)s %(message)s',
                     datefmt='%Y-%m-%d,%H:%M:%S',
                     level=logging.INFO)
 ROBOT_IP = "192.168.0.100"
+TELEMETRY_RATE_HZ = 100.0 # 데이터 채널 요청 주기 (None 이면 쉬지 않고 요청)
+
+# 기록 모드: True 면 프레임 + 관절/TCP 값을 RECORD_DIR 아래 메모리 맵 파일로 저장
+RECORD = False
+RECORD_DIR = "recordings"
+RECORD_MAX_SECONDS = 120.0
+
+# 헤드리스 모드 (ROBOTARM_HEADLESS=1 이거나 화면이 없을 때): 카메라 창을 띄우지 않고,
+# 기록 모드가 아니면 카메라 태스크도 실행하지 않음 (cv2 import 안 함)
+HEADLESS = is_headless()
+ENABLE_CAMERA = True
 
 
 class GLOBAL:
     running = True
     q = np.zeros((6,))
+    telemetry = TelemetryRing()
+    recorder = None # RECORD 모드일 때 SessionRecorder
 
 async def cam_viewer():
-    # 카메라 인덱스 1번 시도 (안되면 0번으로 변경하세요)
-    cap = cv2.VideoCapture(2)
-    
-    # 카메라가 열리지 않았을 경우 예외 처리
-    if not cap.isOpened():
-        logging.warning("Camera index 1 failed. Trying index 0...")
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
-            logging.error("No camera found.")
-            return
-
+    # 카메라 캡처는 별도 스레드(FrameGrabber)에서 하고, 여기서는 최신 프레임만 받아서 표시
+    # 카메라 인덱스 2번 → 0번 순서로 시도
+    rec = GLOBAL.recorder
+    grabber = FrameGrabber(indices=(2, 0), on_frame=rec.write_frame if rec else None)
+    if not grabber.open():
+        logging.error("No camera found.")
+        # 카메라가 없어도 프로그램이 죽지 않도록 리턴
+        return
+    if rec is not None:
+        rec.allocate_frames(grabber.frame_shape)
+
+    grabber.start()
     logging.info("Camera started.")
 
     while GLOBAL.running:
-        ret, frame = cap.read()
-        
-        if ret:
-            # (선택사항) 화면에 현재 로봇 관절 각도 텍스트 띄우기
-            text = f"Joint: {np.round(GLOBAL.q, 2)}"
-            cv2.putText(frame, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
-                        0.7, (0, 255, 0), 2)
-            
-            cv2.imshow("Robot Cam Viewer", frame)
-            
-            # OpenCV UI 갱신을 위한 짧은 대기 (1ms)
-            cv2.waitKey(1)
-        else:
+        # 새 프레임이 올 때까지 대기 (cap.read() 블로킹 없음)
+        item = await grabber.wait_frame(timeout=0.5)
+        if item is None:
             logging.warning("Failed to read frame.")
+            continue
+        frame, stamp, seq = item
+
+        # 프레임 촬영 시각에 가장 가까운 관절 샘플 사용
+        i = GLOBAL.telemetry.nearest_index(stamp)
+        q = GLOBAL.telemetry.q[i] if i >= 0 else GLOBAL.q
 
-        # [핵심] 비동기 루프 양보: 
-        # 이걸 넣지 않으면 로봇 통신과 move_thread가 멈춥니다.
-        # 약 30FPS(0.033초) 주기로 동작하도록 설정
-        await asyncio.sleep(0.03)
+        if HEADLESS:
+            continue # 기록은 캡처 스레드(on_frame)에서 이미 처리
+
+        # 로봇 관절 각도 텍스트 오버레이 (버퍼 위에 바로 그림)
+        text = f"Joint: {np.round(q, 2)}"
+        cv2.putText(frame, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.7, (0, 255, 0), 2)
+
+        cv2.imshow("Robot Cam Viewer", frame)
+
+        # OpenCV UI 갱신을 위한 짧은 대기 (1ms)
+        cv2.waitKey(1)
 
     # 루프 종료 후 자원 해제
-    cap.release()
-    cv2.destroyAllWindows()
-    logging.info("Camera closed.")
+    grabber.stop()
+    if not HEADLESS:
+        cv2.destroyAllWindows()
+    logging.info(f"Camera closed. {grabber.stats()}")
 
 
 async def get_data():
     data_channel = rb.asyncio.CobotData(ROBOT_IP)
 
-    while GLOBAL.running:
-        data = await data_channel.request_data()
-        # logging.info(data.sdata.jnt_ref) # 로그가 너무 많으면 주석 처리
-        GLOBAL.q = data.sdata.jnt_ref
-        await asyncio.sleep(0.1)
+    def on_sample(ring):
+        GLOBAL.q = ring.latest_q()
+        if GLOBAL.recorder is not None:
+            GLOBAL.recorder.write_sample(ring)
+        # logging.info(GLOBAL.q) # 로그가 너무 많으면 주석 처리
+
+    await stream_telemetry(data_channel, GLOBAL.telemetry, rate_hz=TELEMETRY_RATE_HZ,
+                           is_running=lambda: GLOBAL.running, on_sample=on_sample)
 
 
 async def move_thread():
@@ -109,16 +136,31 @@ async def move_thread():
 
 
 async def _main():
+    if RECORD:
+        session = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        GLOBAL.recorder = SessionRecorder(f"{RECORD_DIR}/{session}", max_seconds=RECORD_MAX_SECONDS,
+                                          sample_hz=TELEMETRY_RATE_HZ or 1000.0)
+        logging.info(f"Recording to {GLOBAL.recorder.path}")
+
     # task 생성 시 바로 실행됩니다.
     task1 = asyncio.create_task(get_data())
     task2 = asyncio.create_task(move_thread())
-    task3 = asyncio.create_task(cam_viewer())
+    task3 = None
+    if ENABLE_CAMERA and (not HEADLESS or GLOBAL.recorder is not None):
+        task3 = asyncio.create_task(cam_viewer())
+    else:
+        logging.info("Headless mode: camera viewer disabled.")
 
     # task2(로봇 이동)가 끝날 때까지 기다립니다.
     # task2가 끝나면 GLOBAL.running이 False가 되어 나머지 task도 종료됩니다.
     await task2 
     await task1
-    await task3
+    if task3 is not None:
+        await task3
+
+    if GLOBAL.recorder is not None:
+        GLOBAL.recorder.close()
+        logging.info(f"Recording saved: {GLOBAL.recorder.stats()}")
 
 
 if __name__ == "__main__":
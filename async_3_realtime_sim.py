@@ -3,136 +3,86 @@ import asyncio
 import datetime
 import rbpodo as rb
 import numpy as np
-import cv2
 
-# [중요] Matplotlib 충돌 방지 (Qt 에러 해결용)
-import matplotlib
-matplotlib.use('TkAgg') 
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+from robotarm_lazy import lazy_import, is_headless
+from robotarm_telemetry import TelemetryRing, stream_telemetry
+from robotarm_camera import FrameGrabber
+from robotarm_viewer import PoseViewer # 3D 뷰어 (별도 프로세스에서 matplotlib 실행, 뷰어를 켤 때 import)
 
-
-try:
-    from vector_calculator.functions_sim_for_850 import Transform3D, RobotArm
-except ImportError:
-    print("오류: 'functions_sim_for_850.py' 파일을 찾을 수 없습니다.")
-    exit()
+cv2 = lazy_import("cv2") # 카메라 태스크가 켜질 때 import
 
 logging.basicConfig(format='%(asctime)s.%(msecs)03d %(levelname)s %(message)s',
                     datefmt='%Y-%m-%d,%H:%M:%S',
                     level=logging.INFO)
 
 ROBOT_IP = "192.168.0.100"
+TELEMETRY_RATE_HZ = 100.0 # 데이터 채널 요청 주기 (None 이면 쉬지 않고 요청)
+
+# 헤드리스 모드 (ROBOTARM_HEADLESS=1 이거나 화면이 없을 때): 카메라 창과 3D 뷰어를 띄우지 않음
+HEADLESS = is_headless()
+ENABLE_CAMERA = not HEADLESS
+ENABLE_VIEWER = not HEADLESS
 
 class GLOBAL:
     running = True
-    q = np.zeros((6,)) # 실시간 관절 각도 공유 변수
+    q = np.zeros((6,)) # 실시간 관절 각도 공유 변수 (telemetry 최신 샘플 view)
+    telemetry = TelemetryRing() # 최근 관절/TCP 샘플 링 버퍼
 
 async def mat_plot_sim():
     """
-    matplotlib를 이용하여 GLOBAL.q 값을 실시간으로 반영하여 로봇 자세를 그립니다.
+    별도 프로세스 뷰어(robotarm_viewer)에 GLOBAL.q 를 넘겨 로봇 자세를 실시간으로 그립니다.
+    화면 그리기는 뷰어 프로세스가 하므로, 이 코루틴은 공유 메모리에 관절 값만 씁니다.
     """
     logging.info("Starting 3D Simulation Viewer...")
-    
-    # functions_sim_for_850.py에 정의된 RobotArm 클래스 사용
-    try:
-        # dh_param_file 경로가 맞는지 확인하세요
-        robot_sim = RobotArm(num_axes=6, dh_param_file='rb5_850_dh.csv')
-    except Exception as e:
-        logging.error(f"Failed to initialize RobotArm: {e}")
-        return
-
-    # Plot 설정
-    plt.ion() # Interactive Mode 켜기
-    fig = plt.figure(figsize=(10, 8))
-    ax = fig.add_subplot(111, projection='3d')
-    
-    # 뷰 범위 설정
-    plot_range = 1000
-    ax.set_xlim([-plot_range, plot_range])
-    ax.set_ylim([-plot_range, plot_range])
-    ax.set_zlim([0, 1200])
-    ax.set_xlabel('X [mm]')
-    ax.set_ylabel('Y [mm]')
-    ax.set_zlabel('Z [mm]')
-    ax.set_title("Real-time Robot Simulation")
-    ax.view_init(elev=20, azim=45)
-
-    # 초기 빈 그래프 생성 (선과 점)
-    line_robot, = ax.plot([], [], [], 'o-', lw=3, markersize=6, color='black', label='Link')
-    scat_ee = ax.scatter([], [], [], s=100, c='cyan', marker='X', label='End Effector')
-    ax.legend()
+    viewer = PoseViewer(dh_param_file='rb5_850_dh.csv')
+    viewer.start()
 
-    while GLOBAL.running:
-        # (1) 현재 관절 각도 가져오기
-        current_q = GLOBAL.q
-        
-        # (2) 로봇 모델 업데이트
-        robot_sim.set_joint_angles(current_q)
-        
-        # (3) 링크 위치 계산 (Forward Kinematics)
-        poses = robot_sim.get_all_link_poses()
-        
-        # (4) 좌표 추출
-        points = [np.array([0, 0, 0])] # 베이스 원점
-        for pose in poses:
-            points.append(pose.get_translation())
-        
-        xs = [p[0] for p in points]
-        ys = [p[1] for p in points]
-        zs = [p[2] for p in points]
-
-        # (5) 그래프 데이터 갱신
-        line_robot.set_data(xs, ys)
-        line_robot.set_3d_properties(zs)
-        
-        if points:
-            scat_ee._offsets3d = ([xs[-1]], [ys[-1]], [zs[-1]])
+    while GLOBAL.running and viewer.is_alive():
+        viewer.publish(GLOBAL.q)
+        await asyncio.sleep(0.02)
 
-        # (6) 화면 그리기
-        fig.canvas.draw_idle()
-        fig.canvas.flush_events()
-        
-        # UI 반응성을 위해 잠시 대기
-        await asyncio.sleep(0.05)
-
-    plt.close(fig)
+    viewer.stop()
     logging.info("Simulation Viewer closed.")
 
 
 async def cam_viewer():
-    # 카메라 0번 시도
-    cap = cv2.VideoCapture(0)
-    
-    if not cap.isOpened():
-        logging.warning("Camera index 0 failed. Trying index 2...")
-        cap = cv2.VideoCapture(2)
-        if not cap.isOpened():
-            logging.error("No camera found.")
-            # 카메라가 없어도 프로그램이 죽지 않도록 리턴
-            return
+    # 카메라 캡처는 별도 스레드(FrameGrabber)에서 하고, 여기서는 최신 프레임만 받아서 표시
+    # 카메라 0번 → 2번 순서로 시도
+    grabber = FrameGrabber(indices=(0, 2))
+    if not grabber.open():
+        logging.error("No camera found.")
+        # 카메라가 없어도 프로그램이 죽지 않도록 리턴
+        return
 
+    grabber.start()
     logging.info("Camera started.")
 
     while GLOBAL.running:
-        ret, frame = cap.read()
-        if ret:
-            # 로봇 관절 각도 텍스트 오버레이
-            text = f"Joint: {np.round(GLOBAL.q, 2)}"
-            cv2.putText(frame, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
-                        0.7, (0, 255, 0), 2)
-            
-            cv2.imshow("Robot Cam Viewer", frame)
-            
-            # 키 입력 대기 (1ms) - OpenCV 창 갱신 필수
-            cv2.waitKey(1)
-        
-        # 비동기 양보 (30FPS 제한)
-        await asyncio.sleep(0.03)
+        # 새 프레임이 올 때까지 대기 (cap.read() 블로킹 없음)
+        item = await grabber.wait_frame(timeout=0.5)
+        if item is None:
+            logging.warning("Failed to read frame.")
+            continue
+        frame, stamp, seq = item
 
-    cap.release()
+        # 프레임 촬영 시각에 가장 가까운 관절 샘플 사용
+        i = GLOBAL.telemetry.nearest_index(stamp)
+        q = GLOBAL.telemetry.q[i] if i >= 0 else GLOBAL.q
+
+        # 로봇 관절 각도 텍스트 오버레이 (버퍼 위에 바로 그림)
+        text = f"Joint: {np.round(q, 2)}"
+        cv2.putText(frame, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.7, (0, 255, 0), 2)
+
+        cv2.imshow("Robot Cam Viewer", frame)
+
+        # OpenCV UI 갱신을 위한 짧은 대기 (1ms)
+        cv2.waitKey(1)
+
+    # 루프 종료 후 자원 해제
+    grabber.stop()
     cv2.destroyAllWindows()
-    logging.info("Camera closed.")
+    logging.info(f"Camera closed. {grabber.stats()}")
 
 
 async def get_data():
@@ -141,12 +91,13 @@ async def get_data():
     # 연결 실패해도 시뮬레이션은 돌 수 있도록 예외처리
     try:
         logging.info("Connecting to Data Channel...")
-        while GLOBAL.running:
-            # 로봇 연결 상태라면 실제 데이터를 받음
-            data = await data_channel.request_data()
-            if data is not None:
-                GLOBAL.q = data.sdata.jnt_ref
-            await asyncio.sleep(0.1)
+
+        def on_sample(ring):
+            GLOBAL.q = ring.latest_q()
+
+        # 로봇 연결 상태라면 실제 데이터를 링 버퍼에 계속 기록
+        await stream_telemetry(data_channel, GLOBAL.telemetry, rate_hz=TELEMETRY_RATE_HZ,
+                               is_running=lambda: GLOBAL.running, on_sample=on_sample)
     except Exception as e:
         logging.warning(f"Data channel error (Simulation Mode?): {e}")
         # 로봇 연결이 안 되면 루프만 유지 (GLOBAL.q는 move_thread가 업데이트한다고 가정)
@@ -211,11 +162,16 @@ async def move_thread():
 
 
 async def _main():
-    # 4개의 비동기 태스크 동시 실행
+    # 비동기 태스크 동시 실행 (카메라 / 뷰어는 켜져 있을 때만)
     task1 = asyncio.create_task(get_data())
     task2 = asyncio.create_task(move_thread())
-    task3 = asyncio.create_task(cam_viewer())
-    task4 = asyncio.create_task(mat_plot_sim())
+    tasks = []
+    if ENABLE_CAMERA:
+        tasks.append(asyncio.create_task(cam_viewer()))
+    if ENABLE_VIEWER:
+        tasks.append(asyncio.create_task(mat_plot_sim()))
+    if HEADLESS:
+        logging.info(f"Headless mode: camera {'on' if ENABLE_CAMERA else 'off'}, viewer {'on' if ENABLE_VIEWER else 'off'}")
 
     # move_thread(task2)가 메인 컨트롤러 역할을 하므로
     # task2가 끝날 때까지 기다렸다가 나머지도 종료
@@ -224,8 +180,8 @@ async def _main():
     # move_thread가 끝나면 GLOBAL.running이 False가 되므로
     # 나머지 태스크들도 자연스럽게 루프를 빠져나오기를 기다림
     await task1
-    await task3
-    await task4
+    for task in tasks:
+        await task
 
 if __name__ == "__main__":
     try:
@@ -1,28 +1,40 @@
 import logging
 import asyncio
+import time
 import numpy as np
-import cv2
-import matplotlib
 
-# [중요] Matplotlib 충돌 방지
-matplotlib.use('TkAgg') 
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-
-# 클래스 Import
-try:
-    from vector_calculator.functions_sim_for_850 import Transform3D, RobotArm
-except ImportError:
-    print("오류: 'functions_sim_for_850.py' 파일을 찾을 수 없습니다.")
-    exit()
+# 기구학 모델 / 시뮬레이션 시계 / 3D 뷰어 Import
+import robotarm_kinematics as rk
+from robotarm_timing import plan_joint_moves # move_j 시간 계획 (관절 한계 + 사다리꼴 / S-curve)
+from robotarm_simclock import make_clock
+from robotarm_viewer import PoseViewer # 별도 프로세스에서 matplotlib 실행 (뷰어를 켤 때 import)
+from robotarm_lazy import is_headless
 
 logging.basicConfig(format='%(asctime)s.%(msecs)03d %(levelname)s %(message)s',
                     datefmt='%Y-%m-%d,%H:%M:%S',
                     level=logging.INFO)
 
+# 시뮬레이션 시계 모드
+# "realtime": 실제 시간과 같은 속도 (뷰어 사용)
+# "virtual" : 대기 없이 최대 속도로 가상 시간 진행 (뷰어 끔, 사이클 타임 추정용)
+# "scaled"  : SIM_TIME_SCALE 배속 (뷰어 사용)
+SIM_CLOCK_MODE = "realtime"
+SIM_TIME_SCALE = 4.0
+
+# 시나리오: "demo" (홈 → 준비 자세 → Move L) / "cycle_2" (files/show10.py cycle_2 1회전 근사)
+SIM_SCENARIO = "demo"
+
+# sim_move_j 관절 저크 (deg/s^3). None 이면 사다리꼴, 값을 넣으면 S-curve 프로파일
+SIM_JOINT_JERK_DEG = None
+
+# 헤드리스 모드 (ROBOTARM_HEADLESS=1 이거나 화면이 없을 때): 뷰어 없이 시뮬레이션만 실행
+HEADLESS = is_headless()
+ENABLE_VIEWER = not HEADLESS
+
 class GLOBAL:
     running = True
     q = np.zeros((6,)) # 현재 로봇 관절 각도 (공유 변수)
+    clock = None # 시뮬레이션 시계 (_main 에서 생성)
 
 # ------------------------------------------------------------------
 # [핵심] Jacobian 기반 오프라인 시뮬레이션
@@ -31,152 +43,178 @@ async def jac_sim():
     logging.info("Starting Jacobian-based Simulation (Offline)...")
     
     # 계산용 로봇 모델 생성
-    robot_model = RobotArm(num_axes=6)
+    robot_model = rk.RobotArm(num_axes=6)
     
     # --- 내부 함수 1: Joint Move (관절 이동) ---
-    async def sim_move_j(target_q, vel_deg=60.0):
+    async def sim_move_j(target_q, vel_deg=60.0, acc_deg=120.0):
+        """
+        move_j(target_q, vel_deg, acc_deg) 와 같은 인자로 관절 이동을 흉내 냅니다.
+        관절 한계(robotarm_timing.JOINT_*_LIMIT_DEG)까지 적용한 동기화 프로파일을 따라가고 이동 시간(s)을 반환합니다.
+        """
         logging.info(f"Move J -> Target: {target_q}")
         
         start_q = np.copy(GLOBAL.q)
-        diff = target_q - start_q
-        max_dist = np.max(np.abs(diff))
+        motion = plan_joint_moves(start_q, target_q, vel_deg, acc_deg, jerk=SIM_JOINT_JERK_DEG)
+        duration = float(motion.duration[0])
         
-        if max_dist == 0: return
+        if duration == 0: return 0.0
         
-        duration = max_dist / vel_deg
         dt = 0.05
-        steps = int(duration / dt)
-        if steps < 1: steps = 1
+        steps = int(np.ceil(duration / dt))
         
-        for i in range(steps + 1):
+        for i in range(1, steps + 1):
             if not GLOBAL.running: break
-            t = i / steps
-            # Smooth step (Ease-in-out)
-            smooth_t = t * t * (3 - 2 * t)
-            GLOBAL.q = start_q + diff * smooth_t
-            await asyncio.sleep(dt)
+            # 마지막 칸은 남은 시간만큼만 기다려서 이동 시간을 프로파일과 맞춤
+            t = min(i * dt, duration)
+            await GLOBAL.clock.sleep(t - (i - 1) * dt)
+            GLOBAL.q = motion.q_at(t)[0]
         
-        GLOBAL.q = target_q # 오차 보정
+        GLOBAL.q = np.asarray(target_q, dtype=float) # 오차 보정
+        return duration
 
     # --- 내부 함수 2: Linear Move (직선 이동 via Jacobian) ---
-    async def sim_move_l(target_6d, vel_mm=100.0):
+    async def sim_move_l(target_6d, vel_mm=100.0, vel_deg=30.0, gain=2.0):
         """
         target_6d: [x, y, z, rx, ry, rz] (mm, deg)
+        위치와 자세(6D)를 함께 서보합니다. 수렴 통계(ServoStats)를 반환합니다.
         """
         logging.info(f"Move L -> Target: {target_6d}")
         
         target_pos = np.array(target_6d[:3])
-        # 목표 회전 (Euler -> Matrix) - 단순화를 위해 위치 제어 위주로 구현
-        # (완벽한 6D 제어를 위해서는 쿼터니언 오차 등을 써야 하지만 여기선 약식 구현)
+        # 목표 회전 (Euler -> Matrix), 자세 오차는 쿼터니언 기반 회전 벡터로 계산
+        target_rot = rk.rpy_to_rotation(target_6d[3:], degrees=True)
         
         dt = 0.05
+        servo = rk.CartesianServo(robot_model, target_pos, target_rot,
+                                  vel_mm=vel_mm, vel_deg=vel_deg, dt=dt, gain=gain)
         
         while GLOBAL.running:
-            # 1. 모델 업데이트
-            robot_model.set_joint_angles(GLOBAL.q)
-            
-            # 2. 현재 EE 위치 파악
-            curr_ee = robot_model.get_end_effector_pose()
-            curr_pos = curr_ee.get_translation()
-            
-            # 3. 오차 벡터 계산
-            err_pos = target_pos - curr_pos
-            dist = np.linalg.norm(err_pos)
-            
-            if dist < 1.0: # 1mm 이내 도착 시 종료
+            # 순기구학 + 자코비안 → 6D 오차 → 적응형 감쇠 DLS → 관절 한계 클램프
+            q_next, done = servo.step(GLOBAL.q)
+            if done:
                 break
-                
-            # 4. 속도 벡터 생성
-            speed = min(vel_mm, dist * 2.0) # P제어 느낌으로 감속
-            v_vec = (err_pos / dist) * speed
-            
-            # 6x1 Task Velocity [vx, vy, vz, wx, wy, wz]
-            # 여기서는 회전(Orientation)은 유지한다고 가정 (wx=wy=wz=0)
-            v_task = np.array([v_vec[0], v_vec[1], v_vec[2], 0, 0, 0])
-            
-            # 5. Jacobian 역기구학
-            J = robot_model.get_jacobian()
-            
-            # Damped Least Squares (특이점 방지 역행렬)
-            lambda_sq = 0.01
-            J_inv = J.T @ np.linalg.inv(J @ J.T + lambda_sq * np.eye(6))
-            
-            dq_rad = J_inv @ v_task
-            dq_deg = np.rad2deg(dq_rad)
-            
-            # 6. 관절 업데이트
-            GLOBAL.q = GLOBAL.q + dq_deg * dt
-            await asyncio.sleep(dt)
+            GLOBAL.q = q_next
+            await GLOBAL.clock.sleep(dt)
+
+        logging.info(f"Move L finished: {servo.stats}")
+        return servo.stats
+
+    # --- 내부 함수 3: 현재 자세 유지 상대 직선 이동 ---
+    async def sim_move_l_rel(delta_xyz, vel_mm=100.0, gain=2.0):
+        curr_tf = robot_model.fk_batch(GLOBAL.q)[0, -1]
+        target_xyz = curr_tf[:3, 3] + np.asarray(delta_xyz, dtype=float)
+        target_rpy = rk.rotation_to_rpy(curr_tf[:3, :3], degrees=True)
+        return await sim_move_l(np.concatenate((target_xyz, target_rpy)), vel_mm=vel_mm, gain=gain)
+
+    # --- 시나리오 1: 데모 ---
+    async def scenario_demo():
+        # 1. 홈으로 이동
+        await sim_move_j(np.array([0, 0, 0, 0, 0, 0]))
+        await GLOBAL.clock.sleep(1)
+        
+        # 2. 준비 자세
+        # 
+        await sim_move_j(np.array([0, -45, 90, -45, 90, 0]))
+        await GLOBAL.clock.sleep(1)
+        
+        # 3. Move L 테스트 (현재 자세에서 앞으로 쭉 뻗기)
+        # 현재 좌표 계산
+        curr_tf = robot_model.fk_batch(GLOBAL.q)[0, -1]
+        curr_xyz = curr_tf[:3, 3]
+        curr_rpy = rk.rotation_to_rpy(curr_tf[:3, :3], degrees=True)
+        
+        # 목표: X축 +150mm, Z축 -50mm
+        target_xyz = curr_xyz + np.array([150, 0, -50])
+        target_6d = np.concatenate((target_xyz, curr_rpy))
+        
+        logging.info("--- 직선 이동 시작 (Move L) ---")
+        await sim_move_l(target_6d, vel_mm=80.0)
+
+    # --- 시나리오 2: files/show10.py cycle_2 1회전 (테이블 1→2, 3→1, 2→3, 각 6칸) ---
+    # 실제 코드는 사용자 좌표계 2번 기준 move_l_rel 로 테이블 사이를 이동하지만,
+    # 여기서는 테이블 사이는 pose_desk 의 각 테이블 1번 칸 자세로 move_j,
+    # 칸 사이/상하 이동은 베이스 좌표계 기준 move_l 로 근사합니다.
+    async def scenario_cycle_2():
+        table_pose = {1: np.array([-166.67, 37.03, 94.11, -41.15, 89.96, 76.46]),
+                      2: np.array([-138.44, 51.74, 65.89, -27.64, 89.96, 48.44]),
+                      3: np.array([-88.57, 15.13, 131.94, -57.08, 89.96, -1.42])}
+        area_offset = {1: (0.0, 0.0), 2: (-80.0, 0.0), 3: (-160.0, 0.0),
+                       4: (0.0, -80.0), 5: (-80.0, -80.0), 6: (-160.0, -80.0)}
+        md_distance = 50.0
+        vel_j = 150.0 # 관절 이동 속도 (deg/s)
+        acc_j = 150.0 # 관절 이동 가속도 (deg/s^2), show10 의 move_j_acceleration_init
+        vel_l = 500.0 # 상대 이동 속도 (mm/s)
+        grip_time = 0.1 # 그리퍼 펄스 시간 (s)
+
+        async def unit(table, area):
+            await sim_move_j(table_pose[table], vel_deg=vel_j, acc_deg=acc_j)
+            dx, dy = area_offset[area]
+            if dx or dy:
+                await sim_move_l_rel([dx, dy, 0.0], vel_mm=vel_l, gain=10.0)
+            await sim_move_l_rel([0.0, 0.0, -md_distance], vel_mm=vel_l, gain=10.0)
+            await GLOBAL.clock.sleep(grip_time)
+            await sim_move_l_rel([0.0, 0.0, md_distance], vel_mm=vel_l, gain=10.0)
+
+        t_start = GLOBAL.clock.now()
+        for src, dst in ((1, 2), (3, 1), (2, 3)):
+            for area in range(1, 7):
+                if not GLOBAL.running: return
+                await unit(src, area)
+                await unit(dst, area)
+        logging.info(f"cycle_2 1회전 예상 시간: {GLOBAL.clock.now() - t_start:.2f} s")
 
     # ==========================================
     # 시뮬레이션 시나리오 시작
     # ==========================================
-    await asyncio.sleep(2)
-    
-    # 1. 홈으로 이동
-    await sim_move_j(np.array([0, 0, 0, 0, 0, 0]))
-    await asyncio.sleep(1)
-    
-    # 2. 준비 자세
-    # 
-    await sim_move_j(np.array([0, -45, 90, -45, 90, 0]))
-    await asyncio.sleep(1)
-    
-    # 3. Move L 테스트 (현재 자세에서 앞으로 쭉 뻗기)
-    # 현재 좌표 계산
-    robot_model.set_joint_angles(GLOBAL.q)
-    curr_tf = robot_model.get_end_effector_pose()
-    curr_xyz = curr_tf.get_translation()
-    curr_rpy = curr_tf.get_euler_angles(degrees=True)
-    
-    # 목표: X축 +150mm, Z축 -50mm
-    target_xyz = curr_xyz + np.array([150, 0, -50])
-    target_6d = np.concatenate((target_xyz, curr_rpy))
-    
-    logging.info("--- 직선 이동 시작 (Move L) ---")
-    await sim_move_l(target_6d, vel_mm=80.0)
-    
-    logging.info("Simulation Finished.")
+    await GLOBAL.clock.sleep(2)
+
+    wall_start = time.perf_counter()
+    sim_start = GLOBAL.clock.now()
+    if SIM_SCENARIO == "cycle_2":
+        await scenario_cycle_2()
+    else:
+        await scenario_demo()
+
+    logging.info(f"Simulation Finished. (시뮬레이션 {GLOBAL.clock.now() - sim_start:.2f} s / "
+                 f"실제 {time.perf_counter() - wall_start:.2f} s)")
+    if SIM_CLOCK_MODE == "virtual" or not ENABLE_VIEWER:
+        # 가상 시간 모드 / 헤드리스 모드는 뷰어가 없으므로 바로 종료
+        GLOBAL.running = False
     while GLOBAL.running:
         await asyncio.sleep(1)
 
 # ------------------------------------------------------------------
-# 시각화 (기존과 동일)
+# 시각화 (별도 프로세스 뷰어)
 # ------------------------------------------------------------------
 async def mat_plot_sim():
-    logging.info("Starting 3D Viewer...")
-    robot_sim = RobotArm(num_axes=6) # 뷰어용 모델
-    
-    plt.ion()
-    fig = plt.figure(figsize=(10, 8))
-    ax = fig.add_subplot(111, projection='3d')
-    ax.set_xlim([-1000, 1000]); ax.set_ylim([-1000, 1000]); ax.set_zlim([0, 1200])
-    ax.view_init(elev=20, azim=45)
-    
-    line_robot, = ax.plot([], [], [], 'o-', lw=3, color='black')
-    scat_ee = ax.scatter([], [], [], s=100, c='cyan', marker='X')
+    """
+    별도 프로세스 뷰어(robotarm_viewer)에 GLOBAL.q 를 넘겨 로봇 자세를 실시간으로 그립니다.
+    화면 그리기는 뷰어 프로세스가 하므로, 이 코루틴은 공유 메모리에 관절 값만 씁니다.
+    """
+    logging.info("Starting 3D Simulation Viewer...")
+    viewer = PoseViewer()
+    viewer.start()
+
+    while GLOBAL.running and viewer.is_alive():
+        viewer.publish(GLOBAL.q)
+        await asyncio.sleep(0.02)
+
+    viewer.stop()
+    logging.info("Simulation Viewer closed.")
 
-    while GLOBAL.running:
-        robot_sim.set_joint_angles(GLOBAL.q)
-        poses = robot_sim.get_all_link_poses()
-        points = [np.array([0,0,0])] + [p.get_translation() for p in poses]
-        
-        xs, ys, zs = zip(*points)
-        line_robot.set_data(xs, ys)
-        line_robot.set_3d_properties(zs)
-        scat_ee._offsets3d = ([xs[-1]], [ys[-1]], [zs[-1]])
-        
-        fig.canvas.draw_idle()
-        fig.canvas.flush_events()
-        await asyncio.sleep(0.05)
-    plt.close(fig)
 
 async def _main():
+    GLOBAL.clock = make_clock(SIM_CLOCK_MODE, SIM_TIME_SCALE)
+
     # 시뮬레이터(jac_sim)와 뷰어(mat_plot_sim) 병렬 실행
+    # 가상 시간 모드 / 헤드리스 모드에서는 뷰어 없이 시뮬레이터만 실행
     t1 = asyncio.create_task(jac_sim())
-    t2 = asyncio.create_task(mat_plot_sim())
+    t2 = None
+    if SIM_CLOCK_MODE != "virtual" and ENABLE_VIEWER:
+        t2 = asyncio.create_task(mat_plot_sim())
     await t1
-    await t2
+    if t2 is not None:
+        await t2
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,303 @@
+# rbpodo 클라이언트 호출 지연시간 / 처리량 벤치마크
+# robotarm_functions.py, files/show10.py, async_* 예제가 쓰는 기본 호출을 하나씩 반복 실행해서
+# 호출당 지연시간(p50/p95/p99)과 초당 호출 수를 JSON 으로 저장합니다.
+#
+#   sync  : rb.Cobot / rb.CobotData            (robotarm_functions, show10)
+#   async : rb.asyncio.Cobot / rb.asyncio.CobotData (async_* 예제)
+#   script: ScriptClient (robotarm_script, show10 send_command / wait_for_motion 이 쓰는 포트 5000 소켓)
+#
+# 호출 빈도에 따른 변화도 보기 위해 RATES_HZ 의 각 목표 빈도로 호출 간격을 맞춰 반복합니다 (None: 쉬지 않고 호출).
+#
+#   python bench_client.py                           # 로컬 에뮬레이터(robotarm_emulator) 상대, 결과는 bench_client.json
+#   python bench_client.py robot 300 real.json       # IP_robotarm.txt 의 실제 로봇 상대 (이동 명령이 실제로 나갑니다!)
+#
+# 에뮬레이터 상대로 rbpodo 조회 응답(get_system_variable / get_tcp_info) 형식은 실제 제어기와 다를 수 있어
+# 실패하면 errors 로 기록하고 다음 항목으로 넘어갑니다.
+
+import os
+import sys
+import json
+import time
+import asyncio
+import platform
+import numpy as np
+
+try:
+    import rbpodo as rb
+except ImportError: # rbpodo 가 없으면 script 항목만 측정
+    rb = None
+
+from robotarm_script import ScriptClient
+from robotarm_emulator import RobotEmulator, COMMAND_PORT, DATA_PORT
+
+N_ITER = 200 # 항목 / 빈도마다 호출 수
+RATES_HZ = [None, 100.0, 20.0] # 목표 호출 빈도
+EMULATOR_TIME_SCALE = 100.0 # 에뮬레이터 이동 배속 (이동 시간보다 통신 지연을 보기 위함)
+MAX_CONSECUTIVE_ERRORS = 5
+OUTPUT_FILE = "bench_client.json"
+
+# 이동 항목: 두 자세를 번갈아 move_j (J1 ±1 도)
+MOVE_POSES = (np.array([0.0, 0.0, 90.0, 0.0, 90.0, 0.0]), np.array([1.0, 0.0, 90.0, 0.0, 90.0, 0.0]))
+MOVE_VEL, MOVE_ACC = 60.0, 120.0
+
+
+def summarize(api, primitive, rate_hz, samples_ms, wall, errors):
+    """측정값 → JSON 결과 1개."""
+    result = {"api": api, "primitive": primitive, "rate_hz": rate_hz, "n": int(len(samples_ms)), "errors": errors}
+    if len(samples_ms):
+        s = np.asarray(samples_ms)
+        p50, p95, p99 = np.percentile(s, [50, 95, 99])
+        result.update({"mean_ms": float(s.mean()), "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+                       "max_ms": float(s.max()), "calls_per_s": len(s) / wall if wall > 0 else None})
+    return result
+
+
+def report(r):
+    rate = "max" if r["rate_hz"] is None else f"{r['rate_hz']:.0f}Hz"
+    name = f"{r['api']}.{r['primitive']} @{rate}"
+    if "p50_ms" not in r:
+        print(f"{name:<36} 측정 실패 (errors {r['errors']})")
+        return
+    print(f"{name:<36} p50 {r['p50_ms']:8.3f} ms | p95 {r['p95_ms']:8.3f} | p99 {r['p99_ms']:8.3f} "
+          f"| {r['calls_per_s']:8.1f} calls/s | errors {r['errors']}")
+
+
+def run_sync(func, n_iter, rate_hz):
+    """func() 를 rate_hz 간격으로 n_iter 번 호출. (지연시간 ms 목록, 전체 시간 s, 실패 수)"""
+    samples, errors, streak = [], 0, 0
+    period = 0.0 if rate_hz is None else 1.0 / rate_hz
+    t_start = time.perf_counter()
+    for i in range(n_iter):
+        if period:
+            delay = t_start + i * period - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        t0 = time.perf_counter()
+        try:
+            func()
+        except Exception:
+            errors += 1
+            streak += 1
+            if streak >= MAX_CONSECUTIVE_ERRORS:
+                break
+            continue
+        streak = 0
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples, time.perf_counter() - t_start, errors
+
+
+async def run_async(coro_func, n_iter, rate_hz):
+    """run_sync 의 asyncio 판."""
+    samples, errors, streak = [], 0, 0
+    period = 0.0 if rate_hz is None else 1.0 / rate_hz
+    t_start = time.perf_counter()
+    for i in range(n_iter):
+        if period:
+            delay = t_start + i * period - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        t0 = time.perf_counter()
+        try:
+            await coro_func()
+        except Exception:
+            errors += 1
+            streak += 1
+            if streak >= MAX_CONSECUTIVE_ERRORS:
+                break
+            continue
+        streak = 0
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples, time.perf_counter() - t_start, errors
+
+
+def compare(results, base="sync", other="async"):
+    """같은 항목 / 빈도의 base 대비 other p50, p99 비율 (other / base)."""
+    table = {(r["api"], r["primitive"], r["rate_hz"]): r for r in results if "p50_ms" in r}
+    out = []
+    for (api, name, rate), r in table.items():
+        o = table.get((other, name, rate))
+        if api != base or o is None:
+            continue
+        out.append({"primitive": name, "rate_hz": rate, f"{base}_p50_ms": r["p50_ms"], f"{other}_p50_ms": o["p50_ms"],
+                    "p50_ratio": o["p50_ms"] / r["p50_ms"], "p99_ratio": o["p99_ms"] / r["p99_ms"]})
+    return out
+
+
+# ====== 항목 ======
+
+def script_primitives(ip, port):
+    """포트 5000 스크립트 소켓 항목 (rbpodo 불필요)."""
+    script = ScriptClient(ip, port=port)
+    if not script.connect():
+        return None, {}
+    toggle = [0]
+
+    def send_command():
+        script.request("sdw default_speed 1.0")
+
+    def move():
+        toggle[0] ^= 1
+        q = MOVE_POSES[toggle[0]]
+        cmd = f"move_j(jnt[{', '.join(f'{v:.3f}' for v in q)}], {MOVE_VEL}, {MOVE_ACC})"
+        if not script.move(cmd, timeout=10.0):
+            raise TimeoutError(cmd)
+
+    return script, {"send_command": send_command, "move_j+wait": move}
+
+
+def sync_primitives(ip):
+    robot = rb.Cobot(ip)
+    rc = rb.ResponseCollector()
+    data_channel = rb.CobotData(ip)
+    toggle = [0]
+
+    def move():
+        toggle[0] ^= 1
+        robot.move_j(rc, MOVE_POSES[toggle[0]], MOVE_VEL, MOVE_ACC)
+        if not robot.wait_for_move_started(rc, 0.5).is_success():
+            raise TimeoutError("move_j 이동이 시작되지 않음") # 시작 대기 시간만 잰 값이 기록되지 않도록 실패로 셈
+        robot.wait_for_move_finished(rc)
+        rc.error().throw_if_not_empty()
+
+    def get_system_variable():
+        robot.get_system_variable(rc, rb.SystemVariable.SD_J0_ANG)
+
+    def get_tcp_info():
+        robot.get_tcp_info(rc)
+
+    def request_data():
+        if data_channel.request_data(1.0) is None:
+            raise TimeoutError("request_data")
+
+    return {"move_j+wait": move, "get_system_variable": get_system_variable,
+            "get_tcp_info": get_tcp_info, "request_data": request_data}
+
+
+def async_primitives(ip):
+    robot = rb.asyncio.Cobot(ip)
+    rc = rb.ResponseCollector()
+    data_channel = rb.asyncio.CobotData(ip)
+    toggle = [0]
+
+    async def move():
+        toggle[0] ^= 1
+        await robot.move_j(rc, MOVE_POSES[toggle[0]], MOVE_VEL, MOVE_ACC)
+        if (await robot.wait_for_move_started(rc, 0.5)).type() != rb.ReturnType.Success:
+            raise TimeoutError("move_j 이동이 시작되지 않음")
+        await robot.wait_for_move_finished(rc)
+        rc.error().throw_if_not_empty()
+
+    async def get_system_variable():
+        await robot.get_system_variable(rc, rb.SystemVariable.SD_J0_ANG)
+
+    async def get_tcp_info():
+        await robot.get_tcp_info(rc)
+
+    async def request_data():
+        if await data_channel.request_data() is None:
+            raise TimeoutError("request_data")
+
+    return {"move_j+wait": move, "get_system_variable": get_system_variable,
+            "get_tcp_info": get_tcp_info, "request_data": request_data}
+
+
+# ====== 메인 루틴 ======
+
+def run_all(ip, n_iter, rates=RATES_HZ, script_port=COMMAND_PORT):
+    """모든 항목 / 빈도를 측정해서 결과 목록을 반환합니다."""
+    results = []
+
+    def record(api, name, rate, measured):
+        r = summarize(api, name, rate, *measured)
+        report(r)
+        results.append(r)
+
+    def failed(api, name, error):
+        # 연결 / 워밍업 실패도 결과에 errors 로 남기고 다음 항목으로 넘어감
+        print(f"{api}.{name:<31} 실패: {error!r}")
+        results.append({"api": api, "primitive": name, "rate_hz": None, "n": 0, "errors": 1, "error": repr(error)})
+
+    script, prims = script_primitives(ip, script_port)
+    if script is None:
+        print(f"스크립트 소켓 {ip}:{script_port} 연결 실패, script 항목 생략")
+    for name, func in prims.items():
+        try:
+            func() # 워밍업
+        except Exception as e:
+            failed("script", name, e)
+            continue
+        for rate in rates:
+            record("script", name, rate, run_sync(func, n_iter, rate))
+    if script is not None:
+        script.close()
+
+    if rb is None:
+        print("rbpodo 가 설치되어 있지 않아 sync / async 항목 생략")
+        return results
+
+    try:
+        prims = sync_primitives(ip)
+    except Exception as e:
+        failed("sync", "connect", e)
+        prims = {}
+    for name, func in prims.items():
+        for rate in rates:
+            record("sync", name, rate, run_sync(func, n_iter, rate))
+
+    async def run_async_all():
+        try:
+            prims = async_primitives(ip)
+        except Exception as e:
+            failed("async", "connect", e)
+            return
+        for name, func in prims.items():
+            for rate in rates:
+                record("async", name, rate, await run_async(func, n_iter, rate))
+
+    asyncio.run(run_async_all())
+    return results
+
+
+def _main():
+    args = sys.argv[1:]
+    target = args[0] if args else "emulator"
+    n_iter = int(args[1]) if len(args) > 1 else N_ITER
+    output = args[2] if len(args) > 2 else OUTPUT_FILE
+
+    emulator = None
+    if target == "robot":
+        import robotarm_functions as ra_fs
+        ip = ra_fs.read_robot_ip()
+        if ip is None:
+            return
+    else:
+        # rbpodo 는 기본 포트(5000 / 5001)로 접속하므로 에뮬레이터도 기본 포트로 띄움
+        ip = "127.0.0.1"
+        emulator = RobotEmulator(command_port=COMMAND_PORT, data_port=DATA_PORT,
+                                 time_scale=EMULATOR_TIME_SCALE).start()
+    print(f"대상: {target} ({ip}), 항목 / 빈도마다 {n_iter}회, 빈도 {RATES_HZ}")
+
+    try:
+        results = run_all(ip, n_iter)
+    finally:
+        if emulator is not None:
+            emulator.stop()
+
+    meta = {"target": target, "ip": ip, "n_iter": n_iter, "rates_hz": RATES_HZ,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "platform": platform.platform(), "rbpodo": getattr(rb, "__version__", None) if rb else None}
+    if emulator is not None:
+        meta["emulator"] = {"time_scale": EMULATOR_TIME_SCALE, "stats": emulator.stats()["commands"]}
+    comparison = compare(results)
+    if comparison:
+        print("\nasync / sync 비율")
+        for c in comparison:
+            rate = "max" if c["rate_hz"] is None else f"{c['rate_hz']:.0f}Hz"
+            print(f"  {c['primitive'] + ' @' + rate:<30} p50 x{c['p50_ratio']:5.2f} | p99 x{c['p99_ratio']:5.2f}")
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results, "sync_vs_async": comparison}, f, indent=2)
+    print(f"\n결과 저장: {os.path.abspath(output)}")
+
+
+if __name__ == "__main__":
+    _main()
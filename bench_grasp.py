@@ -0,0 +1,64 @@
+# 파지 회전 선택 속도 벤치마크 (로봇/카메라 연결 불필요)
+# 1. select_grasp_rotations 에 행렬을 1개씩 넣는 방식 (물체마다 호출)
+# 2. (N,3,3) 을 한 번에 넣는 방식
+# 3. (설치되어 있으면) old_sam6d_rotation_calculator_4in1 의 행렬 1개씩 분석 (print 는 버림, 그림 생략)
+
+import io
+import sys
+import time
+import contextlib
+import numpy as np
+from robotarm_grasp import select_grasp_rotations
+
+N_MATRICES = 500 # 한 프레임의 물체 수
+
+def random_rotations(n, seed=0):
+    """균일 분포 랜덤 회전 행렬 (n,3,3) (단위 쿼터니언에서 변환)."""
+    q = np.random.default_rng(seed).normal(size=(n, 4))
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    w, x, y, z = q.T
+    return np.stack([
+        1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w),
+        2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w),
+        2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y),
+    ], axis=1).reshape(n, 3, 3)
+
+def _main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_MATRICES
+    mats = random_rotations(n)
+    select_grasp_rotations(mats[:10]) # 워밍업
+
+    # (1) 1개씩
+    t0 = time.perf_counter()
+    for m in mats:
+        select_grasp_rotations(m)
+    t_loop = time.perf_counter() - t0
+
+    # (2) 한 번에
+    t0 = time.perf_counter()
+    result = select_grasp_rotations(mats)
+    t_batch = time.perf_counter() - t0
+
+    print(f"matrices: {n}, valid: {int(result['valid'].sum())}")
+    print(f"per-matrix call : {t_loop * 1000:9.2f} ms ({n / t_loop:12.0f} matrices/s)")
+    print(f"batched         : {t_batch * 1000:9.2f} ms ({n / t_batch:12.0f} matrices/s)")
+    print(f"speedup         : {t_loop / t_batch:9.1f}x")
+
+    # (3) 기존 스칼라 분석 (matplotlib / scipy / rbpodo 가 있어야 import 됨)
+    try:
+        import old_sam6d_rotation_calculator_4in1 as old
+    except ImportError as e:
+        print(f"old_sam6d 비교 생략 ({e})")
+        return
+    old.plot_comparison_scenario = lambda *args, **kwargs: None # 그림은 비교에서 제외
+    n_old = min(n, 200)
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for m in mats[:n_old]:
+            old.process_and_analyze_matrix_sequence(m)
+    t_old = time.perf_counter() - t0
+    print(f"old (print, 1개씩): {t_old * 1000:9.2f} ms / {n_old} ({n_old / t_old:12.0f} matrices/s)")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,89 @@
+# 실행 파일 import 시간(콜드 스타트) 벤치마크 (로봇/카메라/화면 연결 불필요)
+# 실행 파일마다 새 파이썬 프로세스를 띄워 import 에 걸린 시간과, import 후 올라온 무거운 모듈을 출력합니다.
+# ROBOTARM_HEADLESS=1 로 실행하므로 if __name__ == "__main__" 아래(로봇 연결, 창 띄우기)는 실행되지 않습니다.
+# 비교용으로 무거운 모듈(cv2, matplotlib, scipy) 자체의 import 시간도 같이 잽니다.
+#
+#   python bench_import.py            # 기본 5회 반복
+#   python bench_import.py 10
+
+import os
+import sys
+import json
+import subprocess
+import numpy as np
+
+ENTRY_POINTS = [
+    "async_2_realtimecam",
+    "async_3_realtime_sim",
+    "async_4_realtime_sim_jac",
+    "old_sam6d_rotation_calculator_4in1",
+]
+HEAVY_MODULES = ["cv2", "matplotlib.pyplot", "mpl_toolkits.mplot3d", "scipy.spatial.transform"]
+REPEAT = 5
+
+# 자식 프로세스: import 시간(s) 과 올라온 무거운 모듈 목록을 JSON 한 줄로 출력
+_CHILD = """
+import sys, time, json, importlib
+t0 = time.perf_counter()
+try:
+    importlib.import_module(sys.argv[1])
+    error = None
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed = time.perf_counter() - t0
+heavy = [m for m in sys.argv[2:] if m in sys.modules]
+print(json.dumps({"seconds": elapsed, "heavy": heavy, "error": error}))
+"""
+
+
+def time_import(module, repeat=REPEAT):
+    """
+    새 프로세스에서 module 을 repeat 번 import 해서 시간을 잽니다.
+
+    Returns:
+        dict: median_ms, min_ms, heavy (import 후 올라온 무거운 모듈), error (실패하면 메시지).
+    """
+    base = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, ROBOTARM_HEADLESS="1")
+    times, heavy, error = [], [], None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _CHILD, module] + HEAVY_MODULES,
+                             cwd=base, env=env, capture_output=True, text=True)
+        lines = out.stdout.strip().splitlines()
+        if not lines:
+            error = out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "no output"
+            break
+        r = json.loads(lines[-1])
+        if r["error"] is not None:
+            error = r["error"]
+            break
+        times.append(r["seconds"] * 1000.0)
+        heavy = r["heavy"]
+    if not times:
+        return {"median_ms": None, "min_ms": None, "heavy": heavy, "error": error}
+    return {"median_ms": float(np.median(times)), "min_ms": float(np.min(times)), "heavy": heavy, "error": None}
+
+
+def _main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else REPEAT
+    print(f"cold import, ROBOTARM_HEADLESS=1, {repeat} runs each (median / min)")
+    print("\n[entry points]")
+    for name in ENTRY_POINTS:
+        r = time_import(name, repeat)
+        if r["error"] is not None:
+            print(f"  {name:<38} import 실패 ({r['error']})")
+            continue
+        loaded = ", ".join(r["heavy"]) or "-"
+        print(f"  {name:<38} {r['median_ms']:8.1f} ms / {r['min_ms']:8.1f} ms  heavy loaded: {loaded}")
+
+    print("\n[heavy modules, for comparison]")
+    for name in HEAVY_MODULES:
+        r = time_import(name, repeat)
+        if r["error"] is not None:
+            print(f"  {name:<38} 설치 안 됨 ({r['error']})")
+            continue
+        print(f"  {name:<38} {r['median_ms']:8.1f} ms / {r['min_ms']:8.1f} ms")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,53 @@
+# 기구학 계산 속도 벤치마크 (로봇 연결 불필요)
+# 1. 자세 1개씩 순기구학을 반복 호출하는 방식
+# 2. fk_batch 로 (N,6) 자세를 한 번에 계산하는 방식
+# 3. fk_and_jacobian + dls_step 역기구학 1 스텝 반복 속도 (오프라인 IK 루프 기준)
+
+import sys
+import time
+import numpy as np
+from robotarm_kinematics import RobotArm, dls_step
+
+N_POSES = 10000 # 계산할 자세 수
+N_IK_STEPS = 2000 # IK 스텝 반복 횟수
+
+def _main():
+    n_poses = int(sys.argv[1]) if len(sys.argv) > 1 else N_POSES
+    robot = RobotArm(num_axes=6)
+    rng = np.random.default_rng(0)
+    q = rng.uniform(-180.0, 180.0, size=(n_poses, 6))
+
+    # 워밍업
+    robot.fk_batch(q[:10])
+
+    # (1) 자세 1개씩
+    t0 = time.perf_counter()
+    for qi in q:
+        robot.set_joint_angles(qi)
+        robot.get_all_link_poses()
+    t_loop = time.perf_counter() - t0
+
+    # (2) 한 번에
+    t0 = time.perf_counter()
+    T = robot.fk_batch(q)
+    t_batch = time.perf_counter() - t0
+
+    print(f"poses: {n_poses}, output: {T.shape}")
+    print(f"per-pose loop : {t_loop * 1000:9.2f} ms ({n_poses / t_loop:12.0f} poses/s)")
+    print(f"fk_batch      : {t_batch * 1000:9.2f} ms ({n_poses / t_batch:12.0f} poses/s)")
+    print(f"speedup       : {t_loop / t_batch:9.1f}x")
+
+    # (3) IK 1 스텝 (순기구학 + 자코비안 + DLS 풀이)
+    q_ik = np.array([0.0, -45.0, 90.0, -45.0, 90.0, 0.0])
+    v_task = np.array([50.0, 0.0, -20.0, 0.0, 0.0, 0.0])
+    dt = 0.001
+    t0 = time.perf_counter()
+    for _ in range(N_IK_STEPS):
+        T, J = robot.fk_and_jacobian(q_ik)
+        q_ik = q_ik + np.degrees(dls_step(J, v_task)) * dt
+    t_ik = time.perf_counter() - t0
+    print(f"IK step       : {t_ik / N_IK_STEPS * 1e6:9.1f} us ({N_IK_STEPS / t_ik:12.0f} steps/s)")
+
+
+if __name__ == "__main__":
+    _main()
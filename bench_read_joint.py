@@ -0,0 +1,60 @@
+# 관절 각도 읽기 지연시간 비교 벤치마크
+# 1. read_joint      : get_system_variable 6번 (명령 채널 왕복 6회)
+# 2. read_snapshot   : CobotData.request_data() 1번 (데이터 채널 패킷 1개)
+
+import sys
+import time
+import contextlib
+import io
+import rbpodo as rb
+import robotarm_functions as ra_fs
+import numpy as np
+
+N_ITER = 200 # 반복 횟수
+
+def measure(func, n_iter):
+    """func()를 n_iter 번 호출하여 호출당 소요시간(ms) 배열을 반환합니다."""
+    samples = np.empty(n_iter)
+    for i in range(n_iter):
+        t0 = time.perf_counter()
+        func()
+        samples[i] = (time.perf_counter() - t0) * 1000.0
+    return samples
+
+def report(name, samples):
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    print(f"{name:<16} mean {samples.mean():7.3f} ms | p50 {p50:7.3f} | p95 {p95:7.3f} | p99 {p99:7.3f} "
+          f"| {1000.0 / samples.mean():8.1f} calls/s")
+
+# ====== 메인 루틴 ======
+def _main():
+    robot_ip = ra_fs.read_robot_ip()
+    if robot_ip is None:
+        print("로봇 IP 주소를 읽을 수 없어 프로그램을 종료합니다.")
+        return
+
+    n_iter = int(sys.argv[1]) if len(sys.argv) > 1 else N_ITER
+    print(f"\n✅ 로봇 IP: {robot_ip}, 반복 횟수: {n_iter}")
+
+    robot = rb.Cobot(robot_ip)
+    rc = rb.ResponseCollector()
+    data_channel = rb.CobotData(robot_ip)
+
+    def per_variable():
+        # read_joint 내부 print 출력은 측정에서 제외
+        with contextlib.redirect_stdout(io.StringIO()):
+            ra_fs.read_joint(rc, robot)
+
+    def snapshot():
+        ra_fs.read_snapshot(data_channel)
+
+    # 워밍업 (연결 수립 비용 제외)
+    per_variable()
+    snapshot()
+
+    report("read_joint", measure(per_variable, n_iter))
+    report("read_snapshot", measure(snapshot, n_iter))
+
+
+if __name__ == "__main__":
+    _main()
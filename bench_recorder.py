@@ -0,0 +1,79 @@
+# 동기 기록기(SessionRecorder) 쓰기 속도 벤치마크 (카메라/로봇 연결 불필요)
+# 가짜 캡처 스레드가 640x480 프레임을 30 FPS 로 write_frame 에 넘기고,
+# 메인 스레드가 100 Hz 로 관절 샘플을 write_sample 에 넘깁니다.
+# 프레임당 쓰기 시간이 프레임 주기(33 ms)보다 충분히 작은지, 놓친 프레임이 없는지 확인합니다.
+
+import sys
+import time
+import tempfile
+import threading
+import numpy as np
+from robotarm_telemetry import TelemetryRing
+from robotarm_recorder import SessionRecorder, load_session
+
+DURATION = 5.0 # 기록 시간 (s)
+FPS = 30.0
+SAMPLE_HZ = 100.0
+FRAME_SHAPE = (480, 640, 3)
+
+def _main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else DURATION
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rec = SessionRecorder(tmp, max_seconds=duration + 1.0, fps=FPS, sample_hz=SAMPLE_HZ)
+        rec.allocate_frames(FRAME_SHAPE)
+        ring = TelemetryRing()
+        rng = np.random.default_rng(0)
+        frame_src = rng.integers(0, 255, size=(4,) + FRAME_SHAPE, dtype=np.uint8)
+        write_ms = []
+        running = True
+
+        def fake_camera():
+            # 캡처 스레드 흉내: 고정 주기로 프레임 생성 → write_frame
+            seq = 0
+            next_t = time.monotonic()
+            while running:
+                seq += 1
+                t0 = time.perf_counter()
+                rec.write_frame(frame_src[seq % 4], time.monotonic(), seq)
+                write_ms.append((time.perf_counter() - t0) * 1000.0)
+                next_t += 1.0 / FPS
+                delay = next_t - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+        cam = threading.Thread(target=fake_camera, daemon=True)
+        cam.start()
+
+        t_end = time.monotonic() + duration
+        q = np.zeros(6)
+        while time.monotonic() < t_end:
+            q += 0.1
+            ring.push(time.monotonic(), q, q)
+            rec.write_sample(ring)
+            time.sleep(1.0 / SAMPLE_HZ)
+
+        running = False
+        cam.join()
+        t0 = time.perf_counter()
+        rec.close()
+        t_close = time.perf_counter() - t0
+
+        samples = np.array(write_ms)
+        p50, p99 = np.percentile(samples, [50, 99])
+        mb_per_s = samples.size * rec.frames[0].nbytes / duration / 1e6
+        print(f"frames {samples.size} ({samples.size / duration:.1f} FPS, {mb_per_s:.1f} MB/s)")
+        print(f"write_frame  p50 {p50:6.3f} ms | p99 {p99:6.3f} | max {samples.max():6.3f} "
+              f"| budget {1000.0 / FPS:.1f} ms")
+        print(f"close (align + flush) {t_close * 1000:.1f} ms")
+        print(f"stats {rec.stats()}")
+
+        session = load_session(tmp)
+        idx = session["frame_sample"]
+        lag = np.abs(session["sample_stamp"][idx] - session["frame_stamp"]) * 1000.0
+        print(f"frame-sample 시각 차이: mean {lag.mean():.2f} ms, max {lag.max():.2f} ms")
+        del session
+
+
+if __name__ == "__main__":
+    _main()
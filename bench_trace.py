@@ -0,0 +1,68 @@
+# 구간 계측(robotarm_trace) 오버헤드 벤치마크 (로봇 연결 불필요)
+# 1. 계측 꺼짐: trace.span() 이 공용 빈 객체를 돌려줄 때 with 문 1번
+# 2. 계측 켜짐: span 1개 기록 (시각 2번 + 링 버퍼 칸 대입)
+# 3. 중첩: 이동 함수 1개 모양 (MOVE 1개 안에 세부 구간 4개)
+# 목표: 켜진 span 1개당 5 µs 미만
+
+import sys
+import time
+import robotarm_trace as trace
+
+N_SPANS = 200000
+TARGET_US = 5.0
+
+
+def per_call_us(func, n):
+    t0 = time.perf_counter()
+    func(n)
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def loop_empty(n):
+    for _ in range(n):
+        pass
+
+
+def loop_span(n):
+    for _ in range(n):
+        with trace.span("send"):
+            pass
+
+
+def loop_nested(n):
+    for _ in range(n):
+        with trace.span("mmove_j", trace.MOVE):
+            with trace.span("send"):
+                pass
+            with trace.span("error_check"):
+                pass
+            with trace.span("wait_started"):
+                pass
+            with trace.span("wait_finished"):
+                pass
+
+
+def _main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_SPANS
+    base = per_call_us(loop_empty, n)
+
+    trace.disable()
+    off = per_call_us(loop_span, n) - base
+
+    tracer = trace.enable(capacity=65536)
+    loop_span(1000) # 워밍업 (버퍼 채우기)
+    on = per_call_us(loop_span, n) - base
+    nested = (per_call_us(loop_nested, n // 5) - base) / 5.0
+
+    t0 = time.perf_counter()
+    events = tracer.chrome_events()
+    t_export = time.perf_counter() - t0
+
+    print(f"span 1개 (계측 꺼짐) : {off:6.3f} µs")
+    print(f"span 1개 (계측 켜짐) : {on:6.3f} µs  {'OK' if on < TARGET_US else 'FAIL'} (목표 {TARGET_US} µs 미만)")
+    print(f"중첩 5개 중 1개 평균 : {nested:6.3f} µs  {'OK' if nested < TARGET_US else 'FAIL'}")
+    print(f"버퍼 {len(tracer)}개 보관, 덮어씀 {tracer.dropped}, Chrome 이벤트 변환 {len(events)}개 {t_export * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    _main()
@@ -1,28 +1,34 @@
-# txt파일에 어레이 배열을 읽고 쓰기 예시
+# 자세 배열을 저장하고 읽는 예시
+# 예전에는 point_start.txt 에 np.savetxt 로 이어 쓰고 np.loadtxt 로 읽었지만,
+# set_* 스크립트와 show10 은 자세 라이브러리(poses.bin, robotarm_poses)의 'start' 를 읽습니다.
+# 라이브러리에 'start' 가 생긴 뒤에는 point_start.txt 를 다시 읽지 않으므로 여기서도 라이브러리에 저장합니다.
 
 import os
 import numpy as np
+from robotarm_poses import load_library
 
-# 저장할 파일 이름
+# 예전 텍스트 파일 (라이브러리에 'start' 가 없을 때 한 번만 가져옴)
 filename = "point_start.txt"
 
 # 예시로 주어진 6개 값
 data = np.array([-156.951, 9.552, 136.832, -56.353, 89.999, 66.82])
 
-# 1️⃣ 파일 존재 확인 및 저장
-if not os.path.exists(filename):
-    print(f"'{filename}' 파일이 없어서 새로 생성합니다.")
-    with open(filename, "w") as f:
-        np.savetxt(f, [data], fmt="%.6f")
+poses = load_library()
+
+# 1️⃣ 저장 (같은 이름으로 다시 저장하면 뒤에 추가되고 이전 값은 기록으로 남음)
+if "start" not in poses and os.path.exists(filename):
+    poses.import_txt("start", filename)
+    print(f"'{filename}' 의 값을 자세 라이브러리 'start' 로 가져왔습니다.")
+if "start" not in poses:
+    print(f"'start' 자세가 없어서 새로 저장합니다. ({poses.path})")
 else:
-    print(f"'{filename}' 파일이 존재합니다. 데이터 이어쓰기.")
-    with open(filename, "a") as f:
-        np.savetxt(f, [data], fmt="%.6f")
+    print(f"'start' 자세가 있습니다. 데이터 이어쓰기. ({poses.path})")
+poses.put("start", data, kind="joint", note="etc_txt_read_write")
 
 print("데이터 저장 완료 ✅")
 
-# 2️⃣ 파일에서 불러오기 (jointarray에 저장)
-jointarray = np.loadtxt(filename)
-print("\n파일에서 불러온 jointarray:")
+# 2️⃣ 불러오기 (jointarray: 저장한 순서대로, 텍스트 파일에 이어 쓴 줄들과 같은 모양)
+jointarray = poses.history("start")["values"]
+print("\n라이브러리에서 불러온 jointarray:")
 print(jointarray)
-
+print("현재 값:", poses.get("start"))
@@ -1,10 +1,15 @@
+import os
+import sys
 import serial
-import socket
 import rbpodo as rb
 import numpy as np
 import math
 from scipy.spatial.transform import Rotation as R
 
+# 상위 폴더의 공용 모듈(robotarm_*.py) 사용
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from robotarm_script import ScriptClient
+
 # 시리얼 포트 설정 (Ubuntu 환경)
 ser = serial.Serial(port="/dev/ttyUSB0", baudrate=9600, timeout=0.1)
 
@@ -40,20 +45,22 @@ rc = rb.ResponseCollector()
 robot.set_operation_mode(rc, rb.OperationMode.Real)
 rc = rc.error().throw_if_not_empty()
 
-# 소켓 연결
-client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-client_socket.connect((HOST, PORT))
+# 소켓 연결 (메시지 분리 / ack·info 구분 / 이동 완료 판단은 ScriptClient 가 담당)
+script = ScriptClient(HOST, PORT)
+if not script.connect():
+    raise SystemExit("로봇 서버 연결 실패")
 print("로봇 서버에 연결되었습니다.")
+_motion_mark = 0 # 마지막 send_command 직전의 이동 시작 카운터
 
 def send_command(command):
-    client_socket.sendall(command.encode())
-    return client_socket.recv(1024).decode()
+    global _motion_mark
+    _motion_mark = script.motion_mark()
+    ack = script.request(command)
+    return "" if ack is None else ack.raw
 
 def wait_for_motion():
-    while True:
-        data = client_socket.recv(1024).decode()
-        if "info[motion_changed][0]" in data:
-            break
+    # 마지막 send_command 이후 시작된 이동이 끝날 때까지 (이전 이동의 완료 메시지는 무시)
+    while not script.wait_motion(_motion_mark, timeout=10.0):
         print("로봇이 이동 중입니다. 잠시만 기다려주세요...")
 
 def map_range(x, in_min, in_max, out_min, out_max):
@@ -5,11 +5,17 @@
 
 
 # 필요한 라이브러리 임포트
-import socket # 로봇 스크립트 명령 전송을 위한 소켓 통신
+import os
+import sys
 import rbpodo as rb # 레인보우 로보틱스 코봇 제어 라이브러리
 import numpy as np # 수치 계산 (배열 등)
 import time # 시간 지연 사용
 
+# 상위 폴더의 공용 모듈(robotarm_*.py) 사용
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from robotarm_poses import load_library, robot_pose_name # 이름 있는 자세 저장소
+from robotarm_script import ScriptClient, ScriptError # 로봇 스크립트 명령 전송을 위한 소켓 통신
+
 # ======= 설정 부분 =======
 ROBOT_IP = "192.168.0.22" # 로봇 제어기의 실제 IP 주소로 변경하세요. (예: "10.0.2.7" 등)
 SOCKET_PORT = 5000
@@ -32,79 +38,71 @@ print(f"전체 속도 오버라이드 설정: {speed_override*100:.0f}%")
 robot.set_speed_bar(rc, speed_override)
 #rc.error().throw_if_not_empty() # 에러 발생 시 스크립트 즉시 중단
 
-try:
-    client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    client_socket.connect((ROBOT_IP, SOCKET_PORT))
+# 메시지 분리 / ack·info·error 구분 / 이동 완료 판단은 ScriptClient(robotarm_script.py)가 담당
+script = ScriptClient(ROBOT_IP, SOCKET_PORT)
+if script.connect():
     print(f"로봇 스크립트 서버에 소켓 연결되었습니다. IP: {ROBOT_IP}, Port: {SOCKET_PORT}")
-except socket.error as e:
-    print(f"로봇 스크립트 서버 소켓 연결 실패: {e}")
+else:
     print("move_l_relative 함수는 작동하지 않습니다.")
-    client_socket = None # 연결 실패 시 None으로 설정
+
+_motion_mark = 0 # 마지막 send_command 직전의 이동 시작 카운터
 
 # 소켓을 통해 로봇 스크립트 명령 전송 함수
 def send_command(command):
     """
-    로봇 스크립트 명령어를 소켓을 통해 전송하고 응답을 받습니다.
+    로봇 스크립트 명령어를 소켓을 통해 전송하고 그 명령의 응답(ack)을 받습니다.
+    info[...] 이벤트는 응답과 분리되어 script.infos 에 쌓입니다.
     """
-    if client_socket is None:
+    global _motion_mark
+    if not script.connected:
         print("소켓 연결이 활성화되지 않아 명령을 보낼 수 없습니다.")
         return "Error: Socket not connected"
-        
+
     try:
-        client_socket.sendall(command.encode())
-        # TODO: 로봇 응답 크기를 정확히 확인하고 필요하다면 반복 수신
-        # 현재는 최대 1024 바이트만 수신합니다.
-        response = client_socket.recv(1024).decode()
-        # print(f"Sent: {command.strip()}, Recv: {response.strip()}") # 디버깅용
-        return response
-    except socket.error as e:
+        _motion_mark = script.motion_mark()
+        ack = script.request(command)
+        if ack is None:
+            return "Error: No response"
+        # print(f"Sent: {command.strip()}, Recv: {ack.raw}") # 디버깅용
+        return ack.raw
+    except ScriptError as e:
+        print(f"로봇 스크립트 오류 응답: {e}")
+        return f"Error: {e}"
+    except OSError as e:
         print(f"명령 전송/수신 중 소켓 오류 발생: {e}")
-        #raise # 필요하다면 예외를 다시 발생
         return "Error: Socket communication failed"
 
+
 # 로봇 스크립트 명령 실행 완료 대기 함수 (모션 변경 감지)
+# 마지막 send_command 이후에 시작된 이동(info[motion_changed][X>0])이
+# 끝날(info[motion_changed][0]) 때까지 기다립니다. 이전 이동의 완료 메시지는 무시됩니다.
 def wait_for_motion(timeout=10.0):
     """
-    로봇의 모션 상태 변경 메시지를 수신할 때까지 대기합니다.
+    마지막으로 보낸 명령의 이동이 끝날 때까지 대기합니다.
     
     Args:
         timeout (float): 대기할 최대 시간 (초).
     Returns:
-        bool: 모션 변경 메시지를 감지했으면 True, 타임아웃되면 False.
+        bool: 이동 완료를 감지했으면 True, 타임아웃되면 False.
     """
-    if client_socket is None:
+    if not script.connected:
         print("소켓 연결이 활성화되지 않아 모션 완료를 대기할 수 없습니다.")
         return False
 
     print("[wait_for_motion] 로봇 모션 완료 대기...")
-    # 소켓 수신에 타임아웃 설정 (무한 대기 방지)
-    client_socket.settimeout(timeout)
-    start_time = time.time()
-
     try:
-        # TODO: 더 견고한 파싱 로직 필요. 현재는 문자열 포함 여부만 확인.
-        while time.time() - start_time < timeout:
-            data = client_socket.recv(1024).decode()
-            if "info[motion_changed][0]" in data:
-                #print("[wait_for_motion] 모션 변경 감지.") # 디버깅용
-                client_socket.settimeout(None) # 타임아웃 설정 해제
-                return True
-            # print(f"[wait_for_motion] 수신 데이터: {data.strip()}") # 디버깅용
-        
+        if script.wait_motion(_motion_mark, timeout):
+            return True
         print(f"[wait_for_motion] 타임아웃 ({timeout}s)으로 모션 변경 감지 실패.")
-        client_socket.settimeout(None) # 타임아웃 설정 해제
-        return False # 타임아웃
-
-    except socket.timeout:
-        print(f"[wait_for_motion] 소켓 수신 타임아웃 ({timeout}s).")
-        client_socket.settimeout(None) # 타임아웃 설정 해제
         return False
-    except socket.error as e:
+    except ScriptError as e:
+        print(f"[wait_for_motion] 로봇 오류 메시지 수신: {e}")
+        return False
+    except OSError as e:
         print(f"[wait_for_motion] 수신 중 소켓 오류 발생: {e}")
-        client_socket.settimeout(None) # 타임아웃 설정 해제
-        #raise # 필요하다면 예외 다시 발생
         return False
 
+
 # move j함수 - 관절 이동 함수
 def mmove_j(angles_j, speed_j, acceleration_j):
     """
@@ -210,6 +208,12 @@ pose_desk[(0, 4)] = np.array([-162.40, 25.28, 122.86, -58.15, 89.97, 72.86]) # 1
 pose_desk[(0, 5)] = np.array([-129.54, 37.06, 94.07, -41.13, 89.96, 39.54])  # 1번 데스크 5번 위치
 pose_desk[(0, 6)] = np.array([-129.62, 35.99, 94.12, -40.11, 89.96, 39.62])  # 1번 데스크 6번 위치
 
+# 자세 라이브러리(poses.bin)에 이 로봇(ROBOT_IP)의 initiate / desk_N 이 있으면 그 값(set_robot_pose_set.py 로 다시 티칭한 값)을 사용
+POSES = load_library()
+pose_initiate = POSES.get(robot_pose_name(ROBOT_IP, "initiate"), default=pose_initiate)
+for key in pose_desk:
+    pose_desk[key] = POSES.get(robot_pose_name(ROBOT_IP, f"desk_{key[1]}"), default=pose_desk[key])
+
 relative_coord_system_index = 2 #로컬 리니어 이동할 축(로봇내 z축이 2번이라서 설정해둡니다.)
 relative_move_speed = 500 # 상대 이동 속도 (mm/s)
 relative_move_acceleration = 500 # 상대 이동 가속도 (mm/s^2)
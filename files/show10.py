@@ -2,16 +2,36 @@
 
 # 필요한 라이브러리 임포트
 # import serial # 시리얼 통신은 사용하지 않으므로 주석 처리
-import socket # 로봇 스크립트 명령 전송을 위한 소켓 통신
+import os
+import sys
 import rbpodo as rb # 레인보우 로보틱스 코봇 제어 라이브러리
 import numpy as np # 수치 계산 (배열 등)
 import time # 시간 지연 사용
 
+# 상위 폴더의 공용 모듈(robotarm_*.py) 사용
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from robotarm_script import ScriptClient, ScriptError, ScriptPipeline # 로봇 스크립트 명령 전송을 위한 소켓 통신
+from robotarm_program import TrayTransferPlanner # 블렌딩 이동 프로그램 (move_pb)
+from robotarm_pallet import TrayLayout # 트레이 칸 위치 모델
+from robotarm_sequencer import TransferSequencer # 이동 시간 기준 칸 순서 계획
+from robotarm_poses import load_library, robot_pose_name # 이름 있는 자세 저장소
+from robotarm_gripper import PulseScheduler # 그리퍼 출력 펄스 (기다리지 않음)
+import robotarm_trace as trace # 이동 함수 구간 계측 (ROBOTARM_TRACE=1 로 켜면 종료 시 show10_trace.json 저장)
+from robotarm_cycle import CycleAnalyzer # 칸별 사이클 타임 분석 (계측이 켜져 있을 때)
+
 # ======= 설정 부분 =======
 ROBOT_IP = "192.168.0.23" # 로봇 제어기의 실제 IP 주소로 변경하세요. (예: "10.0.2.7" 등)
 # 소켓 통신에 사용할 포트 (로봇 스크립트 인터페이스 포트일 가능성 높음)
 # 로봇 매뉴얼에서 스크립트 인터페이스 포트를 확인하세요.
 SOCKET_PORT = 5000 
+# 스크립트 이동 명령 파이프라인 창 크기
+# 1 이면 기존처럼 명령마다 완료를 기다리고, 2 이상이면 다음 구간을 미리 보내 제어기 버퍼에 넣어 둡니다.
+PIPELINE_WINDOW = 2
+# True 면 cycle_2 대신 cycle_2_blended 실행 (올라가기 → 옆으로 → 내려가기를 move_pb 블렌딩 경로 하나로)
+# 사용자 좌표계(coordinate_system_index 2)의 회전을 USER_FRAME_RPY 에 맞게 넣은 뒤 사용하세요.
+USE_BLENDED_PATH = False
+USER_FRAME_RPY = [0.0, 0.0, 0.0] # 사용자 좌표계 회전 (rx, ry, rz) deg, 베이스 좌표계 기준
+BLEND_DISTANCE = 20.0 # 모서리 블렌딩 거리 (mm), md_distance 의 절반보다 작게
 # =======================
 
 # 로봇 연결 (스크립트 시작 시 한 번 실행)
@@ -36,81 +56,79 @@ robot.set_speed_bar(rc, speed_override)
 
 # 소켓 연결 (스크립트 시작 시 한 번 실행)
 # 로봇 스크립트 명령 전송을 위한 소켓 연결
-try:
-    client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    client_socket.connect((ROBOT_IP, SOCKET_PORT))
+# 메시지 분리 / ack·info·error 구분 / 이동 완료 판단은 ScriptClient(robotarm_script.py)가 담당
+script = ScriptClient(ROBOT_IP, SOCKET_PORT)
+if script.connect():
     print(f"로봇 스크립트 서버에 소켓 연결되었습니다. IP: {ROBOT_IP}, Port: {SOCKET_PORT}")
-except socket.error as e:
-    print(f"로봇 스크립트 서버 소켓 연결 실패: {e}")
+else:
     print("move_l_relative 함수는 작동하지 않습니다.")
-    client_socket = None # 연결 실패 시 None으로 설정
+
+# 그리퍼 출력은 전용 rbpodo 연결 + 작업 스레드에서 ON → 100 ms → OFF (grip() 은 기다리지 않고 반환)
+gripper = PulseScheduler(rb.Cobot(ROBOT_IP), rb.ResponseCollector())
+
+_motion_mark = 0 # 마지막 send_command 직전의 이동 시작 카운터
+
+# 연속된 move_l_rel 은 파이프라인으로 미리 보내고, rbpodo 명령(move_j, 그리퍼) 전에는 sync_pipeline() 으로 맞춤
+pipeline = ScriptPipeline(script, window=PIPELINE_WINDOW) if script.connected else None
+
+def sync_pipeline():
+    """파이프라인에 보낸 스크립트 이동이 모두 끝날 때까지 대기합니다."""
+    if pipeline is not None:
+        pipeline.drain()
 
 # 소켓을 통해 로봇 스크립트 명령 전송 함수
 def send_command(command):
     """
-    로봇 스크립트 명령어를 소켓을 통해 전송하고 응답을 받습니다.
+    로봇 스크립트 명령어를 소켓을 통해 전송하고 그 명령의 응답(ack)을 받습니다.
+    info[...] 이벤트는 응답과 분리되어 script.infos 에 쌓입니다.
     """
-    if client_socket is None:
+    global _motion_mark
+    if not script.connected:
         print("소켓 연결이 활성화되지 않아 명령을 보낼 수 없습니다.")
         return "Error: Socket not connected"
-        
+
     try:
-        client_socket.sendall(command.encode())
-        # TODO: 로봇 응답 크기를 정확히 확인하고 필요하다면 반복 수신
-        # 현재는 최대 1024 바이트만 수신합니다.
-        response = client_socket.recv(1024).decode()
-        # print(f"Sent: {command.strip()}, Recv: {response.strip()}") # 디버깅용
-        return response
-    except socket.error as e:
+        _motion_mark = script.motion_mark()
+        ack = script.request(command)
+        if ack is None:
+            return "Error: No response"
+        # print(f"Sent: {command.strip()}, Recv: {ack.raw}") # 디버깅용
+        return ack.raw
+    except ScriptError as e:
+        print(f"로봇 스크립트 오류 응답: {e}")
+        return f"Error: {e}"
+    except OSError as e:
         print(f"명령 전송/수신 중 소켓 오류 발생: {e}")
-        #raise # 필요하다면 예외를 다시 발생
         return "Error: Socket communication failed"
 
 
 # 로봇 스크립트 명령 실행 완료 대기 함수 (모션 변경 감지)
-# 이 함수는 로봇이 움직임을 시작하거나 멈출 때 보내는 특정 메시지를 감지합니다.
-# 모든 명령의 실행 완료를 보장하지 않을 수 있으며, 로봇 스크립트 인터페이스의
-# 응답 방식에 따라 더 견고한 대기/완료 확인 로직이 필요할 수 있습니다.
+# 마지막 send_command 이후에 시작된 이동(info[motion_changed][X>0])이
+# 끝날(info[motion_changed][0]) 때까지 기다립니다. 이전 이동의 완료 메시지는 무시됩니다.
 def wait_for_motion(timeout=10.0):
     """
-    로봇의 모션 상태 변경 메시지를 수신할 때까지 대기합니다.
+    마지막으로 보낸 명령의 이동이 끝날 때까지 대기합니다.
     
     Args:
         timeout (float): 대기할 최대 시간 (초).
     Returns:
-        bool: 모션 변경 메시지를 감지했으면 True, 타임아웃되면 False.
+        bool: 이동 완료를 감지했으면 True, 타임아웃되면 False.
     """
-    if client_socket is None:
+    if not script.connected:
         print("소켓 연결이 활성화되지 않아 모션 완료를 대기할 수 없습니다.")
         return False
 
     print("[wait_for_motion] 로봇 모션 완료 대기...")
-    # 소켓 수신에 타임아웃 설정 (무한 대기 방지)
-    client_socket.settimeout(timeout)
-    start_time = time.time()
-
     try:
-        # TODO: 더 견고한 파싱 로직 필요. 현재는 문자열 포함 여부만 확인.
-        while time.time() - start_time < timeout:
-            data = client_socket.recv(1024).decode()
-            if "info[motion_changed][0]" in data:
-                #print("[wait_for_motion] 모션 변경 감지.") # 디버깅용
-                client_socket.settimeout(None) # 타임아웃 설정 해제
-                return True
-            # print(f"[wait_for_motion] 수신 데이터: {data.strip()}") # 디버깅용
-        
+        if script.wait_motion(_motion_mark, timeout):
+            return True
         print(f"[wait_for_motion] 타임아웃 ({timeout}s)으로 모션 변경 감지 실패.")
-        client_socket.settimeout(None) # 타임아웃 설정 해제
-        return False # 타임아웃
-
-    except socket.timeout:
-        print(f"[wait_for_motion] 소켓 수신 타임아웃 ({timeout}s).")
-        client_socket.settimeout(None) # 타임아웃 설정 해제
         return False
-    except socket.error as e:
+    except ScriptError as e:
+        print(f"[wait_for_motion] 로봇 오류 메시지 수신: {e}")
+        return False
+    except OSError as e:
         print(f"[wait_for_motion] 수신 중 소켓 오류 발생: {e}")
-        client_socket.settimeout(None) # 타임아웃 설정 해제
-        #raise # 필요하다면 예외 다시 발생
         return False
 
 
@@ -131,27 +149,38 @@ def mmove_j(angles_j, speed_j, acceleration_j):
     print(f"  속도: {speed_j} deg/s, 가속도: {acceleration_j} deg/s^2")
 
     try:
-        # 관절 공간 이동 명령 전송
-        robot.move_j(rc, angles_j, speed_j, acceleration_j)
-
-        # 명령 버퍼 플러시 및 에러 확인
-        # move_j 명령은 버퍼에 담길 수 있으므로 플러시하여 즉시 전송
-        robot.flush(rc)
-        rc.error().throw_if_not_empty()
-        rc.clear() # 응답 수집기 초기화
-
-        # 이동 시작 및 완료 대기
-        print("  로봇 이동 시작 대기...")
-        # 로봇이 움직이기 시작할 때까지 대기 (타임아웃 설정)
-        if robot.wait_for_move_started(rc, 5.0).is_success(): # 5초 안에 시작 안 하면 실패
-            print("  로봇 이동 시작 감지.")
-            print("  로봇 이동 완료 대기...")
-            # 로봇이 움직임을 마칠 때까지 대기
-            robot.wait_for_move_finished(rc)
-            print("--- [mmove_j] 로봇 이동 완료 ---")
-        else:
-            print("--- [mmove_j] 로봇 이동 시작 실패 또는 타임아웃 ---")
-            rc.error().throw_if_not_empty() # 이동 시작 실패 시 에러 확인 (raise 발생)
+        with trace.span("mmove_j", trace.MOVE):
+            # 앞서 보낸 스크립트 이동이 끝난 뒤에 관절 이동
+            with trace.span("sync_pipeline"):
+                sync_pipeline()
+
+            # 관절 공간 이동 명령 전송
+            with trace.span("send"):
+                robot.move_j(rc, angles_j, speed_j, acceleration_j)
+
+                # 명령 버퍼 플러시
+                # move_j 명령은 버퍼에 담길 수 있으므로 플러시하여 즉시 전송
+                robot.flush(rc)
+            with trace.span("error_check"):
+                rc.error().throw_if_not_empty()
+                rc.clear() # 응답 수집기 초기화
+
+            # 이동 시작 및 완료 대기
+            print("  로봇 이동 시작 대기...")
+            # 로봇이 움직이기 시작할 때까지 대기 (타임아웃 설정)
+            with trace.span("wait_started"):
+                started = robot.wait_for_move_started(rc, 5.0).is_success() # 5초 안에 시작 안 하면 실패
+            if started:
+                print("  로봇 이동 시작 감지.")
+                print("  로봇 이동 완료 대기...")
+                # 로봇이 움직임을 마칠 때까지 대기
+                with trace.span("wait_finished"):
+                    robot.wait_for_move_finished(rc)
+                print("--- [mmove_j] 로봇 이동 완료 ---")
+            else:
+                print("--- [mmove_j] 로봇 이동 시작 실패 또는 타임아웃 ---")
+                with trace.span("error_check"):
+                    rc.error().throw_if_not_empty() # 이동 시작 실패 시 에러 확인 (raise 발생)
 
     except Exception as e:
         print(f"--- [mmove_j] 이동 중 오류 발생: {e} ---")
@@ -159,7 +188,8 @@ def mmove_j(angles_j, speed_j, acceleration_j):
 
 
 # 직교 공간 상대 직선 이동 함수 (로봇 스크립트 move_l_rel 사용)
-# 이 함수는 소켓 통신 (send_command, wait_for_motion)을 사용합니다.
+# PIPELINE_WINDOW 가 1 이면 소켓 통신 (send_command, wait_for_motion)으로 완료까지 기다리고,
+# 2 이상이면 파이프라인에 넣고 바로 반환합니다 (창이 가득 차면 앞 명령 완료까지 대기).
 def mmove_l_relative(displacement_vector, speed_l, acceleration_l, coordinate_system_index):
     """
     로봇 TCP를 현재 위치에서 지정된 좌표계 기준으로 상대 직선 이동시키는 함수.
@@ -180,28 +210,44 @@ def mmove_l_relative(displacement_vector, speed_l, acceleration_l, coordinate_sy
     print(f"  속도: {speed_l} mm/s, 가속도: {acceleration_l} mm/s^2")
 
     try:
-        # 스크립트 명령어 형식으로 변위 벡터 문자열 생성
-        disp_str = ", ".join(map(str, displacement_vector))
-        command = f'move_l_rel(pnt[{disp_str}], {speed_l}, {acceleration_l}, {coordinate_system_index})'
-
-        # 로봇 스크립트 인터페이스로 명령 전송 (소켓 통신)
-        response = send_command(command)
-        print(f"  Command sent: {command}")
-        print(f"  Response: {response.strip()}") # 로봇 응답 확인 (성공/실패 등)
-
-        # TODO: 로봇 응답(response)을 분석하여 명령이 성공적으로 받아들여졌는지 확인하는 로직 추가
-        # send_command의 응답은 명령 수신 확인일 수 있으며, 실제 실행 성공을 의미하지 않을 수 있습니다.
-
-        # 이동 완료 대기 (소켓 통신으로 모션 완료 메시지 감지)
-        # wait_for_motion 함수는 소켓으로부터 "info[motion_changed][0]"를 기다립니다.
-        # 이 메시지가 항상 이동 완료를 정확히 의미하는지 로봇 매뉴얼 확인 필요.
-        if not wait_for_motion():
-             # 타임아웃 등으로 모션 완료 감지 실패 시
-             print("--- [mmove_l_relative] 모션 완료 감지 실패 또는 타임아웃 ---")
-             # 필요하다면 여기서 에러 처리 또는 예외 발생
-             # raise Exception("Motion completion not detected") # 예: 강제 예외 발생
-
-        print("--- [mmove_l_relative] 로봇 상대 이동 완료 ---")
+        with trace.span("mmove_l_relative", trace.MOVE, frame=coordinate_system_index):
+            # 스크립트 명령어 형식으로 변위 벡터 문자열 생성
+            disp_str = ", ".join(map(str, displacement_vector))
+            command = f'move_l_rel(pnt[{disp_str}], {speed_l}, {acceleration_l}, {coordinate_system_index})'
+
+            if pipeline is not None and PIPELINE_WINDOW > 1:
+                if not any(displacement_vector):
+                    # 변위 0 은 이동 시작 이벤트가 오지 않으므로 보내지 않음
+                    print("--- [mmove_l_relative] 변위 0, 건너뜀 ---")
+                    return
+                # 자리 대기 = 앞서 보낸 이동(이전 칸의 올라가기 등)이 끝나기를 기다리는 시간이므로 전송과 따로 기록
+                t_submit = time.monotonic()
+                with trace.span("pipeline_wait"):
+                    pipeline.wait_slot()
+                with trace.span("pipeline_submit"):
+                    cmd = pipeline.submit(command, t_submit=t_submit)
+                print(f"  Command queued: #{cmd.no} {command} (진행 중 {len(pipeline.inflight)}개)")
+                return
+
+            # 로봇 스크립트 인터페이스로 명령 전송 (소켓 통신)
+            with trace.span("send"):
+                response = send_command(command)
+            print(f"  Command sent: {command}")
+            print(f"  Response: {response.strip()}") # 로봇 응답 확인 (성공/실패 등)
+
+            # send_command 는 이 명령의 ack 만 반환하고, error[...] 응답이면 "Error: ..." 를 반환합니다.
+            # (이동이 시작되지 않으면 아래 wait_for_motion 이 0.5초 뒤 False 를 반환)
+
+            # 이동 완료 대기 (이 명령 이후 시작된 이동의 info[motion_changed][0] 감지)
+            with trace.span("wait_motion"):
+                finished = wait_for_motion()
+            if not finished:
+                 # 타임아웃 등으로 모션 완료 감지 실패 시
+                 print("--- [mmove_l_relative] 모션 완료 감지 실패 또는 타임아웃 ---")
+                 # 필요하다면 여기서 에러 처리 또는 예외 발생
+                 # raise Exception("Motion completion not detected") # 예: 강제 예외 발생
+
+            print("--- [mmove_l_relative] 로봇 상대 이동 완료 ---")
 
     except Exception as e:
         print(f"--- [mmove_l_relative] 상대 이동 중 오류 발생: {e} ---")
@@ -209,19 +255,14 @@ def mmove_l_relative(displacement_vector, speed_l, acceleration_l, coordinate_sy
         raise # 예외를 다시 발생시켜 호출자에서 처리하도록 함
 
 def grip(ord):
-    if(ord == "release"):
-        robot.set_dout_bit_combination(rc, 0, 3, 1, rb.Endian.LittleEndian)
-        time.sleep(0.1)
-        robot.set_dout_bit_combination(rc, 0, 3, 0, rb.Endian.LittleEndian)
+    with trace.span("grip", trace.MOVE, command=ord):
+        # 그리퍼는 rbpodo 출력이므로 앞서 보낸 스크립트 이동(내려가기 등)이 끝난 뒤에 동작
+        with trace.span("sync_pipeline"):
+            sync_pipeline()
 
-
-    elif(ord == "grab"):
-        robot.set_dout_bit_combination(rc, 0, 3, 2, rb.Endian.LittleEndian)
-        time.sleep(0.1)
-        robot.set_dout_bit_combination(rc, 0, 3, 0, rb.Endian.LittleEndian)
-        
-    else:
-        return
+        # release → DO0, grab → DO1 펄스. ON 은 여기서 출력을 마친 뒤 반환하고,
+        # OFF 는 gripper 작업 스레드가 보내므로 펄스 폭을 기다리지 않고 다음 이동(올라가기)으로 넘어감
+        return gripper.grip(ord)
 
 pose_initiate = np.array([-135.0, 0.0, 90.0, 0.0, 90.0, 45.0])
 
@@ -235,6 +276,12 @@ pose_desk[(0, 4)] = np.array([-162.40, 25.28, 122.86, -58.15, 89.97, 72.86])
 pose_desk[(0, 5)] = np.array([-129.54, 37.06, 94.07, -41.13, 89.96, 39.54]) # 2.3 middle
 pose_desk[(0, 6)] = np.array([ -129.62, 35.99, 94.12, -40.11, 89.96, 39.62]) # 2.3 high middle
 
+# 자세 라이브러리(poses.bin)에 이 로봇(ROBOT_IP)의 initiate / desk_1 ~ desk_6 이 있으면 그 값(set_robot_pose_set.py 로 다시 티칭한 값)을 사용
+POSES = load_library()
+pose_initiate = POSES.get(robot_pose_name(ROBOT_IP, "initiate"), default=pose_initiate)
+for key in pose_desk:
+    pose_desk[key] = POSES.get(robot_pose_name(ROBOT_IP, f"desk_{key[1]}"), default=pose_desk[key])
+
 current_p = {}
 current_p[(0)] = 0
 current_p[(1)] = 0
@@ -245,6 +292,16 @@ relative_move_acceleration = 500 # 상대 이동 가속도 (mm/s^2)
 
 md_distance = 50.0
 
+# 트레이 칸 위치 (사용자 좌표계, 테이블 2 의 1번 칸 기준)
+# 테이블 1: x+565, 테이블 3: y+475 / 칸 간격 -80 mm, 2행 3열 (1 2 3 / 4 5 6)
+TRAY = TrayLayout(table_origins={1: (565.0, 0.0), 2: (0.0, 0.0), 3: (0.0, 475.0)},
+                  rows=2, cols=3, pitch=(-80.0, -80.0))
+# True 면 칸 순서를 예상 이동 시간이 짧은 순서로 바꿈 (칸 k → 칸 k 짝은 유지)
+# 처음 호출 때 기구학 모델로 세 테이블 36 자세(칸 위/바닥)가 모두 풀리는지 확인하고, 하나라도 안 풀리면 끄고 기본 순서(1~6)로 실행합니다.
+# (USER_FRAME_RPY 가 실제 사용자 좌표계와 다르면 테이블 1, 3 이 작업 반경 850 mm 밖으로 계산되어 꺼집니다.)
+# 기대 효과는 작음: 모든 칸이 풀리는 좌표계에서 예상 사이클 시간 0.6~1.3 % 단축 (칸 사이 이동만 2.5~4.5 %).
+OPTIMIZE_SLOT_ORDER = True
+
 def initiate_pose_set():
     # ======= 1. 초기 관절 위치로 이동 =======
     initial_angles_j = pose_initiate
@@ -267,6 +324,7 @@ def cycle_1():
     mmove_j(initial_angles_j, move_j_speed_init, move_j_acceleration_init)
 
     while True:
+        trace.mark("cycle")
         #=====================================================
 
         unitmove(2)
@@ -285,6 +343,55 @@ def cycle_1():
 
     return
 
+def print_pipeline_stats():
+    # 명령별 지연 통계 (gap = 이전 이동 완료 → 다음 이동 시작 공백)
+    if pipeline is not None:
+        print(pipeline.format_stats())
+    print(gripper.format_stats())
+    # 계측이 켜져 있으면 새 span 으로 칸별 시간 갱신 (느려진 칸은 on_regression 에서 바로 출력)
+    if trace.get_tracer() is not None:
+        cycle_analyzer.update(trace.get_tracer())
+
+def report_regression(flag):
+    kind, table, area = flag["key"]
+    print(f"⚠️ [사이클 분석] {kind} 테이블 {table} 칸 {area}: p50 {flag['baseline_p50_ms']:.0f} → "
+          f"{flag['recent_p50_ms']:.0f} ms ({flag['delta_ms']:+.0f} ms, 주로 {flag['category']})")
+
+cycle_analyzer = CycleAnalyzer(on_regression=report_regression)
+
+sequencer = None # TransferSequencer (처음 slot_order 호출 때 생성)
+
+def slot_order(src, dst):
+    """
+    src 테이블 칸 물건을 dst 테이블 같은 칸으로 옮길 칸 순서.
+    OPTIMIZE_SLOT_ORDER 이면 현재 위치에서 시작해 예상 이동 시간이 가장 짧은 순서, 아니면 1~6.
+    """
+    global sequencer, OPTIMIZE_SLOT_ORDER
+
+    if not OPTIMIZE_SLOT_ORDER:
+        return list(range(1, TRAY.n_slots + 1))
+    if sequencer is None:
+        # 칸 자세 역기구학은 처음 한 번만 계산 (cycle_2 시작 자세 = 사용자 좌표계 원점 위)
+        # 시작 자세는 테이블마다 티칭한 1번 칸 자세 (pose_desk[(0, 1~3)] = 테이블 1~3 의 1번 칸)
+        sequencer = TransferSequencer(TRAY, q_ref=pose_desk[(0, 6)], frame_rpy=USER_FRAME_RPY,
+                                      q_seed={t: pose_desk[(0, t)] for t in TRAY.tables},
+                                      lin_speed=relative_move_speed, lin_acc=relative_move_acceleration,
+                                      lift=md_distance)
+        missing = sequencer.unreachable()
+        if missing:
+            print(f"⚠️ 기구학 모델로 풀리지 않는 칸 자세 {len(missing)}개 → 칸 순서 최적화를 끄고 기본 순서로 실행합니다. "
+                  f"(USER_FRAME_RPY / TRAY 확인)")
+            OPTIMIZE_SLOT_ORDER = False
+            return list(range(1, TRAY.n_slots + 1))
+    try:
+        plan = sequencer.sequence([(src, dst, a) for a in range(1, TRAY.n_slots + 1)],
+                                  start=(current_p[(0)], current_p[(1)]))
+    except ValueError:
+        return list(range(1, TRAY.n_slots + 1))
+    order = [job[2] for job in plan["order"]]
+    print(f"테이블 {src} → {dst} 칸 순서 {order} | 예상 {plan['time']:.2f} s (기본 순서 {plan['baseline_time']:.2f} s)")
+    return order
+
 def cycle_2():
 
     move_j_speed_init = 150 # 초기 이동 속도
@@ -299,12 +406,9 @@ def cycle_2():
     mmove_j(initial_angles_j, move_j_speed_init, move_j_acceleration_init)
 
     while True:
-        
-        sameplates = 0
+        trace.mark("cycle")
 
-        for i in range(6):
-
-            sameplates += 1
+        for sameplates in slot_order(1, 2):
 
             unitmove_lll(1, sameplates)
             gog("down")
@@ -316,13 +420,11 @@ def cycle_2():
             grip("release")
             gog("up")
 
-        #==============================
-
-        sameplates = 0
+        print_pipeline_stats()
 
-        for i in range(6):
+        #==============================
 
-            sameplates += 1
+        for sameplates in slot_order(3, 1):
 
             unitmove_lll(3, sameplates)
             gog("down")
@@ -334,13 +436,11 @@ def cycle_2():
             grip("release")
             gog("up")
 
-        #==============================
+        print_pipeline_stats()
 
-        sameplates = 0
-
-        for i in range(6):
+        #==============================
 
-            sameplates += 1
+        for sameplates in slot_order(2, 3):
 
             unitmove_lll(2, sameplates)
             gog("down")
@@ -352,9 +452,55 @@ def cycle_2():
             grip("release")
             gog("up")
 
+        print_pipeline_stats()
+
 
     return
 
+def cycle_2_blended():
+    """
+    cycle_2 와 같은 순서(테이블 1→2, 3→1, 2→3, 각 6칸)를 블렌딩 경로로 실행합니다.
+    칸마다 올라가기 → 옆으로 → 내려가기를 move_pb 하나로 보내고, 바닥에서만 멈춰 그리퍼를 동작합니다.
+    """
+
+    move_j_speed_init = 150 # 초기 이동 속도
+    move_j_acceleration_init = 150 # 초기 이동 가속도
+    grip_time = 0.1 # grip() 펄스 시간 (s)
+
+    grip("release")
+
+    initial_angles_j = pose_desk[(0, 6)]
+    mmove_j(initial_angles_j, move_j_speed_init, move_j_acceleration_init)
+
+    # 현재 위치(사용자 좌표 (0, 0) 위쪽)를 기준 TCP 로 사용
+    res, tcp_ref = robot.get_tcp_info(rc)
+    if not res.is_success():
+        print("--- [cycle_2_blended] TCP 위치를 읽지 못해 종료 ---")
+        return
+    planner = TrayTransferPlanner(tcp_ref, USER_FRAME_RPY, relative_move_speed, relative_move_acceleration,
+                                  lift=md_distance, blend=BLEND_DISTANCE)
+
+    rounds = ((1, 2), (3, 1), (2, 3))
+    sequence = [(table, action, area) for src, dst in rounds for area in range(1, 7)
+                for table, action in ((src, "grab"), (dst, "release"))]
+    est = planner.estimate_sequence([slot_target(t, a) for t, _, a in sequence], grip_time=grip_time)
+    print(f"[cycle_2_blended] 1회전 예상: 블렌딩 {est['blended']:.1f} s / "
+          f"구간별 정지 {est['stop_and_go']:.1f} s (약 {est['saved']:.1f} s 단축)")
+
+    pos = (0.0, 0.0)
+    from_bottom = False
+    while True:
+        t_start = time.monotonic()
+        for table, action, area in sequence:
+            target = slot_target(table, area)
+            path = planner.hop(pos, target, from_bottom)
+            if not path.run(robot, rc):
+                print(f"--- [cycle_2_blended] 테이블 {table} 칸 {area} 이동 시작 실패 ---")
+            grip(action)
+            pos, from_bottom = target, True
+        print(f"[cycle_2_blended] 1회전 실제 {time.monotonic() - t_start:.1f} s "
+              f"(예상 {est['blended']:.1f} s)")
+
 def gog(oord):
         
         # relative_move_speed = 400 # 상대 이동 속도 (mm/s)
@@ -370,51 +516,18 @@ def gog(oord):
 
         return
 
+def slot_target(table, area):
+        """테이블(1~3), 칸(1~6) 의 사용자 좌표계 (x, y) 오프셋 (mm). 테이블 2 의 1번 칸이 (0, 0)."""
+        x, y = TRAY.xy(table, area)
+        return float(x), float(y)
+
 def unitmove_lll(table, area):
 
         # relative_move_speed = 400 # 상대 이동 속도 (mm/s)
         # relative_move_acceleration = 400 # 상대 이동 가속도 (mm/s^2)
 
-        target_x = 0.0
-        target_y = 0.0
-
-        offset_x = 565
-        offset_y = 475
-
-        if (table == 1):
-            target_x += offset_x
-
-        elif(table == 2):
-            None
-
-        elif(table == 3):
-            target_y += offset_y
-
-        else:
-            None
-
-        nextstep = -80
-        nextstep_2 = -160
-
-        if (area == 2):
-            target_x += nextstep
-
-        elif(area == 3):
-            target_x += nextstep_2
-
-        elif(area == 4):
-            target_y += nextstep
-
-        elif(area == 5):
-            target_y += nextstep
-            target_x += nextstep
-
-        elif(area == 6):
-            target_y += nextstep
-            target_x += nextstep_2
-
-        else:
-            None
+        trace.mark("unit", table=table, area=area)
+        target_x, target_y = slot_target(table, area)
 
         move_x = target_x - current_p[(0)]
         move_y = target_y - current_p[(1)]
@@ -432,31 +545,10 @@ def unitmove_ll(target_x, target_y, area):
         relative_move_speed = 300 # 상대 이동 속도 (mm/s)
         relative_move_acceleration = 300 # 상대 이동 가속도 (mm/s^2)
 
-        # offset_x = 565
-        # offset_y = 475
-
-        nextstep = -80
-        nextstep_2 = -160
-
-        if (area == 2):
-            target_x =+ nextstep
-
-        elif(area == 3):
-            target_x += nextstep_2
-
-        elif(area == 4):
-            target_y += nextstep
-
-        elif(area == 5):
-            target_y += nextstep
-            target_x += nextstep
-
-        elif(area == 6):
-            target_y += nextstep
-            target_x += nextstep_2
-
-        else:
-            None
+        # (target_x, target_y) 를 1번 칸으로 보고 칸 오프셋을 더함
+        dx, dy = TRAY.area_offset[area]
+        target_x += dx
+        target_y += dy
 
         move_x = target_x - current_p[(0)]
         move_y = target_y - current_p[(1)]
@@ -471,6 +563,8 @@ def unitmove_ll(target_x, target_y, area):
 
 def unitmove(num):
 
+        # 제자리 집기 → pose_desk[(0, num)] 에 놓기 (사이클 분석은 테이블 0, 칸 num 으로 기록)
+        trace.mark("unit", table=0, area=num)
         relative_displacement_down_10cm = [0.0, 0.0, -md_distance, 0.0, 0.0, 0.0]
         mmove_l_relative(relative_displacement_down_10cm, relative_move_speed, relative_move_acceleration, relative_coord_system_index)
 
@@ -480,6 +574,7 @@ def unitmove(num):
         mmove_l_relative(relative_displacement_down_10cm, relative_move_speed, relative_move_acceleration, relative_coord_system_index)
 
 
+        trace.mark("unit", table=0, area=num)
         initial_angles_j = pose_desk[(0, num)]
         mmove_j(initial_angles_j, move_j_speed_init, move_j_acceleration_init)
 
@@ -503,7 +598,19 @@ def main():
 
     # cycle_1()
 
-    cycle_2()
+    try:
+        if USE_BLENDED_PATH:
+            cycle_2_blended()
+        else:
+            cycle_2()
+    finally:
+        gripper.stop()
+        if trace.get_tracer() is not None:
+            print(trace.format_summary())
+            cycle_analyzer.update(trace.get_tracer())
+            cycle_analyzer.flush()
+            print(cycle_analyzer.format_report())
+            print(f"계측 저장: {trace.export_chrome_trace('show10_trace.json')} (chrome://tracing 에서 열기)")
     
 if __name__ == "__main__":
     main()
@@ -1,64 +1,37 @@
 # wasdqe move insert
 # pay with sudo python3 show12.py
 
-import socket
+import os
+import sys
+import asyncio
 import rbpodo as rb
-import numpy as np
-import time
 import keyboard  # pip install keyboard
 
+# 상위 폴더의 공용 모듈(robotarm_*.py) 사용
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from robotarm_fleet import Fleet, format_broadcast # 여러 대 로봇 동시 명령 (asyncio)
+
 ROBOT_IPS = ["192.168.0.22", "192.168.0.21", "192.168.0.20"]
 SOCKET_PORT = 5000
 
 move_step = 100.0
+ACK_DEADLINE = 0.5 # 로봇별 ack 대기 한도 (s)
 
-class RobotController:
-    def __init__(self, ip, idx):
-        self.ip = ip
-        self.idx = idx
-        self.robot = rb.Cobot(ip)
-        self.rc = rb.ResponseCollector()
-        self.sock = None
-        self._connect()
-        self._init_robot()
-
-    def _connect(self):
-        try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.connect((self.ip, SOCKET_PORT))
-            print(f"[{self.idx+1}] 소켓 연결 성공: {self.ip}")
-        except socket.error as e:
-            print(f"[{self.idx+1}] 소켓 연결 실패: {e}")
-            self.sock = None
-
-    def _init_robot(self):
-        self.robot.set_operation_mode(self.rc, rb.OperationMode.Real)
-        self.robot.set_speed_bar(self.rc, 0.5)
-        print(f"[{self.idx+1}] 로봇 초기화 완료")
-
-    def send_command(self, command):
-        if not self.sock:
-            print(f"[{self.idx+1}] 소켓 미연결 - 명령 전송 불가")
-            return None
-        try:
-            self.sock.sendall(command.encode())
-            response = self.sock.recv(1024).decode()
-            return response
-        except Exception as e:
-            print(f"[{self.idx+1}] 소켓 통신 오류: {e}")
-            return None
-
-    def move_relative(self, dx=0, dy=0, dz=0):
-        disp = [dx, dy, dz, 0, 0, 0]
-        speed = 200
-        accel = 200
-        coord_sys = 2
-        command = f"move_l_rel(pnt[{', '.join(map(str, disp))}], {speed}, {accel}, {coord_sys})"
-        response = self.send_command(command)
-        print(f"[{self.idx+1}] 명령 전송: {command}, 응답: {response}")
+def move_relative_command(dx=0, dy=0, dz=0):
+    disp = [dx, dy, dz, 0, 0, 0]
+    speed = 200
+    accel = 200
+    coord_sys = 2
+    return f"move_l_rel(pnt[{', '.join(map(str, disp))}], {speed}, {accel}, {coord_sys})"
 
-def main():
-    controllers = [RobotController(ip, idx) for idx, ip in enumerate(ROBOT_IPS)]
+async def _main():
+    # 모든 로봇의 스크립트 소켓 + rb.asyncio.Cobot 세션을 동시에 연결/초기화
+    fleet = Fleet(ROBOT_IPS, SOCKET_PORT)
+    members = await fleet.connect(operation_mode=rb.OperationMode.Real, speed_bar=0.5)
+    if not members:
+        print("연결된 로봇이 없어 종료합니다.")
+        return
+    print(f"로봇 {len(members)}대 초기화 완료")
     print("W,S: y축 ↑↓ / A,D: x축 ←→ / Q,E: z축 ↑↓ 제어. ESC 누르면 종료.")
 
     try:
@@ -73,16 +46,24 @@ def main():
 
             if dx != 0 or dy != 0 or dz != 0:
                 print(f"입력 감지됨. dx={dx}, dy={dy}, dz={dz}")
-                for ctrl in controllers:
-                    ctrl.move_relative(dx, dy, dz)
-                time.sleep(0.3)
+                # 모든 로봇에 동시에 전송하고 로봇별 ack 지연 / 로봇 간 skew 출력
+                result = await fleet.broadcast(move_relative_command(dx, dy, dz), deadline=ACK_DEADLINE)
+                print(format_broadcast(result))
+                await asyncio.sleep(0.3)
 
             if keyboard.is_pressed('esc'):
                 print("ESC 입력 감지 - 종료합니다.")
                 break
 
-            time.sleep(0.05)
+            await asyncio.sleep(0.05)
+
+    finally:
+        print(f"지연 통계: {fleet.stats()}")
+        await fleet.close()
 
+def main():
+    try:
+        asyncio.run(_main())
     except KeyboardInterrupt:
         print("키보드 인터럽트로 종료")
     print("프로그램 종료")
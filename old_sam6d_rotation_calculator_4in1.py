@@ -1,12 +1,16 @@
 # 회전 상태 4개중 하나를 보는 함수
 # 아직 추가적인 수정이 필요함
 
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from scipy.spatial.transform import Rotation as R
-import rbpodo as rb
-import robotarm_functions as ra_fs
 import numpy as np
+from robotarm_grasp import select_grasp_rotations, euler_zyx_deg # (N,3,3) 한 번에 처리 (print / 그림 없음)
+from robotarm_lazy import lazy_import, is_headless, matplotlib_backend
+
+# 그림 / 로봇 모듈은 SHOW_PLOTS 경로에서 처음 쓸 때 import (배치 처리만 하면 import 안 함)
+plt = lazy_import("matplotlib.pyplot", backend=matplotlib_backend())
+rb = lazy_import("rbpodo")
+ra_fs = lazy_import("robotarm_functions")
+
+SHOW_PLOTS = False # True 면 예전처럼 행렬마다 단계별 출력 + 3D 그림 (totalmove)
 
 ################################################################################################################################
 
@@ -56,6 +60,7 @@ def plot_comparison_scenario(initial_matrix, matrix_cond_z, matrix_reference, ma
         matrix_selected (np.ndarray): Step 6에서 조건 범위를 만족하는 3x3 회전 행렬 중 하나.
         title (str): 그래프 제목.
     """
+    import mpl_toolkits.mplot3d # noqa: F401 (projection='3d' 등록)
     fig = plt.figure(figsize=(10, 10))
     ax = fig.add_subplot(111, projection='3d')
 
@@ -116,7 +121,11 @@ def plot_comparison_scenario(initial_matrix, matrix_cond_z, matrix_reference, ma
     ax.set_box_aspect([1,1,1]) # Matplotlib 3.3 이상
 
     ax.legend()
-    plt.show()
+    if is_headless():
+        fig.savefig(f"{title.replace(':', '').replace(' ', '_')}.png") # 화면이 없으면 파일로 저장
+        plt.close(fig)
+    else:
+        plt.show()
 
 # --- 메인 분석 및 처리 함수 ---
 def process_and_analyze_matrix_sequence(input_matrix, title="Analysis Result"):
@@ -397,8 +406,8 @@ def process_and_analyze_matrix_sequence(input_matrix, title="Analysis Result"):
 
 def matrecive(mmat):
     try:
-            r_scipy = R.from_matrix(mmat)
-            euler_angles_deg = np.degrees(r_scipy.as_euler('ZYX', degrees=False))
+            # scipy Rotation.from_matrix(mmat).as_euler('ZYX') 와 같은 값 (scipy import 없이 계산)
+            euler_angles_deg = euler_zyx_deg(mmat)
             print("\n변환된 오일러 각 (도):")
             print(f"Roll (X축): {euler_angles_deg[0]:.2f} deg")
             print(f"Pitch (Y축): {euler_angles_deg[1]:.2f} deg")
@@ -443,9 +452,24 @@ def _main():
 
     matrecive(matrix_from_json)
 
+    # Z 10도씩 돌린 20개 자세
+    matrices = []
     for i in range(20):
         matrix_from_json = get_rotation_matrix_z(10) @ matrix_from_json
-        totalmove(matrix_from_json)
+        matrices.append(matrix_from_json)
+
+    if SHOW_PLOTS:
+        for m in matrices:
+            totalmove(m)
+        return
+
+    # totalmove 와 같은 결과 (선택 행렬 @ Rx(-90) @ Rz(-90) 의 ZYX 오일러 각) 를 한 번에 계산
+    result = select_grasp_rotations(np.array(matrices))
+    for i, (ok, step, euler) in enumerate(zip(result["valid"], result["step_deg"], result["euler_zyx_deg"])):
+        if ok:
+            print(f"[{i:2d}] flip {int(result['flip'][i])} | local Y {step:5.0f} deg | ZYX {np.round(euler, 2)}")
+        else:
+            print(f"[{i:2d}] ±45도 안의 후보 없음")
 
 
 
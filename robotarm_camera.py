@@ -0,0 +1,227 @@
+# 카메라 캡처 전용 스레드 모듈
+# cap.read() 는 프레임 주기만큼 블로킹되므로 asyncio 코루틴 안에서 직접 부르면
+# 로봇 데이터/이동 태스크가 같이 멈춥니다. FrameGrabber 는 별도 스레드에서 읽어서
+# 미리 할당한 3중 버퍼에 채우고, asyncio 쪽에는 가장 최신 프레임만 복사 없이 넘겨줍니다.
+#
+# 사용 예)
+#   grabber = FrameGrabber(indices=(0, 2))
+#   if grabber.open():
+#       grabber.start()
+#       frame, stamp, seq = await grabber.wait_frame()
+#       ...
+#       grabber.stop()
+
+import time
+import asyncio
+import threading
+import logging
+import numpy as np
+from robotarm_lazy import lazy_import
+
+cv2 = lazy_import("cv2") # 카메라를 열 때 import (헤드리스 실행은 import 비용 없음)
+
+
+class FrameGrabber:
+    """
+    OpenCV 캡처 스레드 + 3중 버퍼.
+
+    버퍼 3개를 "최신", "읽는 중(소비자 보유)", "쓰는 중" 으로 돌려 쓰므로
+    캡처 스레드는 소비자를 기다리지 않고, 소비자는 복사 없이 최신 프레임을 받습니다.
+    소비자가 가져가기 전에 새 프레임으로 덮어쓴 경우 dropped 로 셉니다.
+    각 프레임에는 cap.read() 가 끝난 시점의 time.monotonic() 값이 붙으므로
+    TelemetryRing.nearest_index(stamp) 로 같은 시점의 관절 값을 찾을 수 있습니다.
+
+    Args:
+        indices (tuple): 순서대로 시도할 카메라 인덱스.
+        width, height (int or None): 요청할 해상도. None 이면 카메라 기본값.
+        n_buffers (int): 버퍼 수 (3 이상).
+        on_frame (callable or None): 프레임마다 캡처 스레드에서 on_frame(frame, stamp, seq) 호출.
+            소비자가 건너뛴 프레임도 모두 전달되므로 기록(SessionRecorder.write_frame)에 사용합니다.
+            캡처 주기를 넘기지 않도록 가볍게 유지하세요. 콜백 예외는 캡처를 멈추지 않고 callback_errors 로 셉니다.
+    """
+
+    def __init__(self, indices=(0,), width=None, height=None, n_buffers=3, on_frame=None):
+        if n_buffers < 3:
+            raise ValueError("n_buffers 는 3 이상이어야 합니다.")
+        self.indices = indices
+        self.width = width
+        self.height = height
+        self.n_buffers = n_buffers
+        self.on_frame = on_frame
+        self.cap = None
+        self.buffers = None
+        self.stamps = np.zeros(n_buffers)
+        self.seqs = np.zeros(n_buffers, dtype=np.int64)
+
+        self._lock = threading.Lock() # 슬롯 인덱스 교환에만 사용 (프레임 복사 없음)
+        self._latest = -1    # 아직 소비되지 않은 최신 프레임 슬롯
+        self._reading = -1   # 소비자가 들고 있는 슬롯
+        self._thread = None
+        self._running = False
+        self._loop = None
+        self._event = None
+
+        self.captured = 0        # 읽은 프레임 수
+        self.dropped = 0         # 소비되기 전에 덮어쓴 프레임 수
+        self.read_failures = 0   # cap.read() 실패 횟수
+        self.callback_errors = 0 # on_frame 예외 횟수
+
+    def open(self):
+        """indices 를 순서대로 열어보고, 첫 프레임으로 버퍼 크기를 정합니다. 성공 시 True."""
+        for index in self.indices:
+            cap = cv2.VideoCapture(index)
+            if not cap.isOpened():
+                logging.warning(f"Camera index {index} failed.")
+                continue
+            if self.width:
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            if self.height:
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+            ret, frame = cap.read()
+            if not ret:
+                logging.warning(f"Camera index {index} opened but returned no frame.")
+                cap.release()
+                continue
+            self.cap = cap
+            self.buffers = np.empty((self.n_buffers,) + frame.shape, dtype=frame.dtype)
+            logging.info(f"Camera index {index} opened: {frame.shape[1]}x{frame.shape[0]}")
+            return True
+        return False
+
+    @property
+    def frame_shape(self):
+        """열린 카메라의 프레임 모양 (H, W, C). open() 전에는 None."""
+        return None if self.buffers is None else self.buffers.shape[1:]
+
+    def start(self):
+        """
+        캡처 스레드를 시작합니다. 실행 중인 asyncio 루프가 있으면 wait_frame() 알림에 연결하고,
+        없으면 처음 wait_frame() 을 부른 루프에 연결합니다.
+        """
+        try:
+            self._loop = asyncio.get_running_loop()
+            self._event = asyncio.Event()
+        except RuntimeError:
+            self._loop = None
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+
+    def _free_slot(self):
+        for slot in range(self.n_buffers):
+            if slot != self._latest and slot != self._reading:
+                return slot
+        return -1 # n_buffers >= 3 이면 발생하지 않음
+
+    def _reallocate(self, img):
+        """
+        버퍼를 img 모양으로 새로 할당합니다. 소비자가 들고 있는 프레임은 이전 배열의 view 로 남아 그대로 유효하고,
+        아직 소비되지 않은 최신 프레임은 새 배열에 없으므로 버린 것으로 셉니다.
+        """
+        logging.warning(f"Camera frame shape changed: {self.buffers.shape[1:]} -> {img.shape}, reallocating buffers")
+        buffers = np.empty((self.n_buffers,) + img.shape, dtype=img.dtype)
+        with self._lock:
+            if self._latest >= 0:
+                self.dropped += 1
+                self._latest = -1
+            self.buffers = buffers
+
+    def _run(self):
+        try:
+            self._capture()
+        except Exception:
+            # 캡처 스레드가 조용히 끝나지 않도록 기록
+            logging.exception("FrameGrabber capture thread stopped")
+            self._running = False
+
+    def _capture(self):
+        with self._lock:
+            slot = self._free_slot()
+        while self._running:
+            buf = self.buffers[slot]
+            ret, img = self.cap.read(buf) # 같은 크기면 buf 에 바로 씀 (복사 없음)
+            stamp = time.monotonic()
+            if not ret:
+                self.read_failures += 1
+                time.sleep(0.005)
+                continue
+            if img is not buf:
+                if img.shape != buf.shape or img.dtype != buf.dtype:
+                    # 해상도 변경 / 재연결 등으로 프레임 모양이 바뀌면 버퍼를 새로 할당
+                    self._reallocate(img)
+                    buf = self.buffers[slot]
+                buf[...] = img
+
+            self.captured += 1
+            self.stamps[slot] = stamp
+            self.seqs[slot] = self.captured
+            if self.on_frame is not None:
+                # 아직 공개 전인 슬롯이므로 소비자와 겹치지 않음
+                try:
+                    self.on_frame(buf, stamp, self.captured)
+                except Exception:
+                    # 프레임 하나의 기록 실패로 캡처 스레드가 끝나지 않도록 첫 예외만 남기고 셉니다.
+                    if self.callback_errors == 0:
+                        logging.exception("FrameGrabber on_frame callback failed")
+                    self.callback_errors += 1
+            with self._lock:
+                if self._latest >= 0:
+                    self.dropped += 1 # 이전 최신 프레임은 소비되지 않고 버려짐
+                self._latest = slot
+                slot = self._free_slot()
+
+            loop, event = self._loop, self._event
+            if loop is not None:
+                try:
+                    loop.call_soon_threadsafe(event.set)
+                except RuntimeError:
+                    # 기다리던 루프가 닫힘 (asyncio.run 종료 등) → 알림 없이 계속 캡처, 다음 wait_frame 이 다시 연결
+                    if self._loop is loop:
+                        self._loop = None
+                        self._event = None
+
+    def acquire(self):
+        """
+        새 프레임이 있으면 (frame, stamp, seq) 를 반환하고, 없으면 None.
+
+        frame 은 내부 버퍼 view 이며 다음 acquire() 호출 전까지 캡처 스레드가 건드리지 않습니다.
+        (cv2.putText 등으로 그 위에 바로 그려도 됩니다.)
+        """
+        with self._lock:
+            if self._latest < 0:
+                return None
+            self._reading = self._latest
+            self._latest = -1
+            slot = self._reading
+            frame = self.buffers[slot] # 버퍼 재할당과 겹치지 않도록 lock 안에서 view 를 잡음
+        return frame, self.stamps[slot], int(self.seqs[slot])
+
+    async def wait_frame(self, timeout=None):
+        """새 프레임이 올 때까지 기다렸다가 (frame, stamp, seq) 를 반환합니다. 타임아웃 시 None."""
+        if self._event is None:
+            # start() 를 asyncio 루프 밖에서 부른 경우 처음 기다리는 루프에 알림을 연결
+            self._event = asyncio.Event()
+            self._loop = asyncio.get_running_loop()
+        while True:
+            item = self.acquire()
+            if item is not None:
+                return item
+            self._event.clear()
+            item = self.acquire() # clear 직전에 들어온 프레임 확인
+            if item is not None:
+                return item
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+    def stats(self):
+        return {"captured": self.captured, "dropped": self.dropped, "read_failures": self.read_failures,
+                "callback_errors": self.callback_errors}
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        if self.cap is not None:
+            self.cap.release()
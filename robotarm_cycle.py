@@ -0,0 +1,442 @@
+# 픽앤플레이스 사이클 타임 분석기
+# robotarm_trace 의 span 흐름(실시간 Tracer 또는 저장한 Chrome trace 파일)을 받아
+# 작업 단위(unitmove_lll → gog → grip → gog)로 나누고, 단위마다 시간을 분류해 누적합니다.
+#
+# 시간 분류
+#   joint   : 관절 이동 (mmove_j 의 이동 완료 대기 등)
+#   linear  : 직선 이동 (mmove_l_relative 완료 대기, 파이프라인에 먼저 보낸 직선 이동을 기다린 sync_pipeline /
+#             pipeline_wait(파이프라인 자리 대기))
+#   gripper : 그리퍼 펄스 예약 (grip 에서 sync_pipeline 을 뺀 나머지)
+#   wait    : 이동 시작 대기 (wait_for_move_started)
+#   socket  : 명령 전송 / flush / rc.error() 확인 / 파이프라인 명령 전송 (통신 왕복)
+#   idle    : 이동 함수 사이 빈 시간 (파이썬 처리, print 등)
+#
+# 작업 단위 구분: show10 이 unitmove_lll / unitmove 시작에 trace.mark("unit", table=, area=) 를,
+# 사이클 루프 처음에 trace.mark("cycle") 를 남깁니다. 단위 안의 grip 명령이 grab 이면 pick, release 면 place 입니다.
+#
+# 메모리: 키(pick/place, 테이블, 칸)마다 고정 크기 로그 히스토그램 몇 개 + 분류별 평균만 보관하므로
+# 사이클 수와 상관없이 일정합니다. 최근 값은 지수 감쇠 히스토그램(반감기 half_life 단위)으로,
+# 기준 값은 처음 baseline_n 개로 고정한 히스토그램으로 보고, 최근 p50 이 기준보다 threshold_ms 이상 느려지면 경고합니다.
+#
+# 사용 예)
+#   analyzer = CycleAnalyzer()
+#   analyzer.update(trace.get_tracer())      # 실시간: 새 span 만 가져감 (사이클마다 호출)
+#   analyzer.feed(load_chrome_trace("show10_trace.json"))   # 저장한 파일
+#   print(analyzer.format_report())
+#   python robotarm_cycle.py show10_trace.json
+
+import sys
+import json
+from collections import deque
+import numpy as np
+
+import robotarm_trace as trace
+
+JOINT = "joint"
+LINEAR = "linear"
+GRIPPER = "gripper"
+WAIT = "wait"
+SOCKET = "socket"
+IDLE = "idle"
+CATEGORIES = (JOINT, LINEAR, GRIPPER, WAIT, SOCKET, IDLE)
+
+UNIT_MARK = "unit"
+CYCLE_MARK = "cycle"
+
+# 이동 함수(MOVE span) 이름 → 남는 시간의 분류
+MOVE_CLASS = {
+    "mmove_j": JOINT,
+    "robot_move_startpoint": JOINT,
+    "mmove_l_relative": LINEAR,
+    "robot_move_linear": LINEAR,
+    "grip": GRIPPER,
+}
+# 세부 구간 이름 → 분류 (None 이면 부모 이동 함수의 분류)
+STEP_CLASS = {
+    "send": SOCKET,
+    "error_check": SOCKET,
+    "pipeline_submit": SOCKET,  # 자리 대기는 pipeline_wait 로 따로 기록 (submit 은 전송만)
+    "move_j": SOCKET,
+    "move_l_rel.base": SOCKET,
+    "move_l_rel.tool": SOCKET,
+    "sync_pipeline": LINEAR,
+    "pipeline_wait": LINEAR,    # 앞서 보낸 이동을 기다림 (앞 단위가 보낸 이동이면 앞 단위로 옮김, _close_unit)
+    "wait_started": WAIT,
+    "wait_finished": None,
+    "wait_motion": None,
+}
+
+REGRESSION_MS = 200.0 # 최근 p50 - 기준 p50 이 이 값 이상이면 경고
+BASELINE_N = 30       # 기준 히스토그램에 넣을 처음 단위 수
+HALF_LIFE = 20.0      # 최근 히스토그램 반감기 (단위 수)
+MIN_RECENT = 5        # 기준을 채운 뒤 경고 전에 필요한 단위 수
+
+
+class LogHistogram:
+    """
+    고정 로그 간격 히스토그램 (ms). 값 개수와 상관없이 메모리가 일정합니다.
+
+    Args:
+        lo_ms, hi_ms (float): 범위 (벗어나면 양 끝 칸).
+        n_bins (int): 칸 수. 기본값이면 칸 폭 약 2.3 %.
+        decay (float): 값을 넣을 때마다 기존 개수에 곱할 값 (1.0 이면 감쇠 없음).
+    """
+
+    def __init__(self, lo_ms=1.0, hi_ms=1e5, n_bins=512, decay=1.0):
+        self.log_lo = np.log(lo_ms)
+        self.log_hi = np.log(hi_ms)
+        self.n_bins = n_bins
+        self.decay = decay
+        self.counts = np.zeros(n_bins)
+        self.weight = 0.0 # 감쇠 적용 개수 합
+        self.n = 0
+        self.sum = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _bin(self, x):
+        k = (np.log(max(x, 1e-9)) - self.log_lo) / (self.log_hi - self.log_lo) * self.n_bins
+        return int(min(max(k, 0), self.n_bins - 1))
+
+    def add(self, x):
+        if self.decay != 1.0:
+            self.counts *= self.decay
+            self.weight *= self.decay
+        self.counts[self._bin(x)] += 1.0
+        self.weight += 1.0
+        self.n += 1
+        self.sum += x
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def quantile(self, q):
+        """q (0~1) 분위수 (칸 안에서 로그 보간). 비어 있으면 NaN."""
+        if self.weight <= 0:
+            return float("nan")
+        c = np.cumsum(self.counts)
+        target = q * c[-1]
+        k = int(np.searchsorted(c, target))
+        k = min(k, self.n_bins - 1)
+        prev = c[k - 1] if k > 0 else 0.0
+        frac = (target - prev) / self.counts[k] if self.counts[k] > 0 else 0.5
+        edge = self.log_lo + (k + frac) * (self.log_hi - self.log_lo) / self.n_bins
+        return float(np.clip(np.exp(edge), self.min, self.max))
+
+    @property
+    def mean(self):
+        return self.sum / self.n if self.n else float("nan")
+
+    def copy_from(self, other):
+        self.counts = other.counts.copy()
+        self.weight = other.weight
+        self.n, self.sum, self.min, self.max = other.n, other.sum, other.min, other.max
+
+
+class UnitStats:
+    """키(pick/place, 테이블, 칸) 1개의 누적 통계."""
+
+    def __init__(self, baseline_n=BASELINE_N, half_life=HALF_LIFE):
+        self.baseline_n = baseline_n
+        self.baseline = LogHistogram()
+        self.recent = LogHistogram(decay=0.5 ** (1.0 / half_life))
+        self.baseline_mix = np.zeros(len(CATEGORIES)) # 기준 구간 분류별 평균 (ms)
+        self.recent_mix = np.zeros(len(CATEGORIES))   # 최근 분류별 지수 평균 (ms)
+        self._alpha = 1.0 - 0.5 ** (1.0 / half_life)
+        self.n = 0
+        self.since_baseline = 0
+        self.flagged = False
+
+    def add(self, total_ms, mix):
+        self.n += 1
+        self.recent.add(total_ms)
+        if self.n == 1:
+            self.recent_mix[:] = mix
+        else:
+            self.recent_mix += self._alpha * (mix - self.recent_mix)
+        if self.baseline.n < self.baseline_n:
+            self.baseline.add(total_ms)
+            self.baseline_mix += (mix - self.baseline_mix) / self.baseline.n
+        else:
+            self.since_baseline += 1
+
+    def rebaseline(self):
+        """최근 분포를 새 기준으로 삼습니다 (재교시 후 변화를 받아들일 때)."""
+        self.baseline.copy_from(self.recent)
+        self.baseline_mix = self.recent_mix.copy()
+        self.since_baseline = 0
+        self.flagged = False
+
+    def delta_ms(self):
+        return self.recent.quantile(0.5) - self.baseline.quantile(0.5)
+
+
+def classify(spans, t_start, t_end):
+    """
+    [t_start, t_end) 안의 span 들의 시간을 분류별로 나눕니다 (ms).
+
+    Args:
+        spans (list): (이름, 분류, t0, t1, 스레드, 인자) 튜플, 시작 순 정렬. 시각은 ns.
+    Returns:
+        np.ndarray: CATEGORIES 순서의 분류별 시간 (ms). idle = 구간 길이 - 이동 함수 시간 합.
+    """
+    mix = np.zeros(len(CATEGORIES))
+    index = {c: i for i, c in enumerate(CATEGORIES)}
+    moves = [s for s in spans if s[1] == trace.MOVE and t_start <= s[2] < t_end]
+    steps = [s for s in spans if s[1] == trace.STEP and t_start <= s[2] < t_end]
+    covered = 0.0
+    j = 0
+    for name, _, t0, t1, tid, _ in moves:
+        parent = MOVE_CLASS.get(name, JOINT)
+        dur = (t1 - t0) / 1e6
+        covered += dur
+        child_total = 0.0
+        while j < len(steps) and steps[j][2] < t0:
+            j += 1
+        k = j
+        while k < len(steps) and steps[k][2] < t1:
+            s = steps[k]
+            if s[4] == tid and s[3] <= t1:
+                d = (s[3] - s[2]) / 1e6
+                mix[index[STEP_CLASS.get(s[0]) or parent]] += d
+                child_total += d
+            k += 1
+        mix[index[parent]] += max(dur - child_total, 0.0)
+    mix[index[IDLE]] += max((t_end - t_start) / 1e6 - covered, 0.0)
+    return mix
+
+
+class CycleAnalyzer:
+    """
+    span 흐름 → 작업 단위 / 사이클 분석.
+
+    Args:
+        threshold_ms (float): 회귀 경고 기준 (최근 p50 - 기준 p50).
+        baseline_n (int): 키마다 기준으로 삼을 처음 단위 수.
+        half_life (float): 최근 통계 반감기 (단위 수).
+        history (int): 최근 사이클 요약 보관 수 (추세 출력용).
+        on_regression (callable or None): 경고가 생길 때 on_regression(flag dict) 호출.
+    """
+
+    def __init__(self, threshold_ms=REGRESSION_MS, baseline_n=BASELINE_N, half_life=HALF_LIFE, history=50,
+                 on_regression=None):
+        self.threshold_ms = threshold_ms
+        self.baseline_n = baseline_n
+        self.half_life = half_life
+        self.on_regression = on_regression
+        self.units = {} # 키 → UnitStats
+        self.cycle_total = LogHistogram()
+        self.cycle_mix = np.zeros(len(CATEGORIES)) # 사이클 분류별 합계 누적
+        self.cycles = deque(maxlen=history)
+        self.flags = deque(maxlen=history)
+        self.n_units = 0
+
+        self._pending = []  # 아직 끝나지 않은 단위의 span
+        self._unit = None   # (시작 ns, 테이블, 칸)
+        self._held = None   # 끝났지만 다음 단위의 이월 시간을 기다리는 단위 (_close_unit 참고)
+        self._cycle = None  # 진행 중 사이클 {"t0", "mix", "units", "open", "t_end"}
+        self._cursor = 0    # Tracer.since() 기록 번호
+
+    # ====== 입력 ======
+
+    def update(self, tracer):
+        """실시간 Tracer 에서 지난 호출 이후 새로 기록된 span 만 가져와 처리합니다."""
+        if tracer is None:
+            return
+        spans, self._cursor = tracer.since(self._cursor)
+        self.feed(spans)
+
+    def feed(self, spans):
+        """
+        span 들을 처리합니다. 기록 순(끝난 순)이어도 되고 시작 순이어도 됩니다.
+        unit / cycle 표시를 만나면 그 앞까지의 단위 / 사이클을 확정합니다.
+        """
+        for s in spans:
+            if s is None:
+                continue
+            if s[1] == "mark" and s[0] in (UNIT_MARK, CYCLE_MARK):
+                self._boundary(s)
+            elif s[1] in (trace.MOVE, trace.STEP):
+                self._pending.append(s)
+
+    def flush(self):
+        """남은 단위를 마지막 span 끝 시각까지로 확정합니다 (기록을 다 넣은 뒤 호출)."""
+        if self._pending:
+            t_end = max(s[3] for s in self._pending)
+            self._close_unit(t_end)
+            if self._cycle is not None:
+                self._end_cycle(t_end)
+        if self._held is not None:
+            self._commit(self._held)
+            self._held = None
+
+    def _boundary(self, mark):
+        t = mark[2]
+        self._close_unit(t)
+        if mark[0] == CYCLE_MARK:
+            if self._cycle is not None:
+                self._end_cycle(t)
+            self._cycle = {"t0": t, "mix": np.zeros(len(CATEGORIES)), "units": 0, "open": 0, "t_end": None}
+        else:
+            args = mark[5] or {}
+            self._unit = (t, args.get("table"), args.get("area"))
+
+    # ====== 확정 ======
+
+    def _close_unit(self, t_end):
+        """
+        [단위 시작, t_end) 를 분류하고, 한 단위 늦게 통계에 넣습니다.
+
+        파이프라인 창이 차 있으면 이 단위의 첫 이동 예약(pipeline_wait)은 앞 단위가 보낸 이동
+        (예: 앞 칸의 올라가기)이 끝나기를 기다립니다. 그래서 이 단위에서 처음 파이프라인을 비우기(sync_pipeline) 전의
+        pipeline_wait 시간은 앞 단위의 linear 시간으로 옮긴 뒤 앞 단위를 확정합니다.
+        """
+        spans = sorted((s for s in self._pending if s[2] < t_end), key=lambda s: s[2])
+        self._pending = [s for s in self._pending if s[2] >= t_end]
+        if self._unit is None:
+            return
+        t_start, table, area = self._unit
+        self._unit = None
+        mix = classify(spans, t_start, t_end)
+        kind = "move"
+        t_drain = t_end
+        for name, _, t0, _, _, args in spans:
+            if name == "grip" and t_start <= t0 < t_end and args:
+                kind = {"grab": "pick", "release": "place"}.get(args.get("command"), kind)
+            if name == "sync_pipeline" and t_start <= t0 < t_drain:
+                t_drain = t0
+        carry = sum((t1 - t0) / 1e6 for name, _, t0, t1, _, _ in spans
+                    if name == "pipeline_wait" and t_start <= t0 < t_drain)
+        unit = {"key": (kind, table, area), "total": (t_end - t_start) / 1e6, "mix": mix, "cycle": self._cycle}
+        if self._cycle is not None:
+            self._cycle["open"] += 1
+        held, self._held = self._held, unit
+        if held is not None:
+            k = CATEGORIES.index(LINEAR)
+            carry = min(carry, mix[k])
+            mix[k] -= carry
+            unit["total"] -= carry
+            held["mix"][k] += carry
+            held["total"] += carry
+            self._commit(held)
+
+    def _commit(self, unit):
+        """단위 1개를 통계 / 사이클에 넣고 회귀 여부를 확인합니다."""
+        key = unit["key"]
+        stats = self.units.get(key)
+        if stats is None:
+            stats = self.units[key] = UnitStats(self.baseline_n, self.half_life)
+        stats.add(unit["total"], unit["mix"])
+        self.n_units += 1
+        cycle = unit["cycle"]
+        if cycle is not None:
+            cycle["mix"] += unit["mix"]
+            cycle["units"] += 1
+            cycle["open"] -= 1
+            if cycle["t_end"] is not None and cycle["open"] == 0:
+                self._close_cycle(cycle)
+        self._check(key, stats)
+
+    def _end_cycle(self, t_end):
+        """사이클 끝 시각을 정합니다. 마지막 단위가 아직 확정 전이면 그때 마감합니다."""
+        cycle, self._cycle = self._cycle, None
+        cycle["t_end"] = t_end
+        if cycle["open"] == 0:
+            self._close_cycle(cycle)
+
+    def _close_cycle(self, cycle):
+        total = (cycle["t_end"] - cycle["t0"]) / 1e6
+        if cycle["units"] == 0:
+            return
+        # 단위 밖 시간(사이클 사이 print_pipeline_stats 등)은 idle
+        mix = cycle["mix"].copy()
+        mix[CATEGORIES.index(IDLE)] += max(total - mix.sum(), 0.0)
+        self.cycle_total.add(total)
+        self.cycle_mix += mix
+        self.cycles.append({"total_ms": total, "units": cycle["units"], **dict(zip(CATEGORIES, mix.tolist()))})
+
+    def _check(self, key, stats):
+        if stats.baseline.n < stats.baseline_n or stats.since_baseline < MIN_RECENT:
+            return
+        delta = stats.delta_ms()
+        if not stats.flagged and delta >= self.threshold_ms:
+            stats.flagged = True
+            grew = stats.recent_mix - stats.baseline_mix
+            flag = {"key": key, "unit": self.n_units, "baseline_p50_ms": stats.baseline.quantile(0.5),
+                    "recent_p50_ms": stats.recent.quantile(0.5), "delta_ms": delta,
+                    "category": CATEGORIES[int(np.argmax(grew))], "category_delta_ms": float(grew.max())}
+            self.flags.append(flag)
+            if self.on_regression is not None:
+                self.on_regression(flag)
+        elif stats.flagged and delta < self.threshold_ms / 2.0: # 회복 (히스테리시스)
+            stats.flagged = False
+
+    def rebaseline(self, key=None):
+        """key (없으면 전체) 의 최근 분포를 새 기준으로 삼습니다."""
+        for k, stats in self.units.items():
+            if key is None or k == key:
+                stats.rebaseline()
+
+    # ====== 출력 ======
+
+    def report(self):
+        """
+        Returns:
+            dict: cycles (n, p50/p95 ms, 분류별 평균 ms), units (키별 n, 기준/최근 p50, 차이, 경고), flags.
+        """
+        n_cycles = self.cycle_total.n
+        cycles = {"n": n_cycles, "p50_ms": self.cycle_total.quantile(0.5), "p95_ms": self.cycle_total.quantile(0.95),
+                  "mean_mix_ms": dict(zip(CATEGORIES, (self.cycle_mix / max(n_cycles, 1)).tolist()))}
+        units = {}
+        for key, s in sorted(self.units.items(), key=lambda kv: str(kv[0])):
+            units[key] = {"n": s.n, "baseline_p50_ms": s.baseline.quantile(0.5), "recent_p50_ms": s.recent.quantile(0.5),
+                          "recent_p95_ms": s.recent.quantile(0.95), "delta_ms": s.delta_ms(), "flagged": s.flagged,
+                          "recent_mix_ms": dict(zip(CATEGORIES, s.recent_mix.tolist()))}
+        return {"cycles": cycles, "units": units, "flags": list(self.flags)}
+
+    def format_report(self):
+        r = self.report()
+        c = r["cycles"]
+        lines = [f"사이클 {c['n']}회 | p50 {c['p50_ms'] / 1000:.2f} s, p95 {c['p95_ms'] / 1000:.2f} s"]
+        if c["n"]:
+            lines.append("  사이클 평균: " + ", ".join(f"{k} {v / 1000:.2f} s" for k, v in c["mean_mix_ms"].items()))
+        lines.append(f"작업 단위 {self.n_units}개")
+        for (kind, table, area), u in r["units"].items():
+            mark = " ⚠️" if u["flagged"] else ""
+            lines.append(f"  {kind:<5} 테이블 {table} 칸 {area} | n {u['n']:5d} | 기준 p50 {u['baseline_p50_ms']:7.0f} ms | "
+                         f"최근 p50 {u['recent_p50_ms']:7.0f} ms ({u['delta_ms']:+6.0f}){mark}")
+        for f in r["flags"]:
+            kind, table, area = f["key"]
+            lines.append(f"⚠️ {kind} 테이블 {table} 칸 {area}: {f['delta_ms']:+.0f} ms 느려짐 "
+                         f"(가장 늘어난 분류 {f['category']} {f['category_delta_ms']:+.0f} ms, 단위 #{f['unit']})")
+        return "\n".join(lines)
+
+
+def load_chrome_trace(path):
+    """
+    export_chrome_trace() 로 저장한 파일 → span 튜플 목록 (시작 순). 내보낼 때 넣은 idle 이벤트는 제외합니다.
+    """
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    spans = []
+    for ev in events:
+        if ev.get("cat") == trace.IDLE:
+            continue
+        t0 = int(round(ev["ts"] * 1000.0))
+        t1 = t0 + int(round(ev.get("dur", 0.0) * 1000.0))
+        spans.append((ev["name"], ev["cat"], t0, t1, ev.get("tid"), ev.get("args")))
+    spans.sort(key=lambda s: s[2])
+    return spans
+
+
+def _main():
+    if len(sys.argv) < 2:
+        print("사용법: python robotarm_cycle.py <chrome trace json> [회귀 기준 ms]")
+        return
+    analyzer = CycleAnalyzer(threshold_ms=float(sys.argv[2]) if len(sys.argv) > 2 else REGRESSION_MS)
+    analyzer.feed(load_chrome_trace(sys.argv[1]))
+    analyzer.flush()
+    print(analyzer.format_report())
+
+
+if __name__ == "__main__":
+    _main()
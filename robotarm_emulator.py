@@ -0,0 +1,590 @@
+# 오프라인 로봇 제어기 에뮬레이터 (RB5 실물 없이 명령/데이터 채널 테스트)
+# 로컬 TCP 서버 2개를 띄워 제어기 흉내를 냅니다.
+#   명령 포트 (기본 5000): 스크립트 명령 텍스트. rb.Cobot, ScriptClient(robotarm_script), show10 send_command 가 쓰는 포트
+#   데이터 포트 (기본 5001): "reqdata" 요청마다 상태 패킷 1개 (rb.CobotData.request_data)
+# 이동 명령은 큐에 쌓아 차례로 실행하고, 관절/TCP 값은 RobotArm 기구학 모델로 시간에 따라 계산합니다.
+#   move_j     : 관절별 사다리꼴 속도 프로파일 (가장 오래 걸리는 관절에 맞춰 동기화)
+#   move_l     : 베이스 좌표 직선 + 자세 slerp 를 SAMPLE_DT 간격으로 나눠 ik_batch 로 풀고 관절 값을 보간
+#   move_l_rel : move_l 과 같음 (기준 좌표계: 0 베이스, 1 툴, 2~ 사용자 좌표계)
+# 이동 시작/끝에 info[motion_changed][1] / info[motion_changed][0] 을 연결된 모든 명령 클라이언트에 보냅니다.
+#
+# 프로토콜 범위 (실제 제어기와 다를 수 있는 부분)
+# - 명령 응답(ack)은 "The command was executed" 한 줄, 이벤트는 info[...][...] / warn[...][...] / error[...][...] 형식입니다.
+#   (이 저장소의 스크립트 소켓 코드가 기대하는 형식)
+# - 명령 텍스트는 이름 + 숫자 목록으로만 해석합니다 (공백 / 쉼표 / 괄호 표기 차이는 무시).
+#   rbpodo 버전마다 보내는 문자열이 조금씩 달라도 이름과 숫자 순서가 같으면 처리됩니다.
+# - print(SD_J0_ANG) 같은 조회 명령은 값만 한 줄로 돌려줍니다. rbpodo 의 get_system_variable / get_tcp_info 가
+#   이 응답을 그대로 해석하는지는 실제 제어기 응답과 비교해 확인하지 않았습니다.
+# - 데이터 패킷은 헤더('$', 크기 uint16, 종류 3) 뒤에 time, jnt_ref, jnt_ang, jnt_cur, tcp_ref, tcp_pos,
+#   analog_in/out, digital_in/out, 온도 순으로 채우고 나머지는 0 입니다. 필드 배치와 전체 크기(DATA_PACKET_SIZE)는
+#   사용하는 rbpodo 의 SystemState 정의에 맞춰 조정해야 합니다.
+#
+# 사용 예)
+#   python robotarm_emulator.py                 # 127.0.0.1:5000 / 5001, IP_robotarm.txt 를 127.0.0.1 로 바꿔 실행
+#   python robotarm_emulator.py 15000 15001 10  # 다른 포트, 10 배속
+#
+#   emu = RobotEmulator(command_port=0, data_port=0).start()   # 빈 포트 자동 선택 (벤치마크용)
+#   ... ScriptClient("127.0.0.1", port=emu.command_port) ...
+#   emu.stop(); print(emu.stats())
+
+import re
+import sys
+import time
+import socket
+import struct
+import threading
+from collections import deque, Counter
+import numpy as np
+
+import robotarm_kinematics as rk
+from robotarm_program import trapezoid_time
+
+COMMAND_PORT = 5000
+DATA_PORT = 5001
+ACK_MESSAGE = "The command was executed"
+DATA_REQUEST = b"reqdata"
+DATA_PACKET_SIZE = 512 # 헤더 포함 전체 크기 (rbpodo SystemState 크기에 맞춰 조정)
+NUM_DOUT = 16
+
+HOME_Q = (0.0, 0.0, 90.0, 0.0, 90.0, 0.0) # 시작 관절 각도 (deg), 특이 자세를 피한 준비 자세
+SAMPLE_DT = 0.01 # 직선 이동 IK 샘플 간격 (s, 이동 시간 기준)
+ORIENT_VEL_DEG = 90.0 # 직선 이동 중 자세 회전 속도 한계 (deg/s)
+ORIENT_ACC_DEG = 180.0
+
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_NAME_RE = re.compile(r"\s*([A-Za-z_]\w*)")
+
+
+# ====== 명령 텍스트 ======
+
+def split_commands(buf):
+    """
+    받은 텍스트를 명령 단위로 나눕니다.
+
+    괄호 밖의 줄바꿈 / ';' / NUL, 또는 괄호가 모두 닫히는 ')' 에서 명령이 끝납니다.
+    괄호가 없는 나머지 텍스트(예: "pgmode simulation")는 recv 한 번에 온 명령 하나로 봅니다.
+
+    Returns:
+        tuple: (명령 문자열 list, 아직 괄호가 닫히지 않은 나머지 문자열)
+    """
+    commands = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(buf):
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth = max(depth - 1, 0)
+            if depth == 0 and ch == ")":
+                commands.append(buf[start:i + 1])
+                start = i + 1
+        elif depth == 0 and ch in "\r\n;\0":
+            commands.append(buf[start:i])
+            start = i + 1
+    rest = buf[start:]
+    if depth == 0:
+        commands.append(rest)
+        rest = ""
+    return [c.strip() for c in commands if c.strip()], rest
+
+
+def parse_command(text):
+    """명령 문자열 → (이름, 이름 뒤 텍스트, 숫자 np.ndarray). 이름이 없으면 (None, text, [])."""
+    m = _NAME_RE.match(text)
+    if m is None:
+        return None, text, np.zeros(0)
+    args = text[m.end():]
+    return m.group(1), args, np.array([float(x) for x in _NUMBER_RE.findall(args)])
+
+
+# ====== 이동 구간 ======
+
+def trapezoid_fraction(t, duration, distance, vel, acc):
+    """
+    정지 → 정지 사다리꼴(또는 삼각형) 프로파일에서 시각 t 의 진행률 (0~1).
+
+    Args:
+        t (float or np.ndarray): 구간 시작 후 시각 (s).
+        duration (float): trapezoid_time(distance, vel, acc).
+        distance, vel, acc (float): 프로파일을 정한 축의 거리 / 최고 속도 / 가속도.
+    """
+    if distance <= 0.0 or duration <= 0.0:
+        return np.ones_like(np.asarray(t, dtype=float))
+    t = np.clip(np.asarray(t, dtype=float), 0.0, duration)
+    t_acc = min(vel / acc, duration / 2.0)
+    v_peak = acc * t_acc
+    s = np.where(t < t_acc, 0.5 * acc * t * t,
+                 np.where(t <= duration - t_acc, 0.5 * acc * t_acc * t_acc + v_peak * (t - t_acc),
+                          distance - 0.5 * acc * (duration - t) ** 2))
+    return np.clip(s / distance, 0.0, 1.0)
+
+
+class MotionSegment:
+    """
+    큐에 들어간 이동 1개.
+
+    joint: q_start → q_end 를 가장 오래 걸리는 관절의 사다리꼴 진행률로 보간.
+    linear: times / qs 샘플(직선 경로 IK 결과) 사이를 선형 보간.
+    """
+
+    def __init__(self, command, q_start, q_end, duration, profile=None, times=None, qs=None):
+        self.command = command
+        self.q_start = np.asarray(q_start, dtype=float)
+        self.q_end = np.asarray(q_end, dtype=float)
+        self.duration = float(duration)
+        self.profile = profile # (distance, vel, acc) 진행률 계산용
+        self.times = times
+        self.qs = qs
+        self.t_start = None
+
+    def q_at(self, t):
+        """구간 시작 후 t 초의 관절 각도 (deg)."""
+        if t >= self.duration:
+            return self.q_end.copy()
+        if self.qs is not None:
+            return np.array([np.interp(t, self.times, self.qs[:, j]) for j in range(self.qs.shape[1])])
+        s = trapezoid_fraction(t, self.duration, *self.profile)
+        return self.q_start + (self.q_end - self.q_start) * s
+
+
+# ====== 에뮬레이터 ======
+
+class RobotEmulator:
+    """
+    명령 / 데이터 포트를 가진 로컬 제어기 에뮬레이터.
+
+    Args:
+        host (str): 바인드 주소.
+        command_port, data_port (int): 포트. 0 이면 빈 포트를 골라 start() 후 속성에 기록합니다.
+        q0 (array-like): 시작 관절 각도 (deg).
+        time_scale (float): 이동 시간 배속 (2.0 이면 실제보다 2배 빨리 끝남).
+        ack_delay (float): 명령 응답 전에 넣을 지연 (s). 제어기 처리 시간 흉내.
+        robot (RobotArm or None): 기구학 모델. None 이면 RobotArm().
+    """
+
+    def __init__(self, host="127.0.0.1", command_port=COMMAND_PORT, data_port=DATA_PORT, q0=HOME_Q,
+                 time_scale=1.0, ack_delay=0.0, robot=None):
+        self.host = host
+        self.command_port = command_port
+        self.data_port = data_port
+        self.time_scale = float(time_scale)
+        self.ack_delay = float(ack_delay)
+        self.robot = rk.RobotArm() if robot is None else robot
+
+        self._cond = threading.Condition()
+        self._q = np.array(q0, dtype=float)          # 실행 중 구간이 없을 때의 관절 각도
+        self._q_planned = self._q.copy()             # 큐의 마지막 이동이 끝났을 때의 관절 각도 (상대 이동 기준)
+        self._segment = None
+        self._queue = deque()
+        self.dout = np.zeros(NUM_DOUT, dtype=np.int32)
+        self.speed_bar = 1.0
+        self.mode = "real"
+        self.user_frames = {} # 좌표계 번호(2~) → (원점 xyz, 회전 행렬)
+
+        self._clients = []
+        self._client_lock = threading.Lock()
+        self._servers = []
+        self._threads = []
+        self._running = False
+        self._t0 = time.monotonic()
+        self.counts = Counter() # 명령 이름별 처리 횟수 ("reqdata" 포함)
+        self.motions = 0
+
+        self._handlers = {
+            "move_j": self._cmd_move_j,
+            "move_l": self._cmd_move_l,
+            "move_l_rel": self._cmd_move_l_rel,
+            "set_dout_bit_combination": self._cmd_dout_bits,
+            "digital_out": self._cmd_digital_out,
+            "set_user_coordinate": self._cmd_user_coordinate,
+            "pgmode": self._cmd_pgmode,
+            "sdw": self._cmd_sdw,
+            "stop": self._cmd_stop,
+            "task": self._cmd_task,
+            "print": self._cmd_print,
+        }
+
+    # ====== 시간 / 상태 ======
+
+    def now(self):
+        """에뮬레이터 시각 (s, time_scale 적용)."""
+        return (time.monotonic() - self._t0) * self.time_scale
+
+    def joint_state(self):
+        """현재 관절 각도 (deg)."""
+        with self._cond:
+            seg = self._segment
+            if seg is None:
+                return self._q.copy()
+            return seg.q_at(self.now() - seg.t_start)
+
+    def tcp_state(self, q=None):
+        """현재(또는 q 의) TCP 자세 [x, y, z, rx, ry, rz] (mm, deg, 베이스 기준)."""
+        T = self.robot.fk_batch(self.joint_state() if q is None else q)[0, -1]
+        return np.concatenate((T[:3, 3], rk.rotation_to_rpy(T[:3, :3], degrees=True)))
+
+    def is_moving(self):
+        with self._cond:
+            return self._segment is not None or bool(self._queue)
+
+    def wait_idle(self, timeout=None):
+        """큐의 이동이 모두 끝날 때까지 기다립니다. 끝났으면 True."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._segment is not None or self._queue:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # ====== 이동 계획 ======
+
+    def _plan_joint(self, command, q_end, vel, acc):
+        vel, acc = vel * self.speed_bar, acc * self.speed_bar ** 2
+        q_start = self._q_planned
+        dist = np.abs(q_end - q_start)
+        times = trapezoid_time(dist, vel, acc)
+        lead = int(np.argmax(times))
+        return MotionSegment(command, q_start, q_end, float(times[lead]), profile=(float(dist[lead]), vel, acc))
+
+    def _plan_linear(self, command, pos, rot, vel, acc):
+        """현재 계획 자세 → (pos, rot) 직선 이동. IK 실패면 None."""
+        vel, acc = vel * self.speed_bar, acc * self.speed_bar ** 2
+        q_start = self._q_planned
+        T0 = self.robot.fk_batch(q_start)[0, -1]
+        p0, R0 = T0[:3, 3], T0[:3, :3]
+        length = float(np.linalg.norm(pos - p0))
+        angle = float(np.degrees(np.linalg.norm(rk.orientation_error(rot, R0))))
+        d_lin = trapezoid_time(length, vel, acc)
+        d_rot = trapezoid_time(angle, ORIENT_VEL_DEG * self.speed_bar, ORIENT_ACC_DEG * self.speed_bar ** 2)
+        if d_lin >= d_rot:
+            duration, profile = d_lin, (length, vel, acc)
+        else:
+            duration, profile = d_rot, (angle, ORIENT_VEL_DEG * self.speed_bar, ORIENT_ACC_DEG * self.speed_bar ** 2)
+        if duration <= 0.0:
+            return MotionSegment(command, q_start, q_start, 0.0, profile=profile)
+
+        times = np.linspace(0.0, duration, max(int(np.ceil(duration / SAMPLE_DT)), 1) + 1)
+        s = trapezoid_fraction(times, duration, *profile)
+        # 위치는 직선, 자세는 쿼터니언 slerp
+        q0 = rk.rotation_to_quaternion(R0)
+        q1 = rk.rotation_to_quaternion(rot)
+        if np.dot(q0, q1) < 0:
+            q1 = -q1
+        omega = np.arccos(np.clip(np.dot(q0, q1), -1.0, 1.0))
+        if omega < 1e-9:
+            quats = np.broadcast_to(q0, (len(s), 4))
+        else:
+            quats = (np.sin((1.0 - s) * omega)[:, None] * q0 + np.sin(s * omega)[:, None] * q1) / np.sin(omega)
+        targets = p0 + s[:, None] * (pos - p0)
+        qs, ok = rk.ik_batch(self.robot, q_start, targets, rk.quaternion_to_rotation(quats))
+        if not ok.all():
+            return None
+        return MotionSegment(command, q_start, qs[-1], duration, times=times, qs=qs)
+
+    def _relative_target(self, delta, frame):
+        """move_l_rel 목표 (pos, rot). frame: 0 베이스, 1 툴, 2~ 사용자 좌표계."""
+        T = self.robot.fk_batch(self._q_planned)[0, -1]
+        p, R = T[:3, 3], T[:3, :3]
+        dp = np.asarray(delta[:3], dtype=float)
+        dR = rk.rpy_to_rotation(delta[3:6], degrees=True)
+        if frame == 1:
+            return p + R @ dp, R @ dR
+        if frame >= 2 and frame in self.user_frames:
+            Ru = self.user_frames[frame][1]
+            return p + Ru @ dp, Ru @ dR @ Ru.T @ R
+        return p + dp, dR @ R
+
+    def _enqueue(self, segment):
+        with self._cond:
+            self._queue.append(segment)
+            self._q_planned = segment.q_end.copy()
+            self._cond.notify_all()
+
+    # ====== 명령 처리 ======
+
+    def execute(self, text):
+        """
+        명령 1개를 처리하고 바로 보낼 응답 줄 목록을 반환합니다. (소켓 없이 같은 프로세스에서 써도 됩니다.)
+
+        이동 시작/끝 이벤트는 반환값이 아니라 연결된 명령 클라이언트에 따로 보냅니다.
+        """
+        name, args, nums = parse_command(text)
+        handler = self._handlers.get(name)
+        self.counts[name or "?"] += 1
+        if handler is None:
+            return [ACK_MESSAGE, f"warn[unsupported_command][{name}]"]
+        try:
+            return handler(args, nums)
+        except (ValueError, IndexError) as e:
+            return [f"error[syntax][{name}: {e}]"]
+
+    def _cmd_move_j(self, args, nums):
+        if len(nums) < 6:
+            raise ValueError("관절 값 6개가 필요합니다")
+        vel = nums[6] if len(nums) > 6 else 60.0
+        acc = nums[7] if len(nums) > 7 else 120.0
+        with self._cond:
+            self._enqueue(self._plan_joint("move_j", nums[:6], vel, acc))
+        return [ACK_MESSAGE]
+
+    def _linear(self, name, pos, rot, vel, acc):
+        with self._cond:
+            seg = self._plan_linear(name, pos, rot, vel, acc)
+            if seg is None:
+                return [ACK_MESSAGE, f"error[ik_fail][{name}]"]
+            self._enqueue(seg)
+        return [ACK_MESSAGE]
+
+    def _cmd_move_l(self, args, nums):
+        if len(nums) < 6:
+            raise ValueError("자세 값 6개가 필요합니다")
+        vel = nums[6] if len(nums) > 6 else 100.0
+        acc = nums[7] if len(nums) > 7 else 200.0
+        return self._linear("move_l", nums[:3], rk.rpy_to_rotation(nums[3:6], degrees=True), vel, acc)
+
+    def _cmd_move_l_rel(self, args, nums):
+        if len(nums) < 6:
+            raise ValueError("상대 이동 값 6개가 필요합니다")
+        vel = nums[6] if len(nums) > 6 else 100.0
+        acc = nums[7] if len(nums) > 7 else 200.0
+        frame = int(nums[8]) if len(nums) > 8 else 0
+        with self._cond: # 다른 클라이언트의 이동이 사이에 끼지 않도록 목표 계산 ~ 큐 추가를 한 번에
+            pos, rot = self._relative_target(nums[:6], frame)
+            reply = self._linear("move_l_rel", pos, rot, vel, acc)
+        if frame >= 2 and frame not in self.user_frames:
+            reply.append(f"warn[user_frame][{frame} not set, using base]")
+        return reply
+
+    def _cmd_dout_bits(self, args, nums):
+        first, last, value = int(nums[0]), int(nums[1]), int(nums[2])
+        big_endian = len(nums) > 3 and int(nums[3]) == 1
+        bits = list(range(first, last + 1))
+        if big_endian:
+            bits.reverse()
+        for k, bit in enumerate(bits):
+            self.dout[bit] = (value >> k) & 1
+        return [ACK_MESSAGE]
+
+    def _cmd_digital_out(self, args, nums):
+        for bit, v in enumerate(nums[:NUM_DOUT].astype(int)):
+            if v >= 0:
+                self.dout[bit] = v
+        return [ACK_MESSAGE]
+
+    def _cmd_user_coordinate(self, args, nums):
+        # set_user_coordinate(id, x, y, z, rx, ry, rz): 사용자 좌표계 id → move_l_rel 기준 번호 id + 2
+        uid = int(nums[0])
+        self.user_frames[uid + 2] = (nums[1:4].copy(), rk.rpy_to_rotation(nums[4:7], degrees=True))
+        return [ACK_MESSAGE]
+
+    def _cmd_pgmode(self, args, nums):
+        word = args.strip().lower()
+        self.mode = "simulation" if word.startswith("sim") else "real"
+        return [ACK_MESSAGE]
+
+    def _cmd_sdw(self, args, nums):
+        if "default_speed" in args and len(nums):
+            self.speed_bar = float(np.clip(nums[-1], 0.01, 1.0))
+        return [ACK_MESSAGE]
+
+    def _cmd_stop(self, args, nums):
+        self.halt()
+        return [ACK_MESSAGE]
+
+    def _cmd_task(self, args, nums):
+        if "stop" in args:
+            self.halt()
+        return [ACK_MESSAGE]
+
+    def _cmd_print(self, args, nums):
+        key = args.strip(" ()").upper()
+        m = re.fullmatch(r"SD_J(\d)_(ANG|REF)", key)
+        if m:
+            return [f"{self.joint_state()[int(m.group(1))]:.4f}"]
+        if key.startswith("GET_TCP_INFO") or key in ("SD_TCP", "SD_TCP_REF"):
+            return [",".join(f"{v:.4f}" for v in self.tcp_state())]
+        if key == "SD_DEFAULT_SPEED":
+            return [f"{self.speed_bar:.4f}"]
+        return [f"error[unknown_variable][{key}]"]
+
+    def halt(self):
+        """실행 중 이동을 현재 자세에서 멈추고 큐를 비웁니다."""
+        with self._cond:
+            if self._segment is not None:
+                self._q = self._segment.q_at(self.now() - self._segment.t_start)
+            self._queue.clear()
+            self._q_planned = self._q.copy()
+            self._segment = None
+            self._cond.notify_all()
+
+    # ====== 이동 실행 스레드 ======
+
+    def _motion_loop(self):
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                seg = self._queue.popleft()
+                seg.t_start = self.now()
+                self._segment = seg
+            self.motions += 1
+            self.broadcast("info[motion_changed][1]")
+            with self._cond:
+                while self._running and self._segment is seg:
+                    remaining = seg.duration - (self.now() - seg.t_start)
+                    if remaining <= 0:
+                        self._q = seg.q_end.copy()
+                        self._segment = None
+                        self._cond.notify_all()
+                        break
+                    self._cond.wait(remaining / self.time_scale)
+            self.broadcast("info[motion_changed][0]")
+
+    # ====== 소켓 ======
+
+    def broadcast(self, line):
+        """연결된 모든 명령 클라이언트에 이벤트 한 줄을 보냅니다."""
+        data = (line + "\n").encode()
+        # 명령 응답(_serve_command)과 같은 lock 안에서 보내야 한 연결에서 두 sendall 이 섞이지 않음
+        with self._client_lock:
+            for conn in self._clients:
+                try:
+                    conn.sendall(data)
+                except OSError:
+                    pass
+
+    def _listen(self, port):
+        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        srv.bind((self.host, port))
+        srv.listen(8)
+        srv.settimeout(0.2)
+        self._servers.append(srv)
+        return srv
+
+    def _accept_loop(self, srv, handler):
+        while self._running:
+            try:
+                conn, _ = srv.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            t = threading.Thread(target=handler, args=(conn,), daemon=True)
+            t.start()
+
+    def _serve_command(self, conn):
+        with self._client_lock:
+            self._clients.append(conn)
+        pending = ""
+        try:
+            while self._running:
+                data = conn.recv(4096)
+                if not data:
+                    break
+                commands, pending = split_commands(pending + data.decode(errors="replace"))
+                for text in commands:
+                    replies = self.execute(text)
+                    if self.ack_delay > 0:
+                        time.sleep(self.ack_delay)
+                    with self._client_lock: # 이벤트 broadcast 와 줄이 섞이지 않도록
+                        conn.sendall("".join(r + "\n" for r in replies).encode())
+        except OSError:
+            pass
+        finally:
+            with self._client_lock:
+                if conn in self._clients:
+                    self._clients.remove(conn)
+            conn.close()
+
+    def _serve_data(self, conn):
+        pending = b""
+        try:
+            while self._running:
+                data = conn.recv(4096)
+                if not data:
+                    break
+                pending += data
+                while True:
+                    i = pending.find(DATA_REQUEST)
+                    if i < 0:
+                        break
+                    pending = pending[i + len(DATA_REQUEST):]
+                    self.counts["reqdata"] += 1
+                    conn.sendall(self.data_packet())
+                pending = pending[-(len(DATA_REQUEST) - 1):] # 요청 문자열이 두 recv 로 나뉜 경우 대비
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def data_packet(self):
+        """데이터 채널 상태 패킷 (DATA_PACKET_SIZE 바이트, 리틀 엔디안)."""
+        q = self.joint_state()
+        tcp = self.tcp_state(q)
+        body = struct.pack("<f6f6f6f6f6f4f4f16i16i6f", self.now(), *q, *q, *np.zeros(6), *tcp, *tcp,
+                           *np.zeros(4), *np.zeros(4), *np.zeros(16, dtype=int), *self.dout.tolist(),
+                           *np.full(6, 30.0))
+        header = b"$" + struct.pack("<HB", DATA_PACKET_SIZE, 3)
+        return (header + body).ljust(DATA_PACKET_SIZE, b"\0")
+
+    def start(self):
+        """서버 소켓과 이동 스레드를 시작합니다. 포트 0 이면 실제 포트로 바뀝니다."""
+        self._running = True
+        cmd_srv = self._listen(self.command_port)
+        data_srv = self._listen(self.data_port)
+        self.command_port = cmd_srv.getsockname()[1]
+        self.data_port = data_srv.getsockname()[1]
+        for target, args in ((self._accept_loop, (cmd_srv, self._serve_command)),
+                             (self._accept_loop, (data_srv, self._serve_data)),
+                             (self._motion_loop, ())):
+            t = threading.Thread(target=target, args=args, daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for srv in self._servers:
+            srv.close()
+        with self._client_lock:
+            for conn in self._clients:
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        for t in self._threads:
+            t.join(1.0)
+
+    def stats(self):
+        """명령별 처리 횟수와 실행한 이동 수."""
+        return {"commands": dict(self.counts), "motions": self.motions, "q": np.round(self.joint_state(), 3).tolist()}
+
+
+def _main():
+    args = sys.argv[1:]
+    emu = RobotEmulator(host="0.0.0.0" if "--any" in args else "127.0.0.1",
+                        command_port=int(args[0]) if len(args) > 0 and args[0].isdigit() else COMMAND_PORT,
+                        data_port=int(args[1]) if len(args) > 1 and args[1].isdigit() else DATA_PORT,
+                        time_scale=float(args[2]) if len(args) > 2 and args[2][0].isdigit() else 1.0).start()
+    print(f"에뮬레이터 실행 중: 명령 {emu.host}:{emu.command_port}, 데이터 {emu.host}:{emu.data_port} "
+          f"(배속 {emu.time_scale}), Ctrl+C 로 종료")
+    try:
+        while True:
+            time.sleep(5.0)
+            print(f"  {emu.stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emu.stop()
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,291 @@
+# 여러 대 로봇 동시 제어 (asyncio)
+# files/show12.py 처럼 로봇마다 sendall → recv(1024) 를 차례로 하면 N 번째 로봇은 앞 로봇들의 왕복 시간만큼 늦어집니다.
+# Fleet 은 모든 로봇의 스크립트 소켓과 rb.asyncio.Cobot 세션을 한 이벤트 루프에서 동시에 열고,
+# 명령을 모든 소켓에 먼저 쓴 뒤 ack 를 한꺼번에 기다리므로 로봇 수가 늘어도 로봇당 지연이 더해지지 않습니다.
+#
+# 사용 예)
+#   fleet = Fleet(["192.168.0.22", "192.168.0.21", "192.168.0.20"])
+#   await fleet.connect()
+#   result = await fleet.broadcast("move_l_rel(pnt[0, 100, 0, 0, 0, 0], 200, 200, 2)", deadline=0.5)
+#   print(format_broadcast(result))
+#   await fleet.close()
+
+import time
+import socket
+import asyncio
+from collections import deque
+import numpy as np
+import rbpodo as rb
+from robotarm_script import ScriptFramer, ScriptError, ACK, INFO, WARN
+
+
+class AsyncScriptClient:
+    """
+    스크립트 소켓(포트 5000) asyncio 클라이언트.
+
+    수신 태스크가 ScriptFramer 로 메시지를 나누고, ack 는 보낸 순서대로 각 명령의 future 에 넘겨줍니다.
+    응답 1개(ack 또는 ack 대신 온 error)는 명령 1개에 대응하므로, 타임아웃으로 끝난 명령의 늦은 응답은 버리고 다음 명령에 넘기지 않습니다.
+    error[...] 처리:
+      - 같은 수신 묶음에서 ack 바로 뒤에 오면(ack 후 실행 중 오류, 예: ik_fail) 그 ack 의 명령을 ScriptError 로 실패시킴
+      - 그 외에는 ack 대신 온 응답으로 보고 가장 오래된 대기 명령을 ScriptError 로 실패시킴
+
+    Args:
+        ip (str): 로봇 IP.
+        port (int): 스크립트 포트.
+        idle_flush (float): 구분자 없는 조각을 이 시간(s) 동안 새 데이터가 없으면 메시지로 처리.
+        maxlen (int): 종류별 이벤트 큐 길이.
+    """
+
+    def __init__(self, ip, port=5000, idle_flush=0.05, maxlen=256):
+        self.ip = ip
+        self.port = port
+        self.idle_flush = idle_flush
+        self.framer = ScriptFramer()
+        self.reader = None
+        self.writer = None
+        self._task = None
+        self._pending = deque() # ack 를 기다리는 future (보낸 순서)
+
+        self.infos = deque(maxlen=maxlen)
+        self.warns = deque(maxlen=maxlen)
+        self.errors = deque(maxlen=maxlen)
+        self.motion_state = 0
+        self.motion_started = 0
+        self.motion_finished = 0
+
+    async def connect(self, timeout=3.0):
+        self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(self.ip, self.port), timeout)
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    @property
+    def connected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    def _dispatch(self, ev, acked):
+        """
+        ev 1개 처리. acked: 이번 수신 묶음에서 ack 를 받은 [future, 결과] 목록 (묶음 끝에 _resolve 로 확정).
+        """
+        if ev.kind == ACK:
+            if self._pending:
+                fut = self._pending.popleft()
+                if not fut.done(): # 타임아웃으로 끝난 명령의 ack 는 이 명령 몫으로 버림
+                    acked.append([fut, ev])
+        elif ev.kind == INFO:
+            self.infos.append(ev)
+            if ev.category == "motion_changed":
+                v = ev.int_value(0)
+                self.motion_state = v
+                if v == 0:
+                    self.motion_finished += 1
+                else:
+                    self.motion_started += 1
+        elif ev.kind == WARN:
+            self.warns.append(ev)
+        else:
+            self.errors.append(ev)
+            if acked and not isinstance(acked[-1][1], ScriptError):
+                acked[-1][1] = ScriptError(ev) # 바로 앞 ack 의 명령이 실행 중 실패
+            elif self._pending:
+                fut = self._pending.popleft() # ack 대신 온 응답
+                if not fut.done():
+                    fut.set_exception(ScriptError(ev))
+
+    @staticmethod
+    def _resolve(acked):
+        for fut, result in acked:
+            if fut.done():
+                continue
+            if isinstance(result, ScriptError):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
+        acked.clear()
+
+    async def _read_loop(self):
+        framer = self.framer
+        acked = []
+        try:
+            while True:
+                try:
+                    timeout = self.idle_flush if framer.pending() else None
+                    data = await asyncio.wait_for(self.reader.read(65536), timeout)
+                except asyncio.TimeoutError:
+                    self._dispatch(framer.flush_pending(), acked)
+                    self._resolve(acked)
+                    continue
+                if not data:
+                    break
+                framer.feed(data)
+                now = time.monotonic()
+                while True:
+                    ev = framer.next_event(now)
+                    if ev is None:
+                        break
+                    self._dispatch(ev, acked)
+                self._resolve(acked)
+        finally:
+            while self._pending:
+                fut = self._pending.popleft()
+                if not fut.done():
+                    fut.set_exception(ConnectionError(f"{self.ip} 스크립트 연결이 끊어졌습니다."))
+
+    def send(self, command):
+        """명령을 쓰고 ack future 를 반환합니다. (소켓 버퍼에 쓰기만 하고 기다리지 않음)"""
+        if not self.connected:
+            raise ConnectionError(f"{self.ip} 스크립트 소켓이 연결되지 않았습니다.")
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append(fut)
+        self.writer.write(command.encode())
+        return fut
+
+    async def request(self, command, timeout=1.0):
+        """명령을 보내고 ack(ScriptEvent)를 반환합니다. 타임아웃이면 asyncio.TimeoutError."""
+        fut = self.send(command)
+        await self.writer.drain()
+        return await asyncio.wait_for(fut, timeout)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.writer = None
+
+
+class FleetMember:
+    """Fleet 안의 로봇 1대: 스크립트 소켓 + rb.asyncio.Cobot 세션."""
+
+    def __init__(self, idx, ip, port=5000, use_cobot=True):
+        self.idx = idx
+        self.ip = ip
+        self.script = AsyncScriptClient(ip, port)
+        self.use_cobot = use_cobot
+        self.robot = None
+        self.rc = None
+        self.latency_ms = deque(maxlen=1024) # 최근 ack 지연 기록
+
+    async def connect(self, timeout=3.0, operation_mode=None, speed_bar=None):
+        await self.script.connect(timeout)
+        if self.use_cobot:
+            self.robot = rb.asyncio.Cobot(self.ip)
+            self.rc = rb.ResponseCollector()
+            if operation_mode is not None:
+                await self.robot.set_operation_mode(self.rc, operation_mode)
+            if speed_bar is not None:
+                await self.robot.set_speed_bar(self.rc, speed_bar)
+
+
+class Fleet:
+    """
+    여러 대 로봇에 같은 명령을 병렬로 보내는 컨트롤러.
+
+    Args:
+        ips (list[str]): 로봇 IP 목록.
+        port (int): 스크립트 포트.
+        use_cobot (bool): rb.asyncio.Cobot 세션도 열지 여부 (작동 모드/속도 설정 등).
+    """
+
+    def __init__(self, ips, port=5000, use_cobot=True):
+        self.members = [FleetMember(idx, ip, port, use_cobot) for idx, ip in enumerate(ips)]
+        self.skew_ms = deque(maxlen=1024) # 최근 broadcast 의 ack 도착 시각 차이 기록
+
+    async def connect(self, timeout=3.0, operation_mode=None, speed_bar=None):
+        """
+        모든 로봇에 동시에 연결합니다. 연결된 로봇 목록을 반환하고, 실패한 로봇은 목록에서 뺍니다.
+        """
+        results = await asyncio.gather(*(m.connect(timeout, operation_mode, speed_bar) for m in self.members),
+                                       return_exceptions=True)
+        connected = []
+        for m, res in zip(self.members, results):
+            if isinstance(res, BaseException):
+                print(f"[{m.idx + 1}] 연결 실패: {m.ip} ({res!r})")
+                await m.script.close()
+            else:
+                print(f"[{m.idx + 1}] 연결 성공: {m.ip}")
+                connected.append(m)
+        self.members = connected
+        return connected
+
+    async def broadcast(self, command, deadline=0.5):
+        """
+        모든 로봇에 같은 명령을 보내고 로봇별 ack 를 deadline(s) 안에서 기다립니다.
+
+        명령은 모든 소켓에 먼저 쓴 뒤(전송 사이 간격 수 µs) ack 를 동시에 기다리므로
+        전체 소요 시간은 가장 느린 로봇 1대의 왕복 시간입니다.
+
+        Returns:
+            dict: results (로봇별 idx, ip, ok, latency_ms, response), skew_ms (ack 도착 시각 최대-최소),
+                  send_spread_ms (첫 전송~마지막 전송), elapsed_ms.
+        """
+        t0 = time.monotonic()
+        sent = []
+        for m in self.members:
+            try:
+                fut = m.script.send(command)
+            except ConnectionError as e:
+                fut = e
+            sent.append((m, fut, time.monotonic()))
+        t_sent_last = time.monotonic()
+
+        async def wait_one(m, fut, t_send):
+            if isinstance(fut, Exception):
+                return {"idx": m.idx, "ip": m.ip, "ok": False, "latency_ms": None, "response": repr(fut), "t_ack": None}
+            try:
+                await m.script.writer.drain()
+                remaining = max(deadline - (time.monotonic() - t_send), 0.0)
+                ev = await asyncio.wait_for(fut, remaining)
+                latency = (ev.stamp - t_send) * 1000.0
+                m.latency_ms.append(latency)
+                return {"idx": m.idx, "ip": m.ip, "ok": True, "latency_ms": latency, "response": ev.raw, "t_ack": ev.stamp}
+            except asyncio.TimeoutError:
+                return {"idx": m.idx, "ip": m.ip, "ok": False, "latency_ms": None,
+                        "response": f"deadline {deadline * 1000:.0f} ms 초과", "t_ack": None}
+            except (ScriptError, ConnectionError) as e:
+                return {"idx": m.idx, "ip": m.ip, "ok": False, "latency_ms": None, "response": str(e), "t_ack": None}
+
+        results = await asyncio.gather(*(wait_one(m, fut, t_send) for m, fut, t_send in sent))
+        acks = [r["t_ack"] for r in results if r["ok"]]
+        skew = (max(acks) - min(acks)) * 1000.0 if len(acks) > 1 else 0.0
+        if len(acks) > 1:
+            self.skew_ms.append(skew)
+        return {"command": command, "results": results, "skew_ms": skew,
+                "send_spread_ms": (t_sent_last - t0) * 1000.0,
+                "elapsed_ms": (time.monotonic() - t0) * 1000.0}
+
+    async def set_speed_bar(self, speed):
+        """rb.asyncio.Cobot 으로 모든 로봇의 속도 바를 동시에 설정합니다."""
+        await asyncio.gather(*(m.robot.set_speed_bar(m.rc, speed) for m in self.members if m.robot is not None))
+
+    def stats(self):
+        """로봇별 ack 지연과 로봇 간 skew 의 p50/p95/max (ms)."""
+        def summary(values):
+            v = np.asarray(values, dtype=float)
+            if v.size == 0:
+                return None
+            p50, p95 = np.percentile(v, [50, 95])
+            return {"p50": float(p50), "p95": float(p95), "max": float(v.max()), "n": int(v.size)}
+        return {"latency": {m.ip: summary(m.latency_ms) for m in self.members},
+                "skew": summary(self.skew_ms)}
+
+    async def close(self):
+        await asyncio.gather(*(m.script.close() for m in self.members))
+
+
+def format_broadcast(result):
+    """broadcast() 결과를 한 줄 요약 + 로봇별 줄로 만듭니다."""
+    ok = sum(r["ok"] for r in result["results"])
+    lines = [f"broadcast {ok}/{len(result['results'])} ok | 전체 {result['elapsed_ms']:.1f} ms | "
+             f"skew {result['skew_ms']:.1f} ms | 전송 간격 {result['send_spread_ms']:.3f} ms"]
+    for r in result["results"]:
+        if r["ok"]:
+            lines.append(f"  [{r['idx'] + 1}] {r['ip']:<15} ack {r['latency_ms']:7.1f} ms  {r['response']}")
+        else:
+            lines.append(f"  [{r['idx'] + 1}] {r['ip']:<15} 실패  {r['response']}")
+    return "\n".join(lines)
@@ -1,7 +1,9 @@
 # 로봇팔 함수 모음집
 
+import time
 import rbpodo as rb
 import numpy as np
+import robotarm_trace as trace # 구간 계측 (기본 꺼짐, ROBOTARM_TRACE=1 또는 trace.enable())
 
 # ====== 로봇 IP 읽기 ======
 def read_robot_ip(filename="IP_robotarm.txt"):
@@ -17,6 +19,16 @@ def read_robot_ip(filename="IP_robotarm.txt"):
         print(f"파일 읽기 오류: {e}")
         return None
 
+def _wait_move(rc, robot, start_timeout=0.5):
+    """이동 시작 → 완료 대기 + 오류 확인 (구간 계측 포함)."""
+    with trace.span("wait_started"):
+        started = robot.wait_for_move_started(rc, start_timeout).is_success()
+    if started:
+        with trace.span("wait_finished"):
+            robot.wait_for_move_finished(rc)
+    with trace.span("error_check"):
+        rc.error().throw_if_not_empty()
+
 def robot_move_linear(rc, robot, target_info):
 
     vel = target_info[2]
@@ -27,15 +39,14 @@ def robot_move_linear(rc, robot, target_info):
     try:
         print("\n=== 🔸 툴플랜지 선형 움직임 ===")
 
-        robot.move_l_rel(rc, target_info[0], vel, acc, rb.ReferenceFrame.Base)
-        if robot.wait_for_move_started(rc, 0.5).is_success():
-            robot.wait_for_move_finished(rc)
-        rc.error().throw_if_not_empty()
+        with trace.span("robot_move_linear", trace.MOVE):
+            with trace.span("move_l_rel.base"):
+                robot.move_l_rel(rc, target_info[0], vel, acc, rb.ReferenceFrame.Base)
+            _wait_move(rc, robot)
 
-        robot.move_l_rel(rc, target_info[1], tool_vel, tool_acc, rb.ReferenceFrame.Tool)
-        if robot.wait_for_move_started(rc, 0.5).is_success():
-            robot.wait_for_move_finished(rc)
-        rc.error().throw_if_not_empty()
+            with trace.span("move_l_rel.tool"):
+                robot.move_l_rel(rc, target_info[1], tool_vel, tool_acc, rb.ReferenceFrame.Tool)
+            _wait_move(rc, robot)
         
     except Exception as e:
         print(f"⚠️ 툴플랜지 이동 오류: {e}")
@@ -52,10 +63,10 @@ def robot_move_startpoint(rc, robot):
     try:
         print("\n=== origin point move ===")
 
-        robot.move_j(rc, np.array([0, 0, 90, 0, 90, 0]), vel, acc)
-        if robot.wait_for_move_started(rc, 0.5).is_success():
-            robot.wait_for_move_finished(rc)
-        rc.error().throw_if_not_empty()
+        with trace.span("robot_move_startpoint", trace.MOVE):
+            with trace.span("move_j"):
+                robot.move_j(rc, np.array([0, 0, 90, 0, 90, 0]), vel, acc)
+            _wait_move(rc, robot)
         
     except Exception as e:
         print(f"⚠️ origin 이동 오류: {e}")
@@ -93,3 +104,62 @@ def read_joint(rc, robot):
     joint_array = np.array(joint_angles, dtype=float)
     print(f"현재 조인트 각도: {joint_array}\n")
     return joint_array
+
+
+# ====== 데이터 채널 스냅샷 ======
+class RobotSnapshot:
+    """
+    CobotData.request_data() 패킷 1개로 얻은 로봇 상태 묶음.
+
+    joint / tcp / IO 가 모두 같은 패킷에서 나오므로 서로 시점이 일치합니다.
+    stamp 는 패킷을 받은 시점의 time.monotonic() 값이고, robot_time 은 제어기 타이머(sec)입니다.
+    """
+    __slots__ = ("joint", "joint_ref", "tcp", "tcp_ref", "digital_in", "digital_out",
+                 "tfb_digital_in", "tfb_digital_out", "robot_state", "robot_time", "stamp")
+
+    def __init__(self, sdata, stamp):
+        self.joint = np.asarray(sdata.jnt_ang, dtype=float)       # 엔코더 기준 관절 각도 (deg)
+        self.joint_ref = np.asarray(sdata.jnt_ref, dtype=float)   # 지령 관절 각도 (deg)
+        self.tcp = np.asarray(sdata.tcp_pos, dtype=float)         # 엔코더 기준 TCP [x, y, z, rx, ry, rz]
+        self.tcp_ref = np.asarray(sdata.tcp_ref, dtype=float)     # 지령 기준 TCP
+        self.digital_in = np.asarray(sdata.digital_in)
+        self.digital_out = np.asarray(sdata.digital_out)
+        self.tfb_digital_in = np.asarray(sdata.tfb_digital_in)
+        self.tfb_digital_out = np.asarray(sdata.tfb_digital_out)
+        self.robot_state = sdata.robot_state
+        self.robot_time = sdata.time
+        self.stamp = stamp
+
+    def age(self):
+        """스냅샷을 받은 뒤 지난 시간(초)을 반환합니다."""
+        return time.monotonic() - self.stamp
+
+    def __repr__(self):
+        return (f"RobotSnapshot(joint={np.round(self.joint, 3)}, tcp={np.round(self.tcp, 3)}, "
+                f"robot_state={self.robot_state}, age={self.age() * 1000:.1f}ms)")
+
+def read_snapshot(data_channel, timeout=-1.0):
+    """
+    데이터 채널(rb.CobotData, 포트 5001)에서 패킷 1개를 받아 RobotSnapshot 으로 반환합니다.
+
+    read_joint / get_tcp / get_tfc 처럼 변수마다 명령 채널을 왕복하지 않고
+    한 번의 요청으로 관절, TCP, IO 상태를 함께 읽습니다.
+    툴 플랜지(TFC) 좌표는 데이터 패킷에 포함되지 않으므로 필요하면 get_tfc()를 사용하세요.
+
+    Args:
+        data_channel (rb.CobotData): 데이터 채널 객체.
+        timeout (float): 응답 대기 시간(초). 음수면 무한 대기.
+    Returns:
+        RobotSnapshot 또는 None (타임아웃 등으로 패킷을 받지 못한 경우).
+    """
+    data = data_channel.request_data(timeout)
+    if data is None:
+        return None
+    return RobotSnapshot(data.sdata, time.monotonic())
+
+def read_joint_fast(data_channel, timeout=-1.0):
+    """read_joint 와 같은 (6,) 관절 배열을 데이터 패킷 1개로 읽어옵니다. 실패 시 None."""
+    snapshot = read_snapshot(data_channel, timeout)
+    if snapshot is None:
+        return None
+    return snapshot.joint
@@ -0,0 +1,198 @@
+# 파지 회전 선택 (여러 물체 회전 행렬을 한 번에)
+# old_sam6d_rotation_calculator_4in1.py 의 process_and_analyze_matrix_sequence 는 3x3 행렬 1개씩
+# 분기 / print / matplotlib 그림으로 처리했습니다. 여기서는 같은 단계를 (N,3,3) 배열 전체에 대해
+# NumPy 연산 몇 번으로 계산합니다 (print / 그림 없음).
+#
+#   Step 2: 로컬 Y축의 Z 성분이 음수면 로컬 Z 180도 회전 (flip)
+#   Step 3: 로컬 Y축의 |y| > |x| 인지 비교
+#   Step 4: 로컬 Y축 회전으로 X축의 Z 성분을 0 으로 만든 기준 두 개 중 Step 3 결과로 하나 선택
+#   Step 5/6: 로컬 Y 0/90/180/270도 후보 중 기준 X축과 ±45도 안에 있는 후보 선택
+#   totalmove: 선택 행렬 @ Rx(-90) @ Rz(-90) → ZYX 오일러 각 (deg)
+#
+# select_symmetric_grasp 는 N 회 대칭(임의 로컬 축) 물체의 파지 자세 중 현재 TCP 자세에 가장 가까운 것을
+# 후보를 나열하지 않고 쿼터니언 트위스트 각으로 바로 계산합니다. (Step 5/6 도 이 방식으로 계산: 기준 자세에 가장 가까운 90도 후보)
+#
+# 사용 예)
+#   result = select_grasp_rotations(R_objects)     # R_objects: (N,3,3)
+#   result["selected"], result["euler_zyx_deg"], result["valid"]
+#   sym = select_symmetric_grasp(R_objects, R_tcp, n_fold=4, axis=(0, 1, 0))
+#   sym["target"], sym["cost_deg"], sym["wrist_deg"]
+
+import numpy as np
+from robotarm_kinematics import (rotation_to_rpy, rpy_to_rotation, rotation_to_quaternion,
+                                 quaternion_to_rotation, quaternion_multiply)
+
+ANGLE_RANGE_DEG = 45.0
+_TOL = 1e-9
+
+# totalmove 의 툴 보정 회전: @ Rx(-90) @ Rz(-90)
+TOOL_CORRECTION = rpy_to_rotation([-90.0, 0.0, 0.0]) @ rpy_to_rotation([0.0, 0.0, -90.0])
+
+
+def euler_zyx_deg(R):
+    """
+    (...,3,3) 회전 행렬 → ZYX(내재) 오일러 각 [z, y, x] (deg).
+
+    scipy Rotation.as_euler('ZYX') 와 같은 순서이며, 짐벌 락(|y| = 90도)에서는 scipy 처럼 x 를 0 으로 둡니다.
+    """
+    R = np.asarray(R, dtype=float)
+    rpy = rotation_to_rpy(R, degrees=False) # [x, y, z], R = Rz Ry Rx
+    lock = np.abs(R[..., 2, 0]) > 1.0 - 1e-9
+    if np.any(lock):
+        rpy = np.array(rpy)
+        rpy[lock, 0] = 0.0
+        rpy[lock, 2] = np.arctan2(-R[lock, 0, 1], R[lock, 1, 1])
+    return np.degrees(rpy[..., ::-1])
+
+
+def select_grasp_rotations(matrices, angle_range_deg=ANGLE_RANGE_DEG, tool_correction=TOOL_CORRECTION):
+    """
+    물체 회전 행렬 (N,3,3) 각각의 파지 회전을 한 번에 선택합니다.
+
+    Args:
+        matrices (array-like): (N,3,3) 또는 (3,3) 로봇 기준 물체 회전 행렬.
+        angle_range_deg (float): Step 6 허용 범위 (±deg).
+        tool_correction (np.ndarray): 선택 행렬 뒤에 곱할 툴 보정 회전 (3,3).
+    Returns:
+        dict (모두 첫 축이 N):
+            flip (bool): Step 2 로컬 Z 180도 적용 여부.
+            reference (3,3): Step 4 기준 행렬.
+            step_deg (float): 선택된 로컬 Y 회전 (0/90/180/270), 없으면 NaN.
+            offset_deg (float): 기준 X축과 선택 X축 사이 각 (로컬 Y축 기준), 없으면 NaN.
+            valid (bool): ±angle_range_deg 안의 후보가 있었는지.
+            selected (3,3): Step 6 선택 행렬 (없으면 NaN).
+            grasp (3,3): selected @ tool_correction.
+            euler_zyx_deg (3,): grasp 의 ZYX 오일러 각 [z, y, x] (deg).
+    """
+    M = np.array(matrices, dtype=float)
+    if M.ndim == 2:
+        M = M[None]
+    if M.shape[-2:] != (3, 3):
+        raise ValueError(f"회전 행렬 배열은 (N,3,3) 이어야 합니다: {M.shape}")
+    n = M.shape[0]
+
+    # Step 2: Y축 Z 성분 < 0 → @ Rz(180) (X, Y 열 부호 반전)
+    flip = M[:, 2, 1] < 0
+    M2 = M.copy()
+    M2[flip, :, :2] *= -1.0
+    x2, y2, z2 = M2[:, :, 0], M2[:, :, 1], M2[:, :, 2]
+
+    # Step 3: 로컬 Y축의 |y| > |x| (같으면 X 쪽으로 처리)
+    y_higher = np.abs(y2[:, 1]) > np.abs(y2[:, 0])
+
+    # Step 4: @ Ry(a) 로 X축 Z 성분을 0 으로 (a = atan2(Xz, Zz)), 두 번째 기준은 그 @ Ry(180)
+    a = np.arctan2(x2[:, 2], z2[:, 2])
+    a[(np.abs(x2[:, 2]) <= _TOL) & (np.abs(z2[:, 2]) <= _TOL)] = 0.0
+    ca, sa = np.cos(a)[:, None], np.sin(a)[:, None]
+    ref1_x = ca * x2 - sa * z2
+    ref1_z = sa * x2 + ca * z2
+    # y_higher 면 X축의 x 성분, 아니면 y 성분이 양수인 기준 (둘 다 0 근처면 더 큰 쪽)
+    comp = np.where(y_higher, ref1_x[:, 0], ref1_x[:, 1])
+    sign = np.where(comp > 0, 1.0, -1.0)[:, None] # 두 번째 기준 = X, Z 열 부호 반전
+    ref_x = sign * ref1_x
+    reference = np.stack((ref_x, y2, sign * ref1_z), axis=2)
+
+    # Step 5/6: 로컬 Y 0/90/180/270 후보 중 기준에 가장 가까운 것 = 4회 대칭 닫힌 형태 선택
+    #           (가장 가까운 후보는 항상 ±45도 안이므로 허용 범위를 좁혔을 때만 valid 가 False)
+    sym = select_symmetric_grasp(M2, reference, n_fold=4, axis=(0.0, 1.0, 0.0))
+    k = sym["step"]
+    offset = sym["wrist_deg"] # 기준 X축 → 선택 X축 (로컬 Y축 기준)
+    selected = sym["target"]
+
+    # 정확히 ±45도(두 후보 동률)면 기존 코드처럼 0/90/180/270 순서에서 앞 후보를 선택
+    other = (k + np.where(offset < 0, 1, -1)) % 4
+    swap = (np.abs(np.abs(offset) - 45.0) <= 1e-6) & (other < k)
+    if np.any(swap):
+        step = np.where(offset[swap] < 0, 1.0, -1.0)[:, None] # @ Ry(+90): X ← -Z, Z ← X / @ Ry(-90): X ← Z, Z ← -X
+        sx, sz = selected[swap, :, 0].copy(), selected[swap, :, 2].copy()
+        selected[swap, :, 0] = -step * sz
+        selected[swap, :, 2] = step * sx
+        k = np.where(swap, other, k)
+        offset = np.where(swap, -offset, offset)
+
+    valid = np.abs(offset) <= angle_range_deg + _TOL
+    selected[~valid] = np.nan
+
+    grasp = selected @ tool_correction
+    return {
+        "flip": flip,
+        "reference": reference,
+        "step_deg": np.where(valid, 90.0 * k, np.nan),
+        "offset_deg": np.where(valid, offset, np.nan),
+        "valid": valid,
+        "selected": selected,
+        "grasp": grasp,
+        "euler_zyx_deg": euler_zyx_deg(grasp),
+    }
+
+
+def select_symmetric_grasp(obj_rot, tcp_rot, n_fold=4, axis=(0.0, 1.0, 0.0), tool_correction=None):
+    """
+    N 회 대칭 물체의 파지 자세 중 현재 TCP 자세에 가장 가까운 것을 닫힌 형태로 고릅니다.
+
+    대칭 자세는 obj_rot @ Rot(axis, 360k/N) @ tool_correction (k = 0..N-1) 입니다.
+    d = q_obj^-1 ⊗ q_tcp ⊗ q_tool^-1 (물체 좌표계에서 본 현재 TCP) 를 axis 기준 swing-twist 로 나누면
+    후보 k 와의 쿼터니언 내적은 ρ·cos((θ_k - φ)/2) (φ: 트위스트 각) 이므로
+    φ 에 가장 가까운 θ_k = round(φ / (360/N)) · 360/N 가 가장 가까운 후보입니다.
+
+    Args:
+        obj_rot (array-like): (N,3,3) 또는 (3,3) 물체 회전 행렬 (로봇 기준).
+        tcp_rot (array-like): (3,3) 또는 (N,3,3) 현재 TCP 회전 행렬.
+        n_fold (int): 대칭 차수. 1 이면 대칭 없음, 0 이면 axis 둘레 연속 대칭 (원통 등).
+        axis (array-like): 대칭축 (물체 로컬 좌표, 정규화하지 않아도 됨).
+        tool_correction (np.ndarray or None): 물체 자세 → TCP 자세 보정 회전 (3,3). None 이면 단위 행렬.
+    Returns:
+        dict (모두 첫 축이 N):
+            step (int): 선택된 대칭 번호 k (연속 대칭이면 -1).
+            step_deg (float): 선택된 대칭 회전 각 θ_k (deg).
+            twist_deg (float): 현재 TCP 의 axis 둘레 트위스트 각 φ (deg, -180~180).
+            wrist_deg (float): 선택 자세까지 axis 둘레로 더 돌아야 하는 각 θ_k - φ (deg, |값| <= 180/N).
+                               axis 가 툴 Z 축과 나란하면 J6 회전량에 해당합니다.
+            cost_deg (float): 현재 TCP → 선택 자세 전체 회전 각 (deg).
+            quaternion (4,): 선택 자세 쿼터니언 [w, x, y, z].
+            target (3,3): 선택 자세 회전 행렬.
+    """
+    Ro = np.array(obj_rot, dtype=float)
+    if Ro.ndim == 2:
+        Ro = Ro[None]
+    n = Ro.shape[0]
+    a = np.asarray(axis, dtype=float)
+    a = a / np.linalg.norm(a)
+
+    q_obj = rotation_to_quaternion(Ro)
+    q_tcp = np.broadcast_to(rotation_to_quaternion(tcp_rot), (n, 4))
+    if tool_correction is None:
+        q_tool = np.array([1.0, 0.0, 0.0, 0.0])
+    else:
+        q_tool = rotation_to_quaternion(tool_correction)
+    conj = np.array([1.0, -1.0, -1.0, -1.0])
+    d = quaternion_multiply(quaternion_multiply(q_obj * conj, q_tcp), q_tool * conj)
+
+    # 트위스트 각 φ = 2·atan2(a·d_v, d_w)
+    phi = 2.0 * np.arctan2(d[:, 1:] @ a, d[:, 0])
+    phi = (phi + np.pi) % (2.0 * np.pi) - np.pi
+    if n_fold == 0:
+        step = np.full(n, -1)
+        theta = phi
+    else:
+        period = 2.0 * np.pi / n_fold
+        k = np.rint(phi / period)
+        theta = k * period
+        step = (k.astype(int) % n_fold)
+
+    # 선택 자세 = obj ⊗ r(θ) ⊗ tool
+    r = np.concatenate((np.cos(theta / 2.0)[:, None], np.sin(theta / 2.0)[:, None] * a), axis=1)
+    q_sel = quaternion_multiply(quaternion_multiply(q_obj, r), q_tool)
+    q_sel = np.where(q_sel[:, :1] < 0, -q_sel, q_sel)
+
+    dot = np.abs(np.sum(q_sel * q_tcp, axis=1))
+    cost = 2.0 * np.arccos(np.clip(dot, 0.0, 1.0))
+    return {
+        "step": step,
+        "step_deg": np.degrees(theta) % 360.0,
+        "twist_deg": np.degrees(phi),
+        "wrist_deg": np.degrees(theta - phi),
+        "cost_deg": np.degrees(cost),
+        "quaternion": q_sel,
+        "target": quaternion_to_rotation(q_sel),
+    }
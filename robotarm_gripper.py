@@ -0,0 +1,301 @@
+# 그리퍼 디지털 출력 펄스 스케줄러
+# 기존 grip() 은 set_dout_bit_combination(값) → time.sleep(0.1) → set_dout_bit_combination(0) 으로
+# 그리퍼 1번마다 프로그램 전체가 100 ms 씩 멈췄습니다.
+# PulseScheduler.pulse() 는 ON 출력은 호출한 스레드에서 바로 보내고(반환 시점에 출력이 이미 켜져 있음),
+# OFF 만 작업 스레드에 예약하므로 펄스가 유지되는 동안 스크립트 소켓 이동 명령 등 다른 작업을 계속할 수 있습니다.
+# OFF 출력이 실패하면 OFF_RETRIES 번 다시 보내고, 그래도 실패하면 Pulse.wait() / stop() 에서 예외를 냅니다.
+# 출력 호출 전후 시각으로 실제 펄스 폭(ON 완료 ~ OFF 완료)을 기록합니다.
+#
+# 출력 방식 (mode)
+#   "cobot": robot.set_dout_bit_combination(rc, first, last, value, LittleEndian)  (기존 grip 과 같음)
+#   "eval" : robot.eval(rc, "digital_out 0,1,-1,...")  (dev_eval_func_DO_0_control.py 방식, -1 은 유지)
+# 이 저장소의 rbpodo API 에는 제어기 쪽 시간 지정 출력이 없으므로 OFF 시각은 PC 에서 맞춥니다.
+#
+# 주의: rb.Cobot 연결은 스레드 안전하지 않습니다. 그리퍼 전용 연결(rb.Cobot(ip))을 따로 열어 넘기면
+#       메인 스레드의 move_j / move_pb 와 겹쳐도 됩니다. 같은 robot 을 함께 쓰려면 다른 명령 전에
+#       wait_idle() 로 펄스가 끝나기를 기다리거나 scheduler.lock 을 잡으세요.
+#
+# 사용 예)
+#   gripper = PulseScheduler(rb.Cobot(ROBOT_IP), rb.ResponseCollector())
+#   p = gripper.grip("grab")          # ON 출력 후 반환, 100 ms 뒤 작업 스레드가 OFF
+#   ... 스크립트 소켓 이동 ...
+#   p.wait(); print(p.achieved_ms)
+#   print(gripper.stats())
+#   gripper.stop()
+
+import time
+import heapq
+import threading
+from collections import deque
+import numpy as np
+
+GRIP_VALUES = {"release": 1, "grab": 2} # DO 0~3 비트 조합 (리틀 엔디안): release → DO0, grab → DO1
+PULSE_WIDTH = 0.1 # 기본 펄스 폭 (s)
+OFF_RETRIES = 3 # OFF 출력 실패 시 다시 보내는 횟수
+OFF_RETRY_DELAY = 0.01 # 다시 보내기 전 대기 (s)
+NUM_DOUT = 16
+
+
+def digital_out_command(first, last, value, num_dout=NUM_DOUT):
+    """first~last 비트를 value(리틀 엔디안)로, 나머지는 -1(유지)로 둔 digital_out 스크립트 문자열."""
+    states = ["-1"] * num_dout
+    for k, bit in enumerate(range(first, last + 1)):
+        states[bit] = str((value >> k) & 1)
+    return "digital_out " + ",".join(states)
+
+
+class Pulse:
+    """
+    예약된 펄스 1개.
+
+    t_request: pulse() 호출 시각, t_on / t_off: ON / OFF 출력 호출이 끝난 시각 (time.monotonic).
+    on_call / off_call: 출력 호출에 걸린 시간 (s). 실제 출력 시점은 호출 중 어딘가이므로 오차 범위입니다.
+    """
+
+    __slots__ = ("first", "last", "value", "width", "t_request", "t_on", "t_off", "on_call", "off_call",
+                 "superseded", "error", "_done")
+
+    def __init__(self, first, last, value, width):
+        self.first = first
+        self.last = last
+        self.value = value
+        self.width = width
+        self.t_request = time.monotonic()
+        self.t_on = None
+        self.t_off = None
+        self.on_call = None
+        self.off_call = None
+        self.superseded = False # 같은 비트에 다음 펄스가 먼저 와서 OFF 를 건너뜀
+        self.error = None
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        펄스가 끝날 때(OFF 출력 또는 다음 펄스로 대체)까지 기다립니다. 끝났으면 True.
+        OFF 출력이 끝내 실패했으면(출력이 켜진 채 남음) 그 예외를 다시 냅니다.
+        """
+        done = self._done.wait(timeout)
+        if done and self.error is not None:
+            raise self.error
+        return done
+
+    @property
+    def achieved_ms(self):
+        """실제 펄스 폭 (ms): ON 출력 완료 ~ OFF 출력 완료. 아직 안 끝났으면 None."""
+        if self.t_on is None or self.t_off is None:
+            return None
+        return (self.t_off - self.t_on) * 1000.0
+
+    def overlaps(self, other):
+        return self.first <= other.last and other.first <= self.last
+
+
+class PulseScheduler:
+    """
+    디지털 출력 펄스를 작업 스레드에서 예약 시각에 보내는 스케줄러.
+
+    Args:
+        robot (rb.Cobot): 출력에 쓸 rbpodo 연결.
+        rc (rb.ResponseCollector): 응답 수집기.
+        mode (str): "cobot" (set_dout_bit_combination) 또는 "eval" (digital_out 스크립트).
+        first, last (int): 기본 출력 비트 범위.
+        history (int): 실제 펄스 폭 기록 개수.
+    """
+
+    def __init__(self, robot, rc, mode="cobot", first=0, last=3, history=256):
+        if mode not in ("cobot", "eval"):
+            raise ValueError(f"지원하지 않는 출력 방식입니다: {mode}")
+        self.robot = robot
+        self.rc = rc
+        self.mode = mode
+        self.first = first
+        self.last = last
+        self.lock = threading.RLock() # robot 호출 보호 (다른 스레드에서 같은 robot 을 쓸 때 함께 사용)
+
+        self._cond = threading.Condition()
+        self._heap = [] # (due, seq, action, pulse)
+        self._seq = 0
+        self._active = [] # OFF 를 기다리는 펄스
+        self._outstanding = 0 # pulse() 로 예약했지만 아직 끝나지 않은 펄스 수
+        self._call_est = 0.0 # 출력 호출 시간 추정 (OFF 를 그만큼 일찍 보냄)
+        self._running = True
+        self.history = deque(maxlen=history)
+        self.errors = deque(maxlen=history)
+        self.stuck = [] # OFF 를 끝내 보내지 못한 펄스 (출력이 켜진 채 남았을 수 있음)
+        self._thread = threading.Thread(target=self._run, name="PulseScheduler", daemon=True)
+        self._thread.start()
+
+    # ====== 출력 ======
+
+    def _write(self, first, last, value):
+        """출력 1번. 호출에 걸린 시간(s)을 반환합니다."""
+        t0 = time.monotonic()
+        with self.lock:
+            if self.mode == "cobot":
+                import rbpodo as rb
+                self.robot.set_dout_bit_combination(self.rc, first, last, value, rb.Endian.LittleEndian)
+            else:
+                self.robot.eval(self.rc, digital_out_command(first, last, value))
+        return time.monotonic() - t0
+
+    def _schedule(self, due, action, pulse):
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("PulseScheduler 가 이미 정지되었습니다.")
+            heapq.heappush(self._heap, (due, self._seq, action, pulse))
+            self._seq += 1
+            self._cond.notify()
+
+    def pulse(self, value, width=PULSE_WIDTH, first=None, last=None):
+        """
+        value 를 바로 출력하고, width(s) 뒤에 0 으로 되돌리는 OFF 를 작업 스레드에 예약합니다.
+        ON 출력이 끝난 뒤 반환하므로 다음 이동 명령보다 출력이 먼저 나갑니다. ON 출력 실패는 예외로 전달됩니다.
+
+        같은 비트에 아직 끝나지 않은 펄스가 있으면 그 펄스의 OFF 는 건너뛰고(새 값이 덮어씀) 새 펄스가 이어받습니다.
+
+        Returns:
+            Pulse: 완료 대기 / 실제 폭 확인용.
+        """
+        p = Pulse(self.first if first is None else first, self.last if last is None else last, value, width)
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("PulseScheduler 가 이미 정지되었습니다.")
+            self._outstanding += 1
+        # lock 을 잡은 채로 대체 + ON 출력 (작업 스레드의 이전 펄스 OFF 가 새 ON 뒤에 나가지 않도록)
+        with self.lock:
+            with self._cond:
+                old = [a for a in self._active if a.overlaps(p)]
+            for a in old:
+                a.superseded = True
+                a.t_off = time.monotonic()
+                self._finish(a)
+            try:
+                p.on_call = self._write(p.first, p.last, p.value)
+            except Exception as e:
+                p.error = e
+                self.errors.append((time.monotonic(), repr(e)))
+                self._finish(p)
+                raise
+            p.t_on = time.monotonic()
+            with self._cond:
+                self._active.append(p)
+        # OFF 호출이 끝나는 시각이 t_on + width 가 되도록 호출 시간만큼 일찍 보냄
+        self._schedule(p.t_on + max(p.width - self._call_est, 0.0), "off", p)
+        return p
+
+    def grip(self, command, width=PULSE_WIDTH):
+        """'grab' / 'release' 펄스. 모르는 명령이면 None."""
+        value = GRIP_VALUES.get(command)
+        if value is None:
+            return None
+        return self.pulse(value, width)
+
+    # ====== 작업 스레드 ======
+
+    def _finish(self, p):
+        with self._cond:
+            if p._done.is_set(): # 대체(pulse)와 OFF(작업 스레드)가 겹쳐도 한 번만 처리
+                return
+            if p in self._active:
+                self._active.remove(p)
+            self._outstanding -= 1
+            if p.achieved_ms is not None:
+                self.history.append(p)
+            p._done.set()
+
+    def _do(self, action, p):
+        # 같은 비트의 새 펄스 ON 과 겹치지 않도록 lock 안에서 대체 여부 확인 + OFF 출력
+        with self.lock:
+            if p.superseded:
+                return
+            for attempt in range(OFF_RETRIES + 1):
+                try:
+                    p.off_call = self._write(p.first, p.last, 0)
+                    break
+                except Exception as e: # 실패 기록 후 다시 보냄
+                    self.errors.append((time.monotonic(), repr(e)))
+                    if attempt == OFF_RETRIES:
+                        p.error = e
+                        self.stuck.append(p)
+                        self._finish(p)
+                        return
+                    time.sleep(OFF_RETRY_DELAY)
+            p.t_off = time.monotonic()
+            self._call_est += 0.2 * (p.off_call - self._call_est)
+            # lock 안에서 끝내야 OFF 를 보낸 펄스를 pulse() 가 다시 대체하지 않음
+            self._finish(p)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                if not self._running and not self._heap:
+                    return
+                due, _, action, p = heapq.heappop(self._heap)
+                delay = due - time.monotonic()
+            if delay > 0: # stop() 중 남은 OFF 는 시각까지 기다렸다가 보냄
+                time.sleep(delay)
+            self._do(action, p)
+
+    # ====== 상태 ======
+
+    def pending(self):
+        """아직 끝나지 않은 펄스 수."""
+        with self._cond:
+            return self._outstanding
+
+    def wait_idle(self, timeout=None):
+        """예약된 펄스가 모두 끝날 때까지 기다립니다. 끝났으면 True."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def stats(self):
+        """
+        실제 펄스 폭 통계 (ms).
+
+        Returns:
+            dict: n, width_p50/p95/max, error_p50/p95 (실제 - 요청), call_p95 (출력 호출 시간), failures.
+        """
+        done = [p for p in self.history if not p.superseded]
+        if not done:
+            return {"n": 0, "failures": len(self.errors)}
+        achieved = np.array([p.achieved_ms for p in done])
+        err = achieved - np.array([p.width * 1000.0 for p in done])
+        calls = np.array([c for p in done for c in (p.on_call, p.off_call)]) * 1000.0
+        w50, w95 = np.percentile(achieved, [50, 95])
+        e50, e95 = np.percentile(err, [50, 95])
+        return {"n": len(done), "width_p50": float(w50), "width_p95": float(w95), "width_max": float(achieved.max()),
+                "error_p50": float(e50), "error_p95": float(e95), "call_p95": float(np.percentile(calls, 95)),
+                "failures": len(self.errors)}
+
+    def format_stats(self):
+        s = self.stats()
+        if s["n"] == 0:
+            return f"그리퍼 펄스 기록 없음 (실패 {s['failures']})"
+        return (f"그리퍼 펄스 {s['n']}회 | 실제 폭 p50 {s['width_p50']:.1f} ms, p95 {s['width_p95']:.1f} ms, "
+                f"최대 {s['width_max']:.1f} ms | 오차 p95 {s['error_p95']:+.1f} ms | "
+                f"출력 호출 p95 {s['call_p95']:.1f} ms | 실패 {s['failures']}")
+
+    def stop(self, timeout=2.0):
+        """
+        남은 펄스(OFF 포함)를 마저 보내고 작업 스레드를 멈춥니다.
+        OFF 를 끝내 보내지 못한 펄스가 있으면 RuntimeError (출력이 켜진 채 남았을 수 있음).
+        """
+        self.wait_idle(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self.stuck:
+            bits = sorted({(p.first, p.last) for p in self.stuck})
+            raise RuntimeError(f"그리퍼 출력 OFF 실패 {len(self.stuck)}회 (비트 {bits}): {self.stuck[-1].error!r}")
@@ -0,0 +1,511 @@
+# RB5-850 기구학 계산 모듈 (DH 파라미터 기반)
+# 여러 자세를 (N,6) 배열로 한 번에 넣어 브로드캐스팅으로 계산합니다.
+# 링크마다 Transform 객체를 만들지 않고 (N,7,4,4) 변환 행렬 배열만 사용합니다.
+#
+# 사용 예)
+#   robot = RobotArm(num_axes=6)
+#   T = robot.fk_batch(q_array)          # (N,7,4,4): 0번은 베이스, 1~6번은 각 링크
+#   points = robot.link_positions(q)     # (N,7,3)
+#   T, J = robot.fk_and_jacobian(q)      # 순기구학 + 자코비안을 한 번에
+#   dq = dls_step(J, v_task)             # 감쇠 최소자승 역기구학 1 스텝
+#   servo = CartesianServo(robot, target_pos, target_rot)   # 6D 직선 이동 (move_l) 서보
+#   q, stats = servo.run(q_start)
+#   q, ok = ik_batch(robot, q_seed, target_pos, target_rot)   # (N,) 목표 자세 역기구학 한 번에
+
+import os
+import numpy as np
+
+# 기본 DH 파라미터 (표준 DH, 단위: mm / deg)
+# 열: a, alpha, d, theta_offset
+# RB5-850E 사양서 치수(베이스 169.2, 상완 425, 하완 392, 손목 110.7/110.7/96.7) 기준 근사값입니다.
+# theta_offset 은 관절각 0 일 때 팔이 위로 곧게 서고, 준비 자세 [0, 0, 90, 0, 90, 0] 에서
+# 툴 플랜지 Z축이 아래를 향하도록 맞춘 값입니다.
+# 정확한 값이 있으면 dh_param_file(csv)로 덮어쓰세요.
+RB5_850_DH = np.array([
+    #   a        alpha    d       theta_offset
+    [   0.0,     90.0,   169.2,    0.0],
+    [-425.0,      0.0,     0.0,  -90.0],
+    [-392.0,      0.0,     0.0,    0.0],
+    [   0.0,     90.0,   110.7,  -90.0],
+    [   0.0,    -90.0,   110.7,  180.0],
+    [   0.0,      0.0,    96.7,    0.0],
+])
+
+
+def rotation_to_rpy(R, degrees=True):
+    """
+    회전 행렬 (...,3,3) → [rx, ry, rz] (R = Rz(rz) @ Ry(ry) @ Rx(rx)).
+
+    로봇 TCP 표기(Rx, Ry, Rz)와 같은 고정축 X-Y-Z 순서입니다.
+    """
+    R = np.asarray(R, dtype=float)
+    rx = np.arctan2(R[..., 2, 1], R[..., 2, 2])
+    ry = np.arcsin(np.clip(-R[..., 2, 0], -1.0, 1.0))
+    rz = np.arctan2(R[..., 1, 0], R[..., 0, 0])
+    rpy = np.stack((rx, ry, rz), axis=-1)
+    return np.degrees(rpy) if degrees else rpy
+
+
+def rpy_to_rotation(rpy, degrees=True):
+    """[rx, ry, rz] (...,3) → 회전 행렬 (...,3,3). rotation_to_rpy 의 역변환입니다."""
+    rpy = np.asarray(rpy, dtype=float)
+    if degrees:
+        rpy = np.radians(rpy)
+    cx, cy, cz = np.cos(rpy[..., 0]), np.cos(rpy[..., 1]), np.cos(rpy[..., 2])
+    sx, sy, sz = np.sin(rpy[..., 0]), np.sin(rpy[..., 1]), np.sin(rpy[..., 2])
+    R = np.empty(rpy.shape[:-1] + (3, 3))
+    R[..., 0, 0] = cz * cy
+    R[..., 0, 1] = cz * sy * sx - sz * cx
+    R[..., 0, 2] = cz * sy * cx + sz * sx
+    R[..., 1, 0] = sz * cy
+    R[..., 1, 1] = sz * sy * sx + cz * cx
+    R[..., 1, 2] = sz * sy * cx - cz * sx
+    R[..., 2, 0] = -sy
+    R[..., 2, 1] = cy * sx
+    R[..., 2, 2] = cy * cx
+    return R
+
+
+def rotation_to_quaternion(R):
+    """
+    회전 행렬 (...,3,3) → 단위 쿼터니언 (...,4) [w, x, y, z], w >= 0.
+
+    대각 성분 중 가장 큰 경우를 골라 계산하므로(Shepperd 방법) 180도 근처에서도 안정적입니다.
+    """
+    R = np.asarray(R, dtype=float)
+    r00, r11, r22 = R[..., 0, 0], R[..., 1, 1], R[..., 2, 2]
+    case = np.argmax(np.stack((r00 + r11 + r22, r00, r11, r22), axis=-1), axis=-1)
+    s = 2.0 * np.sqrt(np.maximum(np.choose(case, (1.0 + r00 + r11 + r22, 1.0 + r00 - r11 - r22,
+                                                  1.0 - r00 + r11 - r22, 1.0 - r00 - r11 + r22)), 1e-300))
+    a = R[..., 2, 1] - R[..., 1, 2]
+    b = R[..., 0, 2] - R[..., 2, 0]
+    c = R[..., 1, 0] - R[..., 0, 1]
+    xy = R[..., 0, 1] + R[..., 1, 0]
+    xz = R[..., 0, 2] + R[..., 2, 0]
+    yz = R[..., 1, 2] + R[..., 2, 1]
+    q = np.stack((
+        np.choose(case, (0.25 * s, a / s, b / s, c / s)),
+        np.choose(case, (a / s, 0.25 * s, xy / s, xz / s)),
+        np.choose(case, (b / s, xy / s, 0.25 * s, yz / s)),
+        np.choose(case, (c / s, xz / s, yz / s, 0.25 * s)),
+    ), axis=-1)
+    q /= np.linalg.norm(q, axis=-1, keepdims=True)
+    return np.where(q[..., :1] < 0, -q, q)
+
+
+def quaternion_to_rotation(q):
+    """단위 쿼터니언 (...,4) [w, x, y, z] → 회전 행렬 (...,3,3)."""
+    q = np.asarray(q, dtype=float)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    R = np.empty(q.shape[:-1] + (3, 3))
+    R[..., 0, 0] = 1 - 2 * (y * y + z * z)
+    R[..., 0, 1] = 2 * (x * y - z * w)
+    R[..., 0, 2] = 2 * (x * z + y * w)
+    R[..., 1, 0] = 2 * (x * y + z * w)
+    R[..., 1, 1] = 1 - 2 * (x * x + z * z)
+    R[..., 1, 2] = 2 * (y * z - x * w)
+    R[..., 2, 0] = 2 * (x * z - y * w)
+    R[..., 2, 1] = 2 * (y * z + x * w)
+    R[..., 2, 2] = 1 - 2 * (x * x + y * y)
+    return R
+
+
+def quaternion_multiply(p, q):
+    """쿼터니언 곱 p ⊗ q (...,4). 회전 행렬로는 R(p) @ R(q)."""
+    p = np.asarray(p, dtype=float)
+    q = np.asarray(q, dtype=float)
+    pw, pv = p[..., :1], p[..., 1:]
+    qw, qv = q[..., :1], q[..., 1:]
+    w = pw * qw - np.sum(pv * qv, axis=-1, keepdims=True)
+    v = pw * qv + qw * pv + np.cross(pv, qv)
+    return np.concatenate((w, v), axis=-1)
+
+
+def dls_step(J, v_task, damping_sq=0.01):
+    """
+    감쇠 최소자승(Damped Least Squares) 역기구학 1 스텝.
+
+    dq = J^T (J J^T + λ²I)^-1 v 를 역행렬 없이 선형 방정식 풀이로 계산합니다.
+    (J J^T + λ²I 는 대칭 양의 정부호 행렬)
+
+    Args:
+        J (np.ndarray): (6,n) 또는 (N,6,n) 자코비안.
+        v_task (np.ndarray): (6,) 또는 (N,6) 작업공간 속도 [vx, vy, vz, wx, wy, wz].
+        damping_sq (float or np.ndarray): λ² 값. 배치일 경우 (N,) 배열도 가능.
+    Returns:
+        np.ndarray: (n,) 또는 (N,n) 관절 속도 (rad/s).
+    """
+    J = np.asarray(J, dtype=float)
+    A = J @ np.swapaxes(J, -1, -2)
+    # 대각 성분에 λ² 더하기 (배치 λ² 지원)
+    diag = np.einsum("...ii->...i", A)
+    diag += np.asarray(damping_sq)[..., None]
+    x = np.linalg.solve(A, np.asarray(v_task, dtype=float)[..., None])
+    return (np.swapaxes(J, -1, -2) @ x)[..., 0]
+
+
+# 관절 가동 범위 (deg). 실제 제어기 설정값이 다르면 바꿔 쓰세요.
+JOINT_LIMITS_DEG = np.array([
+    [-360.0, -360.0, -165.0, -360.0, -360.0, -360.0],
+    [ 360.0,  360.0,  165.0,  360.0,  360.0,  360.0],
+])
+
+
+def orientation_error(R_target, R_current):
+    """
+    현재 자세에서 목표 자세까지의 회전 오차를 회전 벡터(axis * angle, rad, 베이스 좌표계)로 반환합니다.
+
+    R_err = R_target @ R_current^T 를 쿼터니언으로 바꿔 계산하므로 180도 근처에서도 안정적입니다.
+    """
+    R = R_target @ np.swapaxes(R_current, -1, -2)
+    w = 0.5 * np.sqrt(np.maximum(1.0 + R[..., 0, 0] + R[..., 1, 1] + R[..., 2, 2], 0.0))
+    v = 0.5 * np.stack((
+        np.copysign(np.sqrt(np.maximum(1.0 + R[..., 0, 0] - R[..., 1, 1] - R[..., 2, 2], 0.0)), R[..., 2, 1] - R[..., 1, 2]),
+        np.copysign(np.sqrt(np.maximum(1.0 - R[..., 0, 0] + R[..., 1, 1] - R[..., 2, 2], 0.0)), R[..., 0, 2] - R[..., 2, 0]),
+        np.copysign(np.sqrt(np.maximum(1.0 - R[..., 0, 0] - R[..., 1, 1] + R[..., 2, 2], 0.0)), R[..., 1, 0] - R[..., 0, 1]),
+    ), axis=-1)
+    s = np.linalg.norm(v, axis=-1)
+    angle = 2.0 * np.arctan2(s, w)
+    scale = np.where(s > 1e-12, angle / np.maximum(s, 1e-12), 2.0)
+    return v * scale[..., None]
+
+
+class ServoStats:
+    """CartesianServo 수렴 통계."""
+
+    def __init__(self):
+        self.iterations = 0
+        self.converged = False
+        self.pos_residual = np.inf          # 위치 잔차 (mm)
+        self.rot_residual_deg = np.inf      # 자세 잔차 (deg)
+        self.manipulability = np.nan        # 마지막 스텝 조작성 지수
+        self.min_manipulability = np.inf    # 이동 중 최소 조작성 지수
+        self.max_damping_sq = 0.0           # 이동 중 사용된 최대 λ²
+        self.limit_hits = 0                 # 관절 한계에 걸려 잘린 횟수
+
+    def __repr__(self):
+        return (f"ServoStats(iterations={self.iterations}, converged={self.converged}, "
+                f"pos_residual={self.pos_residual:.3f}mm, rot_residual={self.rot_residual_deg:.3f}deg, "
+                f"min_manipulability={self.min_manipulability:.4g}, max_damping_sq={self.max_damping_sq:.4g}, "
+                f"limit_hits={self.limit_hits})")
+
+
+class CartesianServo:
+    """
+    위치 + 자세(6D) 직교 공간 서보. 자코비안 DLS 로 매 스텝 관절 속도를 계산합니다.
+
+    - 자세 오차: 쿼터니언 기반 회전 벡터 (orientation_error)
+    - 관절 한계 회피: 한계에 가까운 관절일수록 가중치를 줄이고, 결과는 한계 안으로 자름
+    - 특이점 근처 적응형 감쇠: 최소 특이값이 sigma_threshold 보다 작아지면 λ² 를 키움
+
+    Args:
+        robot (RobotArm): 기구학 모델.
+        target_pos (array_like): 목표 위치 [x, y, z] (mm).
+        target_rot (np.ndarray): 목표 회전 행렬 (3,3).
+        vel_mm (float): 최대 선속도 (mm/s).
+        vel_deg (float): 최대 각속도 (deg/s).
+        dt (float): 스텝 시간 (s).
+        gain (float): 오차 비례 게인 (1/s). 목표 근처에서 감속합니다.
+        pos_tol (float): 위치 수렴 허용 오차 (mm).
+        rot_tol_deg (float): 자세 수렴 허용 오차 (deg).
+        max_iter (int): 최대 스텝 수.
+        damping_sq (float): 기본 λ².
+        max_damping_sq (float): 특이점에서의 최대 λ².
+        sigma_threshold (float): 적응형 감쇠를 시작할 최소 특이값.
+        length_scale (float): 선속도 행을 각속도 행과 같은 크기로 맞추기 위한 길이 (mm).
+        joint_limits (np.ndarray): (2,n) 관절 한계 (deg).
+        limit_margin_deg (float): 한계 회피 가중치를 줄이기 시작하는 여유 각도 (deg).
+    """
+
+    def __init__(self, robot, target_pos, target_rot, vel_mm=100.0, vel_deg=30.0, dt=0.05, gain=2.0,
+                 pos_tol=1.0, rot_tol_deg=0.5, max_iter=2000, damping_sq=1e-4, max_damping_sq=0.05,
+                 sigma_threshold=0.05, length_scale=500.0, joint_limits=JOINT_LIMITS_DEG, limit_margin_deg=10.0):
+        self.robot = robot
+        self.target_pos = np.asarray(target_pos, dtype=float)
+        self.target_rot = np.asarray(target_rot, dtype=float)
+        self.vel_mm = vel_mm
+        self.vel_rad = np.radians(vel_deg)
+        self.dt = dt
+        self.gain = gain
+        self.pos_tol = pos_tol
+        self.rot_tol = np.radians(rot_tol_deg)
+        self.max_iter = max_iter
+        self.damping_sq = damping_sq
+        self.max_damping_sq = max_damping_sq
+        self.sigma_threshold = sigma_threshold
+        self.length_scale = length_scale
+        self.joint_limits = np.asarray(joint_limits, dtype=float)
+        self.limit_margin = limit_margin_deg
+        self.stats = ServoStats()
+
+    def _limit_weights(self, q):
+        """관절 한계까지 남은 거리로 0.05~1 사이의 관절 가중치를 계산합니다."""
+        dist = np.minimum(q - self.joint_limits[0], self.joint_limits[1] - q)
+        return np.clip(dist / self.limit_margin, 0.05, 1.0)
+
+    def step(self, q_deg):
+        """
+        서보 1 스텝을 계산합니다.
+
+        Returns:
+            tuple: (q_next, done). done 이 True 면 수렴했거나 max_iter 에 도달한 것입니다.
+        """
+        stats = self.stats
+        q = np.asarray(q_deg, dtype=float)
+        T, J = self.robot.fk_and_jacobian(q)
+
+        # 1. 위치/자세 오차
+        err_pos = self.target_pos - T[-1, :3, 3]
+        err_rot = orientation_error(self.target_rot, T[-1, :3, :3])
+        dist = np.linalg.norm(err_pos)
+        angle = np.linalg.norm(err_rot)
+        stats.pos_residual = dist
+        stats.rot_residual_deg = np.degrees(angle)
+
+        if dist < self.pos_tol and angle < self.rot_tol:
+            stats.converged = True
+            return q, True
+        if stats.iterations >= self.max_iter:
+            return q, True
+
+        # 2. 작업공간 속도 (오차 비례 + 최대 속도 제한)
+        v = np.empty(6)
+        v[:3] = err_pos * min(self.gain, self.vel_mm / dist) if dist > 0 else 0.0
+        v[3:] = err_rot * min(self.gain, self.vel_rad / angle) if angle > 0 else 0.0
+
+        # 3. 선속도 행을 length_scale 로 나눠 단위를 맞춘 뒤 관절 한계 가중치 적용
+        Js = J.copy()
+        Js[:3] /= self.length_scale
+        vs = v.copy()
+        vs[:3] /= self.length_scale
+        w = self._limit_weights(q)
+        Jw = Js * w
+
+        # 4. 특이점 근처 적응형 감쇠
+        sigma = np.linalg.svd(Jw, compute_uv=False)
+        stats.manipulability = float(np.prod(sigma))
+        stats.min_manipulability = min(stats.min_manipulability, stats.manipulability)
+        sigma_min = sigma[-1]
+        lam_sq = self.damping_sq
+        if sigma_min < self.sigma_threshold:
+            lam_sq += self.max_damping_sq * (1.0 - (sigma_min / self.sigma_threshold) ** 2)
+        stats.max_damping_sq = max(stats.max_damping_sq, lam_sq)
+
+        dq_rad = w * dls_step(Jw, vs, lam_sq)
+
+        # 5. 관절 업데이트 및 한계 클램프
+        q_next = q + np.degrees(dq_rad) * self.dt
+        q_clipped = np.clip(q_next, self.joint_limits[0], self.joint_limits[1])
+        if np.any(q_clipped != q_next):
+            stats.limit_hits += 1
+        stats.iterations += 1
+        return q_clipped, False
+
+    def run(self, q_start, path=None):
+        """
+        수렴할 때까지 대기 없이 반복합니다. (오프라인 경로 검증용)
+
+        Args:
+            q_start (array_like): 시작 관절 각도 (deg).
+            path (list or None): 리스트를 넘기면 매 스텝 관절 각도를 추가합니다.
+        Returns:
+            tuple: (q_final, stats)
+        """
+        q = np.asarray(q_start, dtype=float)
+        done = False
+        while not done:
+            q, done = self.step(q)
+            if path is not None:
+                path.append(q)
+        return q, self.stats
+
+
+def ik_batch(robot, q_seed, target_pos, target_rot, max_iter=100, pos_tol=0.1, rot_tol_deg=0.05,
+             damping_sq=1e-4, length_scale=500.0, joint_limits=JOINT_LIMITS_DEG):
+    """
+    여러 목표 자세의 역기구학을 한 번에 풉니다 (DLS 뉴턴 반복, 자세 N 방향 벡터화).
+
+    CartesianServo 처럼 속도를 제한하며 따라가지 않고 오차 전체를 한 스텝에 줄이므로
+    시드 근처(같은 팔 형태)의 해를 빠르게 찾습니다. 오프라인 계획용입니다.
+
+    Args:
+        robot (RobotArm): 기구학 모델.
+        q_seed (array_like): (n,) 또는 (N,n) 시작 관절 각도 (deg).
+        target_pos (array_like): (N,3) 목표 위치 (mm).
+        target_rot (array_like): (3,3) 또는 (N,3,3) 목표 회전 행렬.
+        max_iter (int): 최대 반복 수.
+        pos_tol (float): 위치 허용 오차 (mm).
+        rot_tol_deg (float): 자세 허용 오차 (deg).
+        damping_sq (float): λ².
+        length_scale (float): 선속도 행을 각속도 행과 같은 크기로 맞추기 위한 길이 (mm).
+        joint_limits (np.ndarray): (2,n) 관절 한계 (deg).
+    Returns:
+        tuple: (q (N,n) deg, converged (N,) bool)
+    """
+    target_pos = np.atleast_2d(np.asarray(target_pos, dtype=float))
+    n_pose = target_pos.shape[0]
+    target_rot = np.broadcast_to(np.asarray(target_rot, dtype=float), (n_pose, 3, 3))
+    q = np.array(np.broadcast_to(np.asarray(q_seed, dtype=float), (n_pose, robot.num_axes)))
+    rot_tol = np.radians(rot_tol_deg)
+    converged = np.zeros(n_pose, dtype=bool)
+
+    for _ in range(max_iter):
+        T, J = robot.fk_and_jacobian(q)
+        err = np.empty((n_pose, 6))
+        err[:, :3] = target_pos - T[:, -1, :3, 3]
+        err[:, 3:] = orientation_error(target_rot, T[:, -1, :3, :3])
+        converged = (np.linalg.norm(err[:, :3], axis=1) < pos_tol) & (np.linalg.norm(err[:, 3:], axis=1) < rot_tol)
+        if converged.all():
+            break
+        J[:, :3] /= length_scale
+        err[:, :3] /= length_scale
+        dq = dls_step(J, err, damping_sq)
+        dq[converged] = 0.0 # 수렴한 자세는 그대로 둠
+        q = np.clip(q + np.degrees(dq), joint_limits[0], joint_limits[1])
+    return q, converged
+
+
+def load_dh_params(filename):
+    """
+    DH 파라미터 csv 파일을 읽어 (n,4) 배열로 반환합니다.
+
+    한 줄에 한 축씩 "a, alpha(deg), d, theta_offset(deg)" 순서로 적습니다. '#' 으로 시작하는 줄은 무시합니다.
+    """
+    return np.loadtxt(filename, delimiter=",", comments="#", ndmin=2)
+
+
+class RobotArm:
+    """
+    DH 파라미터 기반 로봇팔 기구학 모델.
+
+    Args:
+        num_axes (int): 관절 수 (기본 6).
+        dh_param_file (str or None): DH 파라미터 csv 경로. 없으면 RB5_850_DH 를 사용합니다.
+    """
+
+    def __init__(self, num_axes=6, dh_param_file=None):
+        dh = RB5_850_DH
+        if dh_param_file is not None:
+            if os.path.exists(dh_param_file):
+                dh = load_dh_params(dh_param_file)
+            else:
+                print(f"Warning: {dh_param_file} 파일을 찾을 수 없어 기본 RB5-850 DH 파라미터를 사용합니다.")
+        if dh.shape[0] != num_axes:
+            raise ValueError(f"DH 파라미터 행 수({dh.shape[0]})가 num_axes({num_axes})와 다릅니다.")
+
+        self.num_axes = num_axes
+        self.dh = np.array(dh, dtype=float)
+        self.a = self.dh[:, 0]
+        self.d = self.dh[:, 2]
+        self.theta_offset = np.radians(self.dh[:, 3])
+        alpha = np.radians(self.dh[:, 1])
+        # alpha 는 고정값이므로 삼각함수를 미리 계산해 둠
+        self.cos_alpha = np.cos(alpha)
+        self.sin_alpha = np.sin(alpha)
+        self.base = np.eye(4)
+        self.q = np.zeros(num_axes)
+
+    def set_joint_angles(self, q_deg):
+        """현재 관절 각도(deg)를 저장합니다. (단일 자세용 메서드에서 사용)"""
+        self.q = np.array(q_deg, dtype=float)
+
+    def _dh_matrices(self, q_deg):
+        """(N,num_axes) 관절각 → (N,num_axes,4,4) 링크별 DH 변환 행렬."""
+        theta = np.radians(q_deg) + self.theta_offset
+        ct = np.cos(theta)
+        st = np.sin(theta)
+        ca = self.cos_alpha
+        sa = self.sin_alpha
+
+        A = np.zeros(theta.shape + (4, 4))
+        A[..., 0, 0] = ct
+        A[..., 0, 1] = -st * ca
+        A[..., 0, 2] = st * sa
+        A[..., 0, 3] = self.a * ct
+        A[..., 1, 0] = st
+        A[..., 1, 1] = ct * ca
+        A[..., 1, 2] = -ct * sa
+        A[..., 1, 3] = self.a * st
+        A[..., 2, 1] = sa
+        A[..., 2, 2] = ca
+        A[..., 2, 3] = self.d
+        A[..., 3, 3] = 1.0
+        return A
+
+    def fk_batch(self, q_deg):
+        """
+        여러 자세의 순기구학을 한 번에 계산합니다.
+
+        Args:
+            q_deg (array_like): (N,num_axes) 또는 (num_axes,) 관절 각도 (deg).
+        Returns:
+            np.ndarray: (N,num_axes+1,4,4) 변환 행렬. [:,0] 은 베이스, [:,i] 는 i번째 링크 좌표계,
+                        [:,-1] 은 엔드이펙터(툴 플랜지)입니다.
+        """
+        q = np.atleast_2d(np.asarray(q_deg, dtype=float))
+        A = self._dh_matrices(q)
+
+        T = np.empty((q.shape[0], self.num_axes + 1, 4, 4))
+        T[:, 0] = self.base
+        for i in range(self.num_axes):
+            # 축 개수만큼만 반복하고, 자세(N) 방향은 matmul 브로드캐스팅으로 처리
+            np.matmul(T[:, i], A[:, i], out=T[:, i + 1])
+        return T
+
+    def _jacobian_from_frames(self, T):
+        """
+        (N,num_axes+1,4,4) 링크 좌표계 → (N,6,num_axes) 기하학적 자코비안.
+
+        i번째 관절은 (i-1)번째 좌표계의 Z축을 중심으로 회전하므로
+        선속도 열 = z_(i-1) x (p_e - p_(i-1)), 각속도 열 = z_(i-1) 입니다.
+        순기구학에서 이미 계산한 좌표계를 그대로 사용하므로 삼각함수를 다시 계산하지 않습니다.
+        단위: 선속도 mm/rad, 각속도 rad/rad.
+        """
+        z = T[:, :-1, :3, 2]             # (N,n,3) 각 관절 회전축
+        p = T[:, :-1, :3, 3]             # (N,n,3) 각 관절 원점
+        p_e = T[:, -1:, :3, 3]           # (N,1,3) 엔드이펙터 위치
+        J = np.empty((T.shape[0], 6, self.num_axes))
+        J[:, :3, :] = np.swapaxes(np.cross(z, p_e - p), 1, 2)
+        J[:, 3:, :] = np.swapaxes(z, 1, 2)
+        return J
+
+    def fk_and_jacobian(self, q_deg):
+        """
+        순기구학과 자코비안을 한 번의 계산으로 반환합니다.
+
+        Args:
+            q_deg (array_like): (num_axes,) 또는 (N,num_axes) 관절 각도 (deg).
+        Returns:
+            tuple: (T, J). 입력이 1차원이면 T (num_axes+1,4,4), J (6,num_axes),
+                   2차원이면 앞에 N 차원이 붙습니다.
+        """
+        q = np.asarray(q_deg, dtype=float)
+        T = self.fk_batch(q)
+        J = self._jacobian_from_frames(T)
+        if q.ndim == 1:
+            return T[0], J[0]
+        return T, J
+
+    def jacobian(self, q_deg):
+        """(6,num_axes) 또는 (N,6,num_axes) 기하학적 자코비안."""
+        return self.fk_and_jacobian(q_deg)[1]
+
+    def get_jacobian(self):
+        """set_joint_angles 로 저장한 자세의 자코비안 (6,num_axes)."""
+        return self.fk_and_jacobian(self.q)[1]
+
+    def link_positions(self, q_deg):
+        """(N,num_axes+1,3) 베이스와 각 링크 원점 위치 (mm)."""
+        return self.fk_batch(q_deg)[:, :, :3, 3]
+
+    def end_effector_batch(self, q_deg):
+        """(N,4,4) 엔드이펙터 변환 행렬."""
+        return self.fk_batch(q_deg)[:, -1]
+
+    def get_all_link_poses(self):
+        """set_joint_angles 로 저장한 자세의 링크 변환 행렬 (num_axes,4,4)."""
+        return self.fk_batch(self.q)[0, 1:]
+
+    def get_end_effector_pose(self):
+        """set_joint_angles 로 저장한 자세의 엔드이펙터 변환 행렬 (4,4)."""
+        return self.fk_batch(self.q)[0, -1]
@@ -0,0 +1,105 @@
+# 무거운 모듈(cv2, matplotlib, scipy 등) 지연 import + 헤드리스 모드
+# 실행 파일 맨 위에서 import cv2 / import matplotlib.pyplot 을 하면 카메라나 그림을 쓰지 않는 실행에서도
+# import 에 수 초가 걸리고, matplotlib.use('TkAgg') 는 화면(DISPLAY)이 없으면 실패합니다.
+# lazy_import() 는 이름만 등록해 두었다가 처음 속성에 접근할 때 실제로 import 합니다.
+#
+# 헤드리스 모드
+#   환경 변수 ROBOTARM_HEADLESS=1 (또는 true/yes/on) 이면 화면 창(cv2.imshow, matplotlib 뷰어)을 띄우지 않습니다.
+#   ROBOTARM_HEADLESS=0 이면 강제로 끕니다. 지정하지 않으면 리눅스에서 DISPLAY / WAYLAND_DISPLAY 가 없을 때 헤드리스입니다.
+#
+# 사용 예)
+#   from robotarm_lazy import lazy_import, is_headless
+#   cv2 = lazy_import("cv2")          # 여기서는 import 하지 않음
+#   if not is_headless():
+#       cv2.imshow("view", frame)     # 처음 접근할 때 import
+#   plt = lazy_import("matplotlib.pyplot", backend="Agg" if is_headless() else None)
+
+import os
+import sys
+import time
+import importlib
+import threading
+
+HEADLESS_ENV = "ROBOTARM_HEADLESS"
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off")
+
+
+def is_headless():
+    """화면 창을 띄우지 않아야 하면 True (ROBOTARM_HEADLESS, 없으면 DISPLAY 유무로 판단)."""
+    value = os.environ.get(HEADLESS_ENV, "").strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    if sys.platform.startswith("linux"):
+        return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return False
+
+
+class LazyModule:
+    """
+    처음 속성에 접근할 때 import 되는 모듈 대리 객체.
+
+    Args:
+        name (str): 모듈 이름 (예: "cv2", "matplotlib.pyplot").
+        backend (str or None): matplotlib 계열이면 import 전에 matplotlib.use(backend) 를 호출.
+    """
+
+    def __init__(self, name, backend=None):
+        self.__dict__["_name"] = name
+        self.__dict__["_backend"] = backend
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+        self.__dict__["load_seconds"] = None # 실제 import 에 걸린 시간 (s)
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def load(self):
+        """모듈을 import 해서 반환합니다 (이미 했으면 바로 반환)."""
+        module = self._module
+        if module is not None:
+            return module
+        with self._lock:
+            if self._module is None:
+                t0 = time.perf_counter()
+                if self._backend is not None and self._name.split(".")[0] == "matplotlib":
+                    import matplotlib
+                    matplotlib.use(self._backend)
+                self.__dict__["_module"] = importlib.import_module(self._name)
+                self.__dict__["load_seconds"] = time.perf_counter() - t0
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self.load(), attr, value)
+
+    def __dir__(self):
+        return dir(self.load())
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_import(name, backend=None):
+    """
+    name 모듈의 LazyModule 을 반환합니다. 이미 import 된 모듈이면 그 모듈을 그대로 반환합니다.
+
+    Args:
+        name (str): 모듈 이름.
+        backend (str or None): matplotlib 백엔드 (matplotlib 계열만 해당).
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name, backend)
+
+
+def matplotlib_backend(interactive="TkAgg"):
+    """헤드리스면 "Agg", 아니면 interactive 백엔드 이름."""
+    return "Agg" if is_headless() else interactive
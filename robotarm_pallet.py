@@ -0,0 +1,208 @@
+# 트레이(팔레트) 격자 모델
+# files/show10.py 의 unitmove_lll 은 칸 번호(area 1~6)마다 if/elif 로 오프셋을 더했습니다.
+# TrayLayout 은 테이블 원점 + 행/열 + 간격으로 모든 칸의 사용자 좌표계 자세를
+# (테이블, 칸) 으로 바로 인덱싱되는 NumPy 배열에 한 번만 계산해 둡니다.
+#
+# 칸 번호는 행 우선입니다 (cols=3 이면 1 2 3 / 4 5 6). 기본값은 기존 show10.py 값과 같습니다.
+#   테이블 원점  1: (565, 0), 2: (0, 0), 3: (0, 475)
+#   간격 (-80, -80) → 2번 칸 x-80, 3번 칸 x-160, 4번 칸 y-80, 5번 칸 (-80, -80), 6번 칸 (-160, -80)
+#
+# 사용 예)
+#   tray = TrayLayout()
+#   x, y = tray.xy(1, 5)                   # O(1) 조회
+#   order = tray.optimize_transfer(1, 2, start_xy=(0, 0))   # 이동 거리가 가장 짧은 칸 순서
+
+import numpy as np
+
+DEFAULT_TABLE_ORIGINS = {1: (565.0, 0.0), 2: (0.0, 0.0), 3: (0.0, 475.0)}
+
+
+def solve_open_path(cost, start_cost):
+    """
+    모든 작업을 한 번씩 방문하는 순서 중 총비용이 가장 작은 것을 찾습니다 (끝점 자유, 비대칭 허용).
+
+    총비용 = start_cost[o0] + sum(cost[o_k, o_k+1])
+    작업 12개 이하는 Held-Karp 동적 계획법으로 정확히 풀고 (부분집합별로 NumPy 벡터화),
+    그보다 많으면 최근접 이웃으로 시작해 2-opt 로 개선합니다.
+
+    Args:
+        cost (np.ndarray): (n, n) 작업 i 다음에 작업 j 를 할 때의 비용.
+        start_cost (np.ndarray): (n,) 첫 작업까지의 비용.
+    Returns:
+        tuple: (order (list[int]), total_cost (float))
+    """
+    cost = np.asarray(cost, dtype=float)
+    start_cost = np.asarray(start_cost, dtype=float)
+    n = len(start_cost)
+    if n == 0:
+        return [], 0.0
+    if n <= 12:
+        return _held_karp(cost, start_cost)
+    order = _nearest_neighbour(cost, start_cost)
+    order = _two_opt(cost, start_cost, order)
+    return order, path_cost(cost, start_cost, order)
+
+
+def path_cost(cost, start_cost, order):
+    """order 순서로 작업할 때의 총비용."""
+    if len(order) == 0:
+        return 0.0
+    order = np.asarray(order)
+    return float(start_cost[order[0]] + cost[order[:-1], order[1:]].sum())
+
+
+def _held_karp(cost, start_cost):
+    n = len(start_cost)
+    full = 1 << n
+    best = np.full((full, n), np.inf) # best[mask, j]: mask 집합을 방문하고 j 에서 끝나는 최소 비용
+    parent = np.full((full, n), -1, dtype=np.int64)
+    for j in range(n):
+        best[1 << j, j] = start_cost[j]
+
+    bits = 1 << np.arange(n)
+    for mask in range(1, full):
+        row = best[mask]
+        if not np.isfinite(row).any():
+            continue
+        # 아직 방문하지 않은 k 로 확장: best[mask | k, k] = min_j row[j] + cost[j, k]
+        cand = row[:, None] + cost # (j, k)
+        j_best = np.argmin(cand, axis=0)
+        v_best = cand[j_best, np.arange(n)]
+        for k in np.nonzero((mask & bits) == 0)[0]:
+            m2 = mask | int(bits[k])
+            if v_best[k] < best[m2, k]:
+                best[m2, k] = v_best[k]
+                parent[m2, k] = j_best[k]
+
+    mask = full - 1
+    last = int(np.argmin(best[mask]))
+    total = float(best[mask, last])
+    order = []
+    while last >= 0:
+        order.append(last)
+        prev = int(parent[mask, last])
+        mask ^= 1 << last
+        last = prev
+    return order[::-1], total
+
+
+def _nearest_neighbour(cost, start_cost):
+    n = len(start_cost)
+    visited = np.zeros(n, dtype=bool)
+    cur = int(np.argmin(start_cost))
+    order = [cur]
+    visited[cur] = True
+    for _ in range(n - 1):
+        c = np.where(visited, np.inf, cost[cur])
+        cur = int(np.argmin(c))
+        order.append(cur)
+        visited[cur] = True
+    return order
+
+
+def _two_opt(cost, start_cost, order, max_rounds=50):
+    order = list(order)
+    best = path_cost(cost, start_cost, order)
+    n = len(order)
+    for _ in range(max_rounds):
+        improved = False
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                cand = order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+                c = path_cost(cost, start_cost, cand) # 비대칭 비용이므로 전체 다시 계산
+                if c < best - 1e-9:
+                    order, best, improved = cand, c, True
+        if not improved:
+            break
+    return order
+
+
+class TrayLayout:
+    """
+    테이블별 트레이 칸 위치 모델.
+
+    poses[table, area] = [x, y, z, rx, ry, rz] (사용자 좌표계, mm/deg).
+    테이블/칸 번호를 그대로 인덱스로 쓰도록 0 번 행/열은 NaN 으로 비워 둡니다.
+
+    Args:
+        table_origins (dict): {테이블 번호: (x, y)} 1번 칸 위치.
+        rows, cols (int): 테이블당 칸 행/열 수.
+        pitch (tuple): (열 간격 x, 행 간격 y) mm.
+        z (float): 칸 높이 (기준 높이 대비 mm).
+        rpy (tuple): 칸 자세 (rx, ry, rz) deg.
+    """
+
+    def __init__(self, table_origins=None, rows=2, cols=3, pitch=(-80.0, -80.0), z=0.0, rpy=(0.0, 0.0, 0.0)):
+        if table_origins is None:
+            table_origins = DEFAULT_TABLE_ORIGINS
+        self.rows = rows
+        self.cols = cols
+        self.n_slots = rows * cols
+        self.tables = sorted(table_origins)
+
+        # 칸별 (x, y) 오프셋: area k → 행 (k-1)//cols, 열 (k-1)%cols
+        k = np.arange(self.n_slots)
+        self.area_offset = np.full((self.n_slots + 1, 2), np.nan)
+        self.area_offset[1:, 0] = (k % cols) * pitch[0]
+        self.area_offset[1:, 1] = (k // cols) * pitch[1]
+
+        self.poses = np.full((max(self.tables) + 1, self.n_slots + 1, 6), np.nan)
+        for t in self.tables:
+            self.poses[t, 1:, :2] = np.asarray(table_origins[t], dtype=float) + self.area_offset[1:]
+            self.poses[t, 1:, 2] = z
+            self.poses[t, 1:, 3:] = rpy
+
+    def _check(self, table, area):
+        if table not in self.tables or not 1 <= area <= self.n_slots:
+            raise ValueError(f"없는 칸입니다: 테이블 {table}, 칸 {area}")
+
+    def xy(self, table, area):
+        """(테이블, 칸) 의 사용자 좌표계 (x, y). 배열 view 를 돌려줍니다."""
+        self._check(table, area)
+        return self.poses[table, area, :2]
+
+    def pose(self, table, area):
+        """(테이블, 칸) 의 사용자 좌표계 자세 [x, y, z, rx, ry, rz]."""
+        self._check(table, area)
+        return self.poses[table, area]
+
+    def xy_many(self, tables, areas):
+        """여러 칸의 (x, y) 를 한 번에 (N, 2). tables, areas 는 같은 길이의 배열."""
+        return self.poses[np.asarray(tables), np.asarray(areas), :2]
+
+    def travel(self, points_xy, start_xy=(0.0, 0.0)):
+        """start_xy 에서 points_xy 를 차례로 지나가는 총 수평 이동 거리 (mm)."""
+        pts = np.vstack((np.asarray(start_xy, dtype=float)[None], np.asarray(points_xy, dtype=float)))
+        return float(np.linalg.norm(np.diff(pts, axis=0), axis=1).sum())
+
+    def transfer_points(self, src, dst, areas):
+        """areas 순서로 src 칸에서 집어 dst 같은 칸에 놓을 때 방문하는 (2N, 2) 위치."""
+        areas = np.asarray(areas)
+        pts = np.empty((2 * len(areas), 2))
+        pts[0::2] = self.poses[src, areas, :2]
+        pts[1::2] = self.poses[dst, areas, :2]
+        return pts
+
+    def optimize_transfer(self, src, dst, start_xy=(0.0, 0.0), areas=None):
+        """
+        src 테이블의 각 칸 물건을 dst 테이블 같은 칸으로 옮길 때 총 수평 이동이 가장 짧은 칸 순서.
+
+        칸 하나의 집기→놓기 거리는 순서와 무관하므로, 놓은 칸 → 다음 집을 칸 거리만 최소화합니다.
+
+        Returns:
+            tuple: (areas 순서 (list[int]), 총 이동 거리 mm)
+        """
+        if areas is None:
+            areas = np.arange(1, self.n_slots + 1)
+        areas = np.asarray(areas)
+        pick = self.poses[src, areas, :2]
+        place = self.poses[dst, areas, :2]
+        cost = np.linalg.norm(place[:, None, :] - pick[None, :, :], axis=2) # 놓기 i → 집기 j
+        start_cost = np.linalg.norm(pick - np.asarray(start_xy, dtype=float), axis=1)
+        order, _ = solve_open_path(cost, start_cost)
+        ordered = [int(a) for a in areas[order]]
+        best = self.travel(self.transfer_points(src, dst, ordered), start_xy)
+        given = self.travel(self.transfer_points(src, dst, areas), start_xy)
+        if best >= given - 1e-6:
+            return [int(a) for a in areas], given # 같으면 원래 순서 유지
+        return ordered, best
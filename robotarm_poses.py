@@ -0,0 +1,255 @@
+# 자세 라이브러리 (이름 있는 자세를 바이너리 파일 하나에 저장)
+# point_start.txt / point_ready.txt / point_tcp.txt 처럼 자세마다 텍스트 파일을 두고 np.loadtxt 로 매번 다시 읽는 대신,
+# 이름 + 값 6개 + 메타데이터(종류, 좌표계, 툴, 저장 시각, 메모)를 고정 길이 레코드로 poses.bin 에 이어 씁니다.
+#
+# 파일 구성
+#   헤더 16 바이트: MAGIC(8) + 레코드 크기(uint32) + 예약(4)
+#   레코드 (POSE_DTYPE) 가 저장 순서대로 이어짐. 같은 이름을 다시 저장하면 뒤에 추가되고 마지막 레코드가 현재 값입니다.
+#   (이전 값은 history() 로 볼 수 있고, compact() 로 현재 값만 남겨 다시 쓸 수 있습니다.)
+#
+# - 불러오기: np.fromfile 한 번 + 이름 → 행 번호 dict → get() 은 O(1)
+# - 저장: 파일 끝에 레코드 1개만 추가 (파일 전체를 다시 쓰지 않음, 끊긴 마지막 조각은 덮어씀)
+# - 같은 프로세스 안에서는 load_library() 가 파일별로 한 번만 읽고, 파일이 바뀌었을 때만 다시 읽습니다.
+#
+# 사용 예)
+#   poses = load_library()                        # 기본 파일 poses.bin
+#   q = poses.get("start", txt="point_start.txt") # 라이브러리에 없으면 txt 를 한 번 가져와 저장 (이후 txt 는 읽지 않음)
+#   poses.put("start", joint, kind="joint")
+#   poses.get(robot_pose_name("192.168.0.23", "desk_3"))  # 로봇마다 다른 자세는 IP 를 붙인 이름으로 저장
+#   python set_robot_pose_set.py desk_3           # 현재 관절 값을 '<IP>:desk_3' 으로 저장
+#   python robotarm_poses.py                      # point_*.txt 를 라이브러리로 가져오고 목록 출력
+
+import os
+import sys
+import time
+import numpy as np
+
+POSE_LIBRARY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "poses.bin")
+
+MAGIC = b"RBPOSE01"
+HEADER_SIZE = 16
+
+# 자세 종류
+JOINT = "joint" # 관절 각도 (deg)
+TCP = "tcp"     # TCP / 직교 좌표 자세 (mm, deg)
+USER = "user"   # 사용자 좌표계 원점
+TOOL = "tool"   # 툴 TCP 오프셋 (set_tcp_info)
+
+POSE_DTYPE = np.dtype([
+    ("name", "U32"),
+    ("kind", "U8"),
+    ("values", "<f8", (6,)),
+    ("frame", "<i4"),   # 기준 좌표계 (rb.ReferenceFrame 값, -1: 해당 없음)
+    ("tool", "U16"),    # 툴 이름
+    ("stamp", "<f8"),   # 저장 시각 (time.time)
+    ("note", "U48"),
+])
+
+
+class PoseLibrary:
+    """
+    이름 있는 자세 저장소.
+
+    Args:
+        path (str): 라이브러리 파일 경로. 없으면 처음 put() 할 때 만듭니다.
+    """
+
+    def __init__(self, path=POSE_LIBRARY_FILE):
+        self.path = path
+        self.records = np.zeros(0, dtype=POSE_DTYPE)
+        self.index = {} # 이름 → 마지막 레코드 행 번호
+        self._signature = None
+        self.reload()
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def reload(self):
+        """파일 전체를 한 번 읽고 이름 색인을 다시 만듭니다."""
+        self._signature = self._file_signature()
+        if self._signature is None:
+            self.records = np.zeros(0, dtype=POSE_DTYPE)
+            self.index = {}
+            return self
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+            if header[:8] != MAGIC:
+                raise ValueError(f"{self.path} 는 자세 라이브러리 파일이 아닙니다.")
+            itemsize = int(np.frombuffer(header[8:12], dtype="<u4")[0])
+            if itemsize != POSE_DTYPE.itemsize:
+                raise ValueError(f"{self.path} 레코드 크기({itemsize})가 현재 형식({POSE_DTYPE.itemsize})과 다릅니다.")
+            # 쓰다가 끊긴 마지막 레코드 조각은 무시
+            count = (self._signature[1] - HEADER_SIZE) // itemsize
+            self.records = np.fromfile(f, dtype=POSE_DTYPE, count=count)
+        self.index = {str(name): i for i, name in enumerate(self.records["name"])}
+        return self
+
+    def is_stale(self):
+        """다른 프로세스가 파일을 바꿨으면 True."""
+        return self._file_signature() != self._signature
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def names(self):
+        """현재 저장된 자세 이름 목록 (저장 순서)."""
+        return sorted(self.index, key=self.index.get)
+
+    def record(self, name):
+        """이름의 현재 레코드 (np.void, 필드: name, kind, values, frame, tool, stamp, note)."""
+        return self.records[self.index[name]]
+
+    def get(self, name, default=None, txt=None, kind=JOINT):
+        """
+        이름의 값 6개 (np.ndarray 복사본) 를 반환합니다.
+
+        Args:
+            name (str): 자세 이름.
+            default: 없을 때 돌려줄 값. None 이고 txt 도 없으면 KeyError.
+            txt (str or None): 라이브러리에 없을 때 가져올 기존 point_*.txt 경로. 가져온 값은 저장됩니다.
+            kind (str): txt 에서 가져올 때 자세 종류.
+        """
+        row = self.index.get(name)
+        if row is not None:
+            return self.records["values"][row].copy()
+        if txt is not None and os.path.exists(txt):
+            return self.import_txt(name, txt, kind=kind)
+        if default is not None:
+            return np.asarray(default, dtype=float)
+        raise KeyError(f"자세 '{name}' 이(가) {self.path} 에 없습니다.")
+
+    def history(self, name):
+        """이름으로 저장된 모든 레코드 (오래된 순)."""
+        return self.records[self.records["name"] == name]
+
+    def put(self, name, values, kind=JOINT, frame=-1, tool="", note=""):
+        """
+        자세를 파일 끝에 레코드 1개로 추가합니다. 같은 이름이 있으면 새 값이 현재 값이 됩니다.
+
+        Args:
+            name (str): 자세 이름 (32자 이하).
+            values (array-like): 값 6개.
+            kind (str): JOINT / TCP / USER / TOOL.
+            frame (int): 기준 좌표계 번호 (rb.ReferenceFrame 값), 해당 없으면 -1.
+            tool (str): 툴 이름.
+            note (str): 메모.
+        Returns:
+            np.void: 저장한 레코드.
+        """
+        if not name or len(name) > POSE_DTYPE["name"].itemsize // 4:
+            raise ValueError(f"자세 이름은 1~{POSE_DTYPE['name'].itemsize // 4}자여야 합니다: {name!r}")
+        values = np.asarray(values, dtype=float).ravel()
+        if values.shape != (6,):
+            raise ValueError(f"자세 값은 6개여야 합니다: {values.shape}")
+        if self.is_stale():
+            self.reload()
+
+        rec = np.zeros(1, dtype=POSE_DTYPE)
+        rec["name"] = name
+        rec["kind"] = kind
+        rec["values"] = values
+        rec["frame"] = int(frame)
+        rec["tool"] = tool
+        rec["stamp"] = time.time()
+        rec["note"] = note
+
+        new_file = not os.path.exists(self.path)
+        with open(self.path, "wb" if new_file else "r+b") as f:
+            if new_file:
+                f.write(MAGIC + np.array([POSE_DTYPE.itemsize, 0], dtype="<u4").tobytes())
+            else:
+                # 쓰다가 끊긴 마지막 레코드 조각이 있으면 그 자리부터 덮어써서 레코드 경계를 맞춤
+                f.seek(HEADER_SIZE + len(self.records) * POSE_DTYPE.itemsize)
+            f.write(rec.tobytes())
+            f.truncate()
+
+        self.records = np.concatenate((self.records, rec))
+        self.index[name] = len(self.records) - 1
+        self._signature = self._file_signature()
+        return self.records[-1]
+
+    def import_txt(self, name, filename, kind=JOINT, note=None):
+        """기존 point_*.txt (값 6개 한 줄, 여러 줄이면 마지막 줄) 를 읽어 저장하고 값을 반환합니다."""
+        values = np.atleast_2d(np.loadtxt(filename))[-1]
+        self.put(name, values, kind=kind, note=os.path.basename(filename) if note is None else note)
+        return values.copy()
+
+    def compact(self):
+        """이름별 현재 레코드만 남겨 파일을 다시 씁니다 (이전 값 기록 삭제)."""
+        keep = self.records[sorted(self.index.values())]
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + np.array([POSE_DTYPE.itemsize, 0], dtype="<u4").tobytes())
+            f.write(keep.tobytes())
+        os.replace(tmp, self.path)
+        return self.reload()
+
+
+def robot_pose_name(robot_ip, name):
+    """
+    로봇별 자세 이름 '<robot_ip>:<name>' 을 만듭니다.
+
+    poses.bin 하나를 여러 로봇 스크립트가 같이 쓰므로, 로봇마다 티칭 값이 다른 자세(initiate, desk_N 등)는
+    IP 를 붙여 저장해야 다른 로봇의 값을 읽지 않습니다.
+
+    Raises:
+        ValueError: 이름이 레코드 이름 길이(32자)를 넘을 때.
+    """
+    full = f"{robot_ip}:{name}"
+    if len(full) > POSE_DTYPE["name"].itemsize // 4:
+        raise ValueError(f"자세 이름은 {POSE_DTYPE['name'].itemsize // 4}자 이하여야 합니다: {full!r}")
+    return full
+
+
+_LIBRARIES = {} # 절대 경로 → PoseLibrary (프로세스 안 캐시)
+
+
+def load_library(path=POSE_LIBRARY_FILE):
+    """
+    프로세스 안에서 파일별로 한 번만 읽은 PoseLibrary 를 반환합니다.
+    다른 프로세스가 파일을 바꿨으면 다시 읽습니다.
+    """
+    key = os.path.abspath(path)
+    lib = _LIBRARIES.get(key)
+    if lib is None:
+        lib = _LIBRARIES[key] = PoseLibrary(key)
+    elif lib.is_stale():
+        lib.reload()
+    return lib
+
+
+# ====== 기존 텍스트 파일 가져오기 ======
+
+# 라이브러리 이름 → (기존 txt 파일, 종류)
+LEGACY_TXT = {
+    "start": ("point_start.txt", JOINT),
+    "ready": ("point_ready.txt", JOINT),
+    "tool_tcp": ("point_tcp.txt", TOOL),
+}
+
+
+def _main():
+    lib = load_library(sys.argv[1] if len(sys.argv) > 1 else POSE_LIBRARY_FILE)
+    base = os.path.dirname(os.path.abspath(__file__))
+    for name, (filename, kind) in LEGACY_TXT.items():
+        path = os.path.join(base, filename)
+        if name not in lib and os.path.exists(path):
+            lib.import_txt(name, path, kind=kind)
+            print(f"가져옴: {filename} → '{name}'")
+
+    print(f"\n{lib.path} ({len(lib)}개)")
+    for name in lib.names():
+        r = lib.record(name)
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["stamp"]))
+        print(f"  {name:<16} {str(r['kind']):<6} {np.array2string(r['values'], precision=3)}  {stamp}  {r['note']}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,225 @@
+# 블렌딩 이동 프로그램 빌더 (move_pb)
+# 내려가기 / 올라가기 / 옆으로 이동을 각각 move_l_rel 로 보내면 경유점마다 속도가 0 이 됩니다.
+# BlendedPath 는 여러 경유점을 move_pb_add(..., rb.BlendingOption.Distance, 블렌딩 거리) 로 쌓아서
+# move_pb_run 한 번으로 실행하므로 모서리에서 멈추지 않고 돌아 나갑니다.
+# 그리퍼 동작처럼 반드시 멈춰야 하는 지점은 경로의 마지막 점(블렌딩 0)으로 둡니다.
+#
+# 좌표는 사용자 좌표계(set_user_coordinate 로 설정한 기준) 위의 (x, y, z) 오프셋으로 쓰고,
+# 기준 TCP 자세(get_tcp_info)와 사용자 좌표계 회전으로 베이스 좌표 점을 만듭니다.
+#
+# 사용 예)
+#   planner = TrayTransferPlanner(tcp_ref, frame_rpy=[0, 0, 0], speed=500, acc=500, lift=50, blend=20)
+#   path = planner.hop((0, 0), (-80, 0))         # 바닥 (0,0) → 올라가기 → 옆으로 → 내려가기
+#   print(path.estimate_time(), path.estimate_time_stop_and_go())
+#   path.run(robot, rc)
+
+import numpy as np
+from robotarm_kinematics import rpy_to_rotation
+
+
+def trapezoid_time(distance, vel, acc):
+    """
+    사다리꼴 속도 프로파일로 distance 를 이동하는 시간 (정지 → 정지).
+
+    가속 구간만으로 최고 속도에 못 미치면 삼각형 프로파일로 계산합니다.
+    numpy 배열을 넣으면 원소별로 계산합니다.
+
+    Args:
+        distance (float or np.ndarray): 이동 거리 (mm 또는 deg).
+        vel (float): 최고 속도.
+        acc (float): 가속도 (= 감속도).
+    Returns:
+        float or np.ndarray: 이동 시간 (s).
+    """
+    d = np.abs(np.asarray(distance, dtype=float))
+    d_ramp = vel * vel / acc # 최고 속도까지 가속 + 감속 거리
+    t = np.where(d >= d_ramp, d / vel + vel / acc, 2.0 * np.sqrt(d / acc))
+    return float(t) if t.ndim == 0 else t
+
+
+class BlendedPath:
+    """
+    move_pb 로 실행할 블렌딩 경로.
+
+    Args:
+        start (array-like): 시작 TCP 위치 (x, y, z) mm, 베이스 좌표.
+        rpy (array-like): 경로 전체에서 유지할 TCP 자세 (rx, ry, rz) deg.
+        speed (float): 기본 속도 (mm/s).
+        acc (float): 가속도 (mm/s^2), move_pb_run 에 전달.
+        blend (float): 기본 블렌딩 거리 (mm). 마지막 점은 항상 0 (정지).
+    """
+
+    def __init__(self, start, rpy, speed, acc, blend=20.0):
+        self.start = np.asarray(start, dtype=float)[:3].copy()
+        self.rpy = np.asarray(rpy, dtype=float)[:3].copy()
+        self.speed = speed
+        self.acc = acc
+        self.blend = blend
+        self._xyz = []
+        self._speed = []
+        self._blend = []
+
+    def add(self, xyz, speed=None, blend=None):
+        """베이스 좌표 경유점을 추가합니다. 직전 점과 같으면 무시합니다."""
+        xyz = np.asarray(xyz, dtype=float)[:3]
+        last = self._xyz[-1] if self._xyz else self.start
+        if np.allclose(xyz, last, atol=1e-6):
+            return self
+        self._xyz.append(xyz.copy())
+        self._speed.append(self.speed if speed is None else speed)
+        self._blend.append(self.blend if blend is None else blend)
+        return self
+
+    def __len__(self):
+        return len(self._xyz)
+
+    def points(self):
+        """move_pb_add 에 넘길 (N, 6) 점 배열 [x, y, z, rx, ry, rz]."""
+        if not self._xyz:
+            return np.zeros((0, 6))
+        xyz = np.array(self._xyz)
+        return np.hstack((xyz, np.broadcast_to(self.rpy, xyz.shape)))
+
+    def blend_values(self):
+        """점별 블렌딩 거리. 마지막 점은 0 (정지)."""
+        b = np.array(self._blend, dtype=float)
+        if b.size:
+            b[-1] = 0.0
+        return b
+
+    def _segments(self):
+        xyz = np.vstack((self.start, np.array(self._xyz))) if self._xyz else self.start[None]
+        return np.diff(xyz, axis=0)
+
+    def length(self):
+        return float(np.linalg.norm(self._segments(), axis=1).sum())
+
+    def estimate_time_stop_and_go(self, overhead=0.0):
+        """
+        경유점마다 멈추는 경우(구간별 move_l)의 예상 시간 (s).
+
+        Args:
+            overhead (float): 구간마다 더할 명령 전송/완료 확인 시간 (s).
+        """
+        seg = np.linalg.norm(self._segments(), axis=1)
+        if seg.size == 0:
+            return 0.0
+        speeds = np.array(self._speed, dtype=float)
+        return float(np.sum(trapezoid_time(seg, speeds, self.acc)) + overhead * seg.size)
+
+    def estimate_time(self):
+        """
+        블렌딩 경로의 예상 시간 (s).
+
+        모서리마다 블렌딩 거리 d 만큼 앞뒤 직선(2d)을 현 길이(2d·cos(θ/2), θ: 꺾이는 각)로 줄이고,
+        전체를 속도를 줄이지 않는 사다리꼴 프로파일 하나로 봅니다 (가장 느린 구간 속도 기준).
+        모서리에서 제어기가 감속하는 만큼은 반영하지 않으므로 하한에 가까운 추정입니다.
+        """
+        seg = self._segments()
+        n = len(seg)
+        if n == 0:
+            return 0.0
+        lengths = np.linalg.norm(seg, axis=1)
+        total = lengths.sum()
+        if n > 1:
+            u = seg / np.maximum(lengths, 1e-9)[:, None]
+            cos_turn = np.clip(np.sum(u[:-1] * u[1:], axis=1), -1.0, 1.0)
+            turn = np.arccos(cos_turn)
+            # 블렌딩 거리는 양쪽 구간 길이의 절반을 넘을 수 없음
+            d = np.minimum(np.array(self._blend[:-1], dtype=float),
+                           0.5 * np.minimum(lengths[:-1], lengths[1:]))
+            total -= np.sum(2.0 * d * (1.0 - np.cos(turn / 2.0)))
+        return float(trapezoid_time(total, min(self._speed), self.acc))
+
+    def run(self, robot, rc, start_timeout=0.5):
+        """
+        move_pb_clear → move_pb_add × N → move_pb_run 으로 실행하고 완료까지 기다립니다.
+
+        Returns:
+            bool: 이동 완료를 확인했으면 True.
+        """
+        import rbpodo as rb # 오프라인 추정(estimate_time)만 쓸 때는 rbpodo 불필요
+
+        if not self._xyz:
+            return True
+        robot.move_pb_clear(rc)
+        for point, speed, blend in zip(self.points(), self._speed, self.blend_values()):
+            robot.move_pb_add(rc, point, speed, rb.BlendingOption.Distance, blend)
+        robot.move_pb_run(rc, self.acc, rb.MovePBOption.Intended)
+        robot.flush(rc)
+        rc.error().throw_if_not_empty()
+        if robot.wait_for_move_started(rc, start_timeout).is_success():
+            robot.wait_for_move_finished(rc)
+            rc.error().throw_if_not_empty()
+            return True
+        return False
+
+
+class TrayTransferPlanner:
+    """
+    트레이 칸 사이 이동(올라가기 → 옆으로 → 내려가기)을 블렌딩 경로로 만드는 도구.
+
+    칸 좌표는 사용자 좌표계 위의 (x, y) mm 오프셋이며, (0, 0) 위쪽이 기준 TCP(tcp_ref) 입니다.
+    바닥(집기/놓기 높이)은 기준 높이에서 사용자 좌표계 z 방향으로 lift 만큼 아래입니다.
+
+    Args:
+        tcp_ref (array-like): 기준 TCP 자세 [x, y, z, rx, ry, rz] (get_tcp_info 값).
+        frame_rpy (array-like): 사용자 좌표계 회전 (rx, ry, rz) deg. 베이스와 같으면 0.
+        speed (float): 이동 속도 (mm/s).
+        acc (float): 가속도 (mm/s^2).
+        lift (float): 올라가기/내려가기 거리 (mm).
+        blend (float): 모서리 블렌딩 거리 (mm).
+    """
+
+    def __init__(self, tcp_ref, frame_rpy=(0.0, 0.0, 0.0), speed=500.0, acc=500.0, lift=50.0, blend=20.0):
+        tcp_ref = np.asarray(tcp_ref, dtype=float).ravel()
+        self.origin = tcp_ref[:3].copy()
+        self.rpy = tcp_ref[3:6].copy()
+        self.R = rpy_to_rotation(frame_rpy, degrees=True)
+        self.speed = speed
+        self.acc = acc
+        self.lift = lift
+        self.blend = blend
+
+    def to_base(self, x, y, z):
+        """사용자 좌표계 오프셋 (x, y, z) → 베이스 좌표 위치."""
+        return self.origin + self.R @ np.array([x, y, z], dtype=float)
+
+    def hop(self, from_xy, to_xy, from_bottom=True):
+        """
+        from_xy 칸에서 to_xy 칸 바닥까지 가는 블렌딩 경로.
+
+        Args:
+            from_xy, to_xy (tuple): 칸 좌표 (x, y) mm.
+            from_bottom (bool): 시작 위치가 바닥이면 True (먼저 올라감), 위쪽이면 False.
+        """
+        fx, fy = from_xy
+        tx, ty = to_xy
+        start = self.to_base(fx, fy, -self.lift if from_bottom else 0.0)
+        path = BlendedPath(start, self.rpy, self.speed, self.acc, self.blend)
+        path.add(self.to_base(fx, fy, 0.0))  # 올라가기 (from_bottom=False 면 시작점과 같아서 생략)
+        path.add(self.to_base(tx, ty, 0.0))  # 옆으로
+        path.add(self.to_base(tx, ty, -self.lift)) # 내려가기 (정지)
+        return path
+
+    def estimate_sequence(self, slots_xy, grip_time=0.1, overhead=0.0, start_xy=(0.0, 0.0)):
+        """
+        칸 순서대로 집기/놓기를 반복할 때의 예상 시간 (s).
+
+        Args:
+            slots_xy (array-like): (N, 2) 방문할 칸 좌표.
+            grip_time (float): 칸마다 그리퍼 동작 시간 (s).
+            overhead (float): 구간별 이동 명령당 추가 시간 (s), stop-and-go 추정에만 사용.
+            start_xy (tuple): 시작 위치 (위쪽).
+        Returns:
+            dict: blended (블렌딩 경로), stop_and_go (구간별 정지 이동), saved (차이), hops (경로 수).
+        """
+        blended = stop_go = 0.0
+        prev, from_bottom = tuple(start_xy), False
+        for xy in np.asarray(slots_xy, dtype=float):
+            path = self.hop(prev, tuple(xy), from_bottom)
+            blended += path.estimate_time() + grip_time
+            stop_go += path.estimate_time_stop_and_go(overhead) + grip_time
+            prev, from_bottom = tuple(xy), True
+        return {"blended": blended, "stop_and_go": stop_go, "saved": stop_go - blended,
+                "hops": len(slots_xy)}
@@ -0,0 +1,199 @@
+# 카메라 프레임 + 로봇 상태 동기 기록 모듈 (메모리 맵 파일)
+# 핸드-아이 캘리브레이션 / 불량 리뷰용으로 모든 카메라 프레임을 촬영 시점의 관절/TCP 값과 함께 저장합니다.
+#
+# 기록 폴더 구성 (모두 .npy, np.load(..., mmap_mode='r') 로 바로 열림)
+#   frames.npy        (max_frames, H, W, C) uint8   미리 할당한 프레임 파일
+#   frame_stamp.npy   (max_frames,)                  프레임 촬영 시각 (time.monotonic)
+#   frame_seq.npy     (max_frames,)                  FrameGrabber 시퀀스 번호 (건너뛴 번호 = 놓친 프레임)
+#   sample_stamp.npy  (max_samples,)                 관절 샘플 수신 시각 (time.monotonic)
+#   robot_time.npy    (max_samples,)                 제어기 타이머
+#   q.npy             (max_samples, 6)               지령 관절 각도 (deg)
+#   tcp.npy           (max_samples, 6)               지령 TCP (mm, deg)
+#   frame_sample.npy  (n_frames,)                    프레임별 가장 가까운 관절 샘플 인덱스 (close 시 생성)
+#   meta.json                                        실제 기록 개수 등
+#
+# 사용 예)
+#   rec = SessionRecorder("recordings/run1", max_seconds=60)
+#   grabber = FrameGrabber(indices=(2, 0), on_frame=rec.write_frame)
+#   if grabber.open():
+#       rec.allocate_frames(grabber.frame_shape)
+#   ...  stream_telemetry(..., on_sample=rec.write_sample)
+#   rec.close()
+#   session = load_session("recordings/run1")
+
+import os
+import json
+import time
+import numpy as np
+
+
+def nearest_indices(ref_stamps, query_stamps):
+    """
+    query_stamps 각각에 대해 ref_stamps(오름차순)에서 가장 가까운 인덱스를 구합니다.
+
+    Args:
+        ref_stamps (np.ndarray): (N,) 오름차순 시각.
+        query_stamps (np.ndarray): (M,) 시각.
+
+    Returns:
+        np.ndarray: (M,) 인덱스. ref_stamps 가 비어 있으면 전부 -1.
+    """
+    query_stamps = np.asarray(query_stamps, dtype=float)
+    n = len(ref_stamps)
+    if n == 0:
+        return np.full(len(query_stamps), -1, dtype=np.int64)
+    j = np.searchsorted(ref_stamps, query_stamps)
+    lo = np.clip(j - 1, 0, n - 1)
+    hi = np.clip(j, 0, n - 1)
+    pick_hi = np.abs(ref_stamps[hi] - query_stamps) < np.abs(query_stamps - ref_stamps[lo])
+    return np.where(pick_hi, hi, lo).astype(np.int64)
+
+
+class SessionRecorder:
+    """
+    프레임과 관절 샘플을 각각 미리 할당한 메모리 맵 파일에 이어 쓰는 기록기.
+
+    write_frame() 은 카메라 캡처 스레드에서, write_sample() 은 asyncio 루프에서 호출되며
+    각자 자기 파일만 쓰므로 잠금이 필요 없습니다. 기록 중에는 파일 크기를 늘리지 않고
+    (미리 할당) 복사 한 번만 하므로 640x480 30 FPS 에서도 제어 루프를 막지 않습니다.
+    미리 할당한 크기를 넘으면 더 기록하지 않고 overflow 로 셉니다.
+    할당한 해상도/dtype 과 다른 프레임(카메라 전환 등)은 기록하지 않고 frame_mismatch 로 셉니다.
+
+    Args:
+        path (str): 기록 폴더.
+        max_seconds (float): 최대 기록 시간 (s). max_frames/max_samples 계산에 사용.
+        fps (float): 예상 카메라 FPS.
+        sample_hz (float): 예상 관절 샘플 주기 (Hz).
+        num_axes (int): 관절 수.
+    """
+
+    def __init__(self, path, max_seconds=60.0, fps=30.0, sample_hz=100.0, num_axes=6):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.max_frames = int(max_seconds * fps) + 1
+        self.max_samples = int(max_seconds * sample_hz * 1.2) + 1 # 주기 흔들림 여유 20%
+
+        open_mm = np.lib.format.open_memmap
+        self.sample_stamp = open_mm(self._file("sample_stamp"), mode="w+", dtype=np.float64, shape=(self.max_samples,))
+        self.robot_time = open_mm(self._file("robot_time"), mode="w+", dtype=np.float64, shape=(self.max_samples,))
+        self.q = open_mm(self._file("q"), mode="w+", dtype=np.float64, shape=(self.max_samples, num_axes))
+        self.tcp = open_mm(self._file("tcp"), mode="w+", dtype=np.float64, shape=(self.max_samples, 6))
+
+        self.frames = None
+        self.frame_stamp = None
+        self.frame_seq = None
+
+        self.n_frames = 0
+        self.n_samples = 0
+        self.frame_overflow = 0
+        self.sample_overflow = 0
+        self.frame_mismatch = 0
+        self.frame_write_time = 0.0 # write_frame 누적 시간 (s)
+        self.closed = False
+
+    def _file(self, name):
+        return os.path.join(self.path, name + ".npy")
+
+    def allocate_frames(self, frame_shape, dtype=np.uint8):
+        """카메라 해상도가 정해진 뒤 프레임 파일을 미리 할당합니다. (H, W, C)"""
+        open_mm = np.lib.format.open_memmap
+        self.frames = open_mm(self._file("frames"), mode="w+", dtype=dtype,
+                              shape=(self.max_frames,) + tuple(frame_shape))
+        self.frame_stamp = open_mm(self._file("frame_stamp"), mode="w+", dtype=np.float64, shape=(self.max_frames,))
+        self.frame_seq = open_mm(self._file("frame_seq"), mode="w+", dtype=np.int64, shape=(self.max_frames,))
+
+    def write_frame(self, frame, stamp, seq):
+        """프레임 1장을 기록합니다. FrameGrabber(on_frame=...) 로 캡처 스레드에서 호출됩니다."""
+        if self.frames is None or self.closed:
+            return
+        i = self.n_frames
+        if i >= self.max_frames:
+            self.frame_overflow += 1
+            return
+        if frame.shape != self.frames.shape[1:] or frame.dtype != self.frames.dtype:
+            # 캡처 스레드에서 예외를 내면 캡처가 멈추므로 건너뛰고 셉니다.
+            self.frame_mismatch += 1
+            return
+        t0 = time.perf_counter()
+        self.frames[i] = frame
+        self.frame_stamp[i] = stamp
+        self.frame_seq[i] = seq
+        self.n_frames = i + 1 # 행을 다 쓴 뒤에 공개
+        self.frame_write_time += time.perf_counter() - t0
+
+    def write_sample(self, ring):
+        """
+        TelemetryRing 의 최신 샘플을 기록합니다. stream_telemetry(on_sample=...) 에 그대로 넘길 수 있습니다.
+        """
+        i_ring = ring.latest_index()
+        if i_ring < 0 or self.closed:
+            return
+        i = self.n_samples
+        if i >= self.max_samples:
+            self.sample_overflow += 1
+            return
+        self.sample_stamp[i] = ring.stamp[i_ring]
+        self.robot_time[i] = ring.robot_time[i_ring]
+        self.q[i] = ring.q[i_ring]
+        self.tcp[i] = ring.tcp[i_ring]
+        self.n_samples = i + 1
+
+    def stats(self):
+        frame_ms = self.frame_write_time / self.n_frames * 1000.0 if self.n_frames else 0.0
+        missed = 0
+        if self.n_frames > 1:
+            seq = self.frame_seq[:self.n_frames]
+            missed = int(seq[-1] - seq[0] + 1 - self.n_frames)
+        return {"frames": self.n_frames, "samples": self.n_samples, "missed_frames": missed,
+                "frame_overflow": self.frame_overflow, "sample_overflow": self.sample_overflow,
+                "frame_mismatch": self.frame_mismatch,
+                "frame_write_ms": round(frame_ms, 3)}
+
+    def close(self):
+        """프레임-샘플 정렬 인덱스와 meta.json 을 쓰고 파일을 닫습니다."""
+        if self.closed:
+            return
+        self.closed = True
+
+        n_f, n_s = self.n_frames, self.n_samples
+        if self.frames is not None:
+            idx = nearest_indices(self.sample_stamp[:n_s], self.frame_stamp[:n_f])
+            np.save(self._file("frame_sample"), idx)
+            self.frames.flush()
+            self.frame_stamp.flush()
+            self.frame_seq.flush()
+        for arr in (self.sample_stamp, self.robot_time, self.q, self.tcp):
+            arr.flush()
+
+        meta = self.stats()
+        meta["frame_shape"] = list(self.frames.shape[1:]) if self.frames is not None else None
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+
+def load_session(path):
+    """
+    SessionRecorder 로 기록한 폴더를 읽기 전용 메모리 맵으로 엽니다.
+
+    Returns:
+        dict: 실제 기록 개수만큼 자른 배열들과 meta.
+              프레임 k 의 관절 값은 session["q"][session["frame_sample"][k]].
+    """
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+
+    def load(name, n):
+        return np.load(os.path.join(path, name + ".npy"), mmap_mode="r")[:n]
+
+    n_f, n_s = meta["frames"], meta["samples"]
+    session = {"meta": meta,
+               "sample_stamp": load("sample_stamp", n_s),
+               "robot_time": load("robot_time", n_s),
+               "q": load("q", n_s),
+               "tcp": load("tcp", n_s)}
+    if meta["frame_shape"] is not None:
+        session["frames"] = load("frames", n_f)
+        session["frame_stamp"] = load("frame_stamp", n_f)
+        session["frame_seq"] = load("frame_seq", n_f)
+        session["frame_sample"] = np.load(os.path.join(path, "frame_sample.npy"))
+    return session
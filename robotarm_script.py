@@ -0,0 +1,620 @@
+# 로봇 스크립트 소켓(포트 5000) 클라이언트
+# 기존 send_command / wait_for_motion 은 recv(1024).decode() 후 "info[motion_changed][0]" 문자열 포함 여부만 봐서
+# 1) 메시지가 두 번의 recv 로 나뉘어 오면 놓치고
+# 2) 명령 응답(ack)과 비동기 info 이벤트가 섞이며
+# 3) 이전 이동의 motion_changed[0] 을 이번 이동 완료로 착각할 수 있었습니다.
+#
+# ScriptFramer 는 미리 할당한 bytearray 에 recv_into 로 받아서 그 자리에서 메시지 경계를 찾고,
+# ScriptClient 는 메시지를 ack / info / warn / error 로 나눠 각자의 큐에 넣고
+# motion_changed 이벤트를 카운터로 세어서 "이 명령 이후에 시작된 이동"의 완료를 정확히 판단합니다.
+# ScriptPipeline 은 여러 이동 명령을 미리 보내 두고(최대 window 개) 명령별 완료/지연을 추적합니다.
+#
+# 사용 예)
+#   script = ScriptClient(ROBOT_IP)
+#   if script.connect():
+#       ok = script.move("move_l_rel(pnt[0, 0, -50, 0, 0, 0], 500, 500, 2)", timeout=10.0)
+#       # 또는 나눠서: mark = script.motion_mark(); script.request(cmd); script.wait_motion(mark)
+#
+#   pipeline = ScriptPipeline(script, window=2)
+#   pipeline.submit("move_l_rel(...)"); pipeline.submit("move_l_rel(...)")
+#   pipeline.drain(); print(pipeline.format_stats())
+
+import re
+import time
+import socket
+from collections import deque
+import numpy as np
+
+# 이벤트 종류
+ACK = "ack"       # 명령 응답 (태그 없는 메시지)
+INFO = "info"     # info[category][value]
+WARN = "warn"     # warn[category][value]
+ERROR = "error"   # error[category][value]
+
+_DELIM_RE = re.compile(rb"[\r\n\0]")
+_TAG_START_RE = re.compile(rb"(?:info|warn|error)\[")
+_TAG_RE = re.compile(rb"(info|warn|error)\[([^\]\r\n\0]*)\](?:\[([^\]\r\n\0]*)\])?")
+_SKIP = frozenset(b"\r\n\0 \t")
+
+
+class ScriptError(RuntimeError):
+    """제어기가 error[...] 메시지를 보냈을 때 발생합니다."""
+
+    def __init__(self, event):
+        super().__init__(event.raw)
+        self.event = event
+
+
+class ScriptEvent:
+    """
+    스크립트 소켓에서 받은 메시지 1개.
+
+    Attributes:
+        kind (str): ACK / INFO / WARN / ERROR.
+        category (str): info[motion_changed][0] 이면 "motion_changed". ACK 는 "".
+        value (str): info[motion_changed][0] 이면 "0". ACK 는 메시지 전체.
+        raw (str): 원본 메시지.
+        stamp (float): 파싱된 시각 (time.monotonic).
+    """
+    __slots__ = ("kind", "category", "value", "raw", "stamp")
+
+    def __init__(self, kind, category, value, raw, stamp):
+        self.kind = kind
+        self.category = category
+        self.value = value
+        self.raw = raw
+        self.stamp = stamp
+
+    def int_value(self, default=None):
+        try:
+            return int(self.value)
+        except ValueError:
+            return default
+
+    def __repr__(self):
+        return f"ScriptEvent({self.kind}, {self.raw!r})"
+
+
+class ScriptFramer:
+    """
+    스트리밍 메시지 분리기.
+
+    수신 데이터는 미리 할당한 bytearray 뒤쪽에 recv_into 로 바로 들어가고,
+    메시지 경계는 버퍼 위에서 정규식(pos/endpos)으로 찾으므로 메시지 단위 복사가 없습니다.
+    (category/value 같은 짧은 필드만 decode 합니다.)
+
+    메시지 경계
+      - 구분자 \\r, \\n, \\0
+      - info/warn/error 태그 메시지는 두 번째 대괄호가 닫히는 곳 (구분자가 없어도 분리)
+      - 태그 없는 메시지(ack)는 다음 구분자 또는 다음 태그 시작 직전
+    """
+
+    def __init__(self, size=65536):
+        self.buf = bytearray(size)
+        self.view = memoryview(self.buf)
+        self.start = 0 # 아직 처리하지 않은 첫 바이트
+        self.end = 0   # 받은 데이터 끝
+
+    def _reserve(self, n):
+        """뒤쪽에 n 바이트 이상 빈 공간을 만듭니다. 처리 안 된 조각만 앞으로 옮깁니다."""
+        if len(self.buf) - self.end >= n:
+            return
+        pending = self.end - self.start
+        if self.start > 0:
+            self.buf[:pending] = self.buf[self.start:self.end]
+            self.start, self.end = 0, pending
+        if len(self.buf) - self.end < n:
+            self.view.release()
+            self.buf.extend(bytes(max(n, len(self.buf))))
+            self.view = memoryview(self.buf)
+
+    def recv_from(self, sock, min_space=4096):
+        """소켓에서 버퍼 뒤쪽으로 바로 받습니다. 받은 바이트 수를 반환 (0 이면 연결 종료)."""
+        self._reserve(min_space)
+        n = sock.recv_into(self.view[self.end:])
+        self.end += n
+        return n
+
+    def feed(self, data):
+        """이미 받은 bytes 를 추가합니다. (에뮬레이터/오프라인 확인용)"""
+        self._reserve(len(data))
+        self.buf[self.end:self.end + len(data)] = data
+        self.end += len(data)
+
+    def pending(self):
+        """완성되지 않은 조각의 길이."""
+        return self.end - self.start
+
+    def _event(self, start, stop, now):
+        buf = self.buf
+        m = _TAG_RE.match(buf, start, stop)
+        if m is not None and m.end() == stop:
+            kind = m.group(1).decode()
+            value = m.group(3)
+            return ScriptEvent(kind, m.group(2).decode(errors="replace"),
+                               value.decode(errors="replace") if value is not None else "",
+                               buf[start:stop].decode(errors="replace"), now)
+        raw = buf[start:stop].decode(errors="replace").strip()
+        return ScriptEvent(ACK, "", raw, raw, now)
+
+    def next_event(self, now=None):
+        """완성된 메시지가 있으면 ScriptEvent 를, 없으면 None 을 반환합니다."""
+        buf = self.buf
+        pos, end = self.start, self.end
+        while pos < end and buf[pos] in _SKIP:
+            pos += 1
+        self.start = pos
+        if pos == end:
+            self.start = self.end = 0 # 다 처리했으면 버퍼 처음부터 다시 사용
+            return None
+        if now is None:
+            now = time.monotonic()
+
+        m = _TAG_RE.match(buf, pos, end)
+        if m is not None:
+            stop = m.end()
+            if m.group(3) is None and (stop == end or buf[stop] == 0x5B): # '['
+                # info[category] 뒤에 [value] 가 이어질 수 있으므로 다음 바이트를 기다림
+                d = _DELIM_RE.search(buf, pos, end)
+                if d is None:
+                    return None
+                stop = d.start()
+            self.start = stop
+            return self._event(pos, stop, now)
+
+        d = _DELIM_RE.search(buf, pos, end)
+        if _TAG_START_RE.match(buf, pos, end) is not None:
+            # 태그가 아직 덜 들어왔음 (구분자가 먼저 나오면 깨진 메시지로 보고 잘라냄)
+            if d is None:
+                return None
+            self.start = d.start()
+            return self._event(pos, d.start(), now)
+
+        t = _TAG_START_RE.search(buf, pos + 1, end)
+        stop = min(x.start() for x in (d, t) if x is not None) if (d or t) else -1
+        if stop < 0:
+            return None
+        self.start = stop
+        return self._event(pos, stop, now)
+
+    def flush_pending(self, now=None):
+        """구분자 없이 멈춘 조각을 메시지 하나로 내보냅니다. 조각이 없으면 None."""
+        if self.pending() == 0:
+            return None
+        ev = self._event(self.start, self.end, time.monotonic() if now is None else now)
+        self.start = self.end = 0
+        return ev
+
+
+class ScriptClient:
+    """
+    스크립트 소켓 클라이언트 (동기).
+
+    받은 메시지는 종류별 큐(acks, infos, warns, errors)에 쌓이고 (각 maxlen 개까지),
+    motion_changed 이벤트는 motion_state / motion_started / motion_finished 카운터로도 셉니다.
+    명령 응답은 보낸 순서대로 온다고 보고 k 번째 ack 를 k 번째 명령의 응답으로 매칭합니다.
+
+    Args:
+        ip (str): 로봇 IP.
+        port (int): 스크립트 포트.
+        timeout (float): 기본 대기 시간 (s).
+        idle_flush (float): 구분자 없는 조각을 이 시간(s) 동안 새 데이터가 없으면 메시지로 처리.
+        maxlen (int): 종류별 이벤트 큐 길이.
+    """
+
+    def __init__(self, ip, port=5000, timeout=10.0, idle_flush=0.05, maxlen=256):
+        self.ip = ip
+        self.port = port
+        self.timeout = timeout
+        self.idle_flush = idle_flush
+        self.sock = None
+        self.framer = ScriptFramer()
+
+        self.acks = deque(maxlen=maxlen)
+        self.infos = deque(maxlen=maxlen)
+        self.warns = deque(maxlen=maxlen)
+        self.errors = deque(maxlen=maxlen)
+
+        self.sent = 0             # 보낸 명령 수
+        self.acked = 0            # 받은 ack 수
+        self.error_count = 0      # 받은 error 수
+        self.motion_state = 0     # 마지막 motion_changed 값 (0 = 정지)
+        self.motion_started = 0   # motion_changed[X>0] 수신 횟수
+        self.motion_finished = 0  # motion_changed[0] 수신 횟수
+        self._finished_at_start = 0 # 마지막 시작 이벤트 시점의 motion_finished
+        self.on_event = None      # 이벤트마다 on_event(ev) 호출 (선택)
+        self._last_rx = 0.0
+
+    # ------ 연결 ------
+    def connect(self):
+        try:
+            self.sock = socket.create_connection((self.ip, self.port), timeout=self.timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return True
+        except OSError as e:
+            print(f"로봇 스크립트 서버 소켓 연결 실패: {e}")
+            self.sock = None
+            return False
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    @property
+    def connected(self):
+        return self.sock is not None
+
+    # ------ 수신 ------
+    def _dispatch(self, ev):
+        if ev.kind == ACK:
+            self.acks.append(ev)
+            self.acked += 1
+        elif ev.kind == INFO:
+            self.infos.append(ev)
+            if ev.category == "motion_changed":
+                v = ev.int_value(0)
+                self.motion_state = v
+                if v == 0:
+                    self.motion_finished += 1
+                else:
+                    self.motion_started += 1
+                    self._finished_at_start = self.motion_finished
+        elif ev.kind == WARN:
+            self.warns.append(ev)
+        else:
+            self.errors.append(ev)
+            self.error_count += 1
+        if self.on_event is not None:
+            self.on_event(ev)
+
+    def drain(self):
+        """버퍼에 이미 들어온 완성 메시지를 모두 처리합니다. 처리한 개수를 반환."""
+        n = 0
+        now = time.monotonic()
+        while True:
+            ev = self.framer.next_event(now)
+            if ev is None:
+                return n
+            self._dispatch(ev)
+            n += 1
+
+    def poll(self, timeout=0.0):
+        """
+        recv 를 한 번 해서 들어온 메시지를 처리합니다. 처리한 메시지 수를 반환.
+
+        Raises:
+            ConnectionError: 제어기가 연결을 끊은 경우.
+        """
+        if self.sock is None:
+            raise ConnectionError("스크립트 소켓이 연결되지 않았습니다.")
+        self.sock.settimeout(max(timeout, 0.0))
+        try:
+            n = self.framer.recv_from(self.sock)
+        except (socket.timeout, BlockingIOError):
+            n = -1
+        finally:
+            # timeout 0 은 소켓을 논블로킹으로 바꾸므로, 그대로 두면 send() 의 sendall 이 BlockingIOError 를 낼 수 있음
+            self.sock.settimeout(self.timeout)
+        now = time.monotonic()
+        if n == 0:
+            raise ConnectionError("로봇 스크립트 서버가 연결을 끊었습니다.")
+        if n > 0:
+            self._last_rx = now
+        count = self.drain()
+        if n < 0 and self.framer.pending() and now - self._last_rx >= self.idle_flush:
+            self._dispatch(self.framer.flush_pending(now))
+            count += 1
+        return count
+
+    def wait_until(self, cond, timeout=None, error_mark=None):
+        """
+        cond() 가 True 가 될 때까지 수신합니다. 타임아웃이면 False.
+
+        이미 버퍼에 들어온 메시지로 조건이 맞으면 recv 없이 바로 반환합니다.
+        error_mark 이후 error 메시지가 오면 ScriptError 를 발생시킵니다.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if error_mark is None:
+            error_mark = self.error_count
+        deadline = time.monotonic() + timeout
+        while True:
+            self.drain()
+            if self.error_count > error_mark:
+                raise ScriptError(self.errors[-1])
+            if cond():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self.framer.pending():
+                remaining = min(remaining, self.idle_flush)
+            self.poll(remaining)
+
+    # ------ 송신 ------
+    def send(self, command):
+        """명령을 보내고 명령 번호(1부터)를 반환합니다. 응답은 기다리지 않습니다."""
+        if self.sock is None:
+            raise ConnectionError("스크립트 소켓이 연결되지 않았습니다.")
+        self.sock.sendall(command.encode())
+        self.sent += 1
+        return self.sent
+
+    def wait_ack(self, cmd_no, timeout=None, error_mark=None):
+        """cmd_no 번째 명령의 ack 를 기다립니다. 타임아웃이면 None."""
+        if not self.wait_until(lambda: self.acked >= cmd_no, timeout, error_mark):
+            return None
+        back = self.acked - cmd_no # 최근 ack 에서 몇 개 전인지
+        return self.acks[-1 - back] if back < len(self.acks) else None
+
+    def request(self, command, timeout=None):
+        """명령을 보내고 그 명령의 ack(ScriptEvent)를 반환합니다. 타임아웃이면 None."""
+        error_mark = self.error_count
+        cmd_no = self.send(command)
+        return self.wait_ack(cmd_no, timeout, error_mark)
+
+    def motion_mark(self):
+        """
+        이동 명령을 보내기 직전에 호출해서 wait_motion() 에 넘길 표시를 받습니다.
+
+        이미 소켓에 도착해 있던 이전 이동의 이벤트를 먼저 반영하므로
+        예전 motion_changed[0] 을 이번 이동의 완료로 착각하지 않습니다.
+        """
+        if self.sock is not None:
+            self.poll(0.0)
+        return self.motion_started
+
+    def wait_motion(self, mark, timeout=None, start_timeout=0.5, error_mark=None):
+        """
+        mark 이후에 시작된 이동(motion_changed[X>0])이 끝날(motion_changed[0]) 때까지 기다립니다.
+
+        Args:
+            mark (int): motion_mark() 반환값.
+            timeout (float or None): 전체 대기 시간 (s).
+            start_timeout (float): 이 시간 안에 이동이 시작되지 않으면 False
+                (rbpodo wait_for_move_started(rc, 0.5) 와 같은 의미).
+        Returns:
+            bool: 이동 완료를 확인했으면 True.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        t0 = time.monotonic()
+        if not self.wait_until(lambda: self.motion_started > mark, min(start_timeout, timeout), error_mark):
+            return False
+        remaining = timeout - (time.monotonic() - t0)
+        return self.wait_until(lambda: self.motion_finished > self._finished_at_start, remaining, error_mark)
+
+    def move(self, command, timeout=None, start_timeout=0.5):
+        """이동 명령을 보내고 그 이동이 끝날 때까지 기다립니다. 완료되면 True."""
+        mark = self.motion_mark()
+        error_mark = self.error_count
+        self.send(command)
+        return self.wait_motion(mark, timeout, start_timeout, error_mark)
+
+
+class PipelineCommand:
+    """
+    ScriptPipeline 에 넣은 명령 1개와 그 시각 기록 (time.monotonic, s).
+
+    t_submit: submit 호출, t_sent: 소켓 전송, t_ack: ack 수신,
+    t_start: 이동 시작 이벤트, t_done: 완료 (이동은 motion_changed[0], 그 외는 ack),
+    gap: 이전 이동이 끝나고 이 이동이 시작되기까지의 공백 (이동 명령만).
+    """
+    __slots__ = ("no", "command", "motion", "tag", "t_submit", "t_sent", "t_ack", "t_start", "t_done", "gap", "ok")
+
+    def __init__(self, command, motion, tag, t_submit):
+        self.no = 0
+        self.command = command
+        self.motion = motion
+        self.tag = tag
+        self.t_submit = t_submit
+        self.t_sent = self.t_ack = self.t_start = self.t_done = self.gap = None
+        self.ok = None # True: 완료, False: 오류로 취소, None: 진행 중
+
+    @property
+    def done(self):
+        return self.ok is not None
+
+    def __repr__(self):
+        return f"PipelineCommand(#{self.no}, {self.command!r}, ok={self.ok})"
+
+
+class ScriptPipeline:
+    """
+    스크립트 명령 파이프라인.
+
+    이동 명령을 보내고 끝날 때까지 기다린 뒤 다음 명령을 만드는 대신,
+    최대 window 개까지 명령을 미리 보내 두어 제어기가 다음 구간을 버퍼에 갖고 있게 합니다.
+    명령별 완료는 이벤트 스트림으로 추적합니다.
+      - 이동 명령: 보낸 순서대로 motion_changed[X>0] 에 시작, motion_changed[0] 에 완료
+      - 그 외 명령: ack 수신 시 완료
+    이동 명령은 ack 를 받고 앞선 이동이 모두 끝난 뒤 start_timeout 안에 시작하지 않으면
+    (ScriptClient.wait_motion 과 같은 기준) 실패로 처리하고 짝 맞추기 대기열에서 빼서
+    다음 시작 이벤트가 뒤 명령과 짝지어지게 한 뒤 대기 중인 wait/drain/submit 에서 TimeoutError 를 냅니다.
+    (뒤 명령이 이미 버퍼에 있으면 그 시작이 멈춘 명령의 것으로 짝지어져 뒤 명령이 실패로 보고될 수 있지만,
+    어느 쪽이든 오류는 올라오고 그 뒤의 짝은 다시 맞습니다.)
+    rbpodo(다른 연결)로 보내는 move_j / 그리퍼 출력 등과 순서를 맞춰야 할 때는 먼저 drain() 하세요.
+
+    Args:
+        client (ScriptClient): 연결된 스크립트 클라이언트. on_event 를 이 파이프라인이 사용합니다.
+        window (int): 동시에 보내 둘 최대 명령 수 (실행 중 1 + 대기 window-1).
+        timeout (float): 자리/완료를 기다리는 최대 시간 (s). 넘으면 TimeoutError.
+        start_timeout (float): 이동 명령이 시작할 차례가 된 뒤 시작 이벤트를 기다리는 최대 시간 (s).
+        history (int): 통계용으로 보관할 완료 명령 수.
+    """
+
+    def __init__(self, client, window=2, timeout=30.0, history=1024, start_timeout=0.5):
+        if window < 1:
+            raise ValueError("window 는 1 이상이어야 합니다.")
+        self.client = client
+        self.window = window
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.inflight = deque()   # 보낸 순서대로, 완료 전 명령
+        self.history = deque(maxlen=history)
+        self._by_no = {}          # 명령 번호 → 명령 (ack 매칭)
+        self._unstarted = deque() # 아직 시작 이벤트를 받지 못한 이동 명령
+        self._running = deque()   # 시작했지만 끝나지 않은 이동 명령
+        self._last_motion_done = None
+        self._idle_since = 0.0    # 마지막 motion_changed[0] 시각 (다른 연결로 보낸 이동 포함)
+        self.start_failures = 0   # 시작하지 않아 실패 처리한 이동 명령 수
+        self._error_mark = client.error_count
+        client.on_event = self._on_event
+
+    # ------ 이벤트 처리 ------
+    def _on_event(self, ev):
+        now = ev.stamp
+        if ev.kind == ACK:
+            cmd = self._by_no.get(self.client.acked)
+            if cmd is not None:
+                cmd.t_ack = now
+                if not cmd.motion:
+                    self._complete(cmd, now, True)
+        elif ev.kind == INFO and ev.category == "motion_changed":
+            if ev.int_value(0) != 0:
+                if self._unstarted:
+                    cmd = self._unstarted.popleft()
+                    cmd.t_start = now
+                    if self._last_motion_done is not None:
+                        cmd.gap = now - self._last_motion_done
+                    self._running.append(cmd)
+            else:
+                self._idle_since = now
+                if self._running:
+                    self._complete(self._running.popleft(), now, True)
+                    self._last_motion_done = now
+
+    def _complete(self, cmd, now, ok):
+        cmd.t_done = now
+        cmd.ok = ok
+        self.inflight.remove(cmd) # window 가 작으므로 선형 탐색으로 충분
+        self._by_no.pop(cmd.no, None)
+        if ok:
+            self.history.append(cmd)
+
+    def _fail_all(self):
+        now = time.monotonic()
+        for cmd in list(self.inflight):
+            self._complete(cmd, now, False)
+        self._unstarted.clear()
+        self._running.clear()
+
+    def _start_deadline(self):
+        """
+        다음에 시작할 이동 명령과 그 시작 기한 (time.monotonic). 기한이 아직 정해지지 않았으면 (cmd, None).
+
+        기한은 그 명령의 ack 와 앞선 이동의 완료 중 늦은 쪽 + start_timeout 입니다.
+        (앞선 이동이 실행 중이면 버퍼에서 기다리는 중이므로 기한 없음)
+        """
+        if not self._unstarted:
+            return None, None
+        cmd = self._unstarted[0]
+        if cmd.t_ack is None or self._running or self.client.motion_state != 0:
+            return cmd, None
+        return cmd, max(cmd.t_ack, self._idle_since) + self.start_timeout
+
+    def _wait(self, cond, timeout, what):
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            cmd, start_by = self._start_deadline()
+            if cmd is not None and start_by is None:
+                start_by = time.monotonic() + self.start_timeout # ack / 앞선 이동 완료 후 기한을 다시 계산
+            limit = deadline if cmd is None else min(deadline, start_by)
+            try:
+                ok = self.client.wait_until(cond, max(limit - time.monotonic(), 0.0), self._error_mark)
+            except ScriptError:
+                # 제어기가 오류로 멈추면 남은 명령은 실행되지 않으므로 모두 취소
+                self._fail_all()
+                self._error_mark = self.client.error_count
+                raise
+            if ok:
+                return
+            now = time.monotonic()
+            stuck, start_by = self._start_deadline()
+            if start_by is not None and now >= start_by:
+                # 시작하지 않은 명령을 빼야 다음 시작 이벤트가 뒤 명령의 시작으로 짝지어짐
+                self._unstarted.popleft()
+                self._complete(stuck, now, False)
+                self.start_failures += 1
+                raise TimeoutError(f"파이프라인 이동 명령 #{stuck.no} 이(가) {self.start_timeout}s 안에 시작하지 않았습니다: "
+                                   f"{stuck.command!r}")
+            if now >= deadline:
+                raise TimeoutError(f"파이프라인 {what} 대기 시간 초과 (진행 중 {len(self.inflight)}개)")
+
+    # ------ 명령 ------
+    def wait_slot(self, timeout=None):
+        """진행 중인 명령이 window 개 미만이 될 때까지 기다립니다 (앞서 보낸 이동이 끝나기를 기다리는 시간)."""
+        self.client.poll(0.0) # 이미 도착한 이벤트(다른 연결로 보낸 이동 등)를 먼저 반영
+        if len(self.inflight) >= self.window:
+            self._wait(lambda: len(self.inflight) < self.window, timeout, "자리")
+
+    def submit(self, command, motion=True, tag=None, timeout=None, t_submit=None):
+        """
+        명령을 파이프라인에 넣습니다. 진행 중인 명령이 window 개면 하나가 끝날 때까지 기다립니다.
+
+        Args:
+            command (str): 스크립트 명령.
+            motion (bool): 이동 명령이면 True (motion_changed 로 완료 판단).
+            tag (any): 통계/로그용 꼬리표 (예: "down", "slot3").
+            t_submit (float or None): 자리 대기를 wait_slot() 으로 따로 했을 때 그 전 시각 (time.monotonic).
+                통계의 total 에 자리 대기 시간이 포함되도록 합니다. None 이면 지금.
+        Returns:
+            PipelineCommand
+        """
+        t_submit = time.monotonic() if t_submit is None else t_submit
+        self.wait_slot(timeout)
+        cmd = PipelineCommand(command, motion, tag, t_submit)
+        cmd.no = self.client.send(command)
+        cmd.t_sent = time.monotonic()
+        self.inflight.append(cmd)
+        self._by_no[cmd.no] = cmd
+        if motion:
+            self._unstarted.append(cmd)
+        return cmd
+
+    def wait(self, cmd, timeout=None):
+        """cmd 가 끝날 때까지 기다립니다."""
+        if not cmd.done:
+            self._wait(lambda: cmd.done, timeout, "명령 완료")
+        return cmd
+
+    def drain(self, timeout=None):
+        """보낸 명령이 모두 끝날 때까지 기다립니다."""
+        if self.inflight:
+            self._wait(lambda: not self.inflight, timeout, "전체 완료")
+
+    # ------ 통계 ------
+    def stats(self):
+        """
+        완료된 명령의 지연 통계 (ms). 항목별 {"mean", "p50", "p95", "max"} 와 count.
+
+        ack: 전송→ack, queue: 전송→이동 시작, exec: 이동 시작→완료,
+        total: submit→완료, gap: 이전 이동 완료→다음 이동 시작 (명령 사이 공백).
+        """
+        cmds = list(self.history)
+        result = {"count": len(cmds)}
+
+        def summary(values):
+            v = np.array([x for x in values if x is not None]) * 1000.0
+            if v.size == 0:
+                return None
+            p50, p95 = np.percentile(v, [50, 95])
+            return {"mean": float(v.mean()), "p50": float(p50), "p95": float(p95), "max": float(v.max())}
+
+        result["ack"] = summary(c.t_ack - c.t_sent if c.t_ack is not None else None for c in cmds)
+        result["queue"] = summary(c.t_start - c.t_sent if c.t_start is not None else None for c in cmds)
+        result["exec"] = summary(c.t_done - c.t_start if c.t_start is not None else None for c in cmds)
+        result["total"] = summary(c.t_done - c.t_submit for c in cmds)
+        result["gap"] = summary(c.gap for c in cmds)
+        return result
+
+    def format_stats(self):
+        s = self.stats()
+        lines = [f"[pipeline] window {self.window}, 완료 {s['count']}개"]
+        for key in ("ack", "queue", "exec", "gap", "total"):
+            v = s[key]
+            if v is not None:
+                lines.append(f"  {key:<5} mean {v['mean']:8.1f} ms | p50 {v['p50']:8.1f} | "
+                             f"p95 {v['p95']:8.1f} | max {v['max']:8.1f}")
+        return "\n".join(lines)
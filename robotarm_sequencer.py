@@ -0,0 +1,269 @@
+# 트레이 옮기기 작업 순서 계획 (이동 시간 최소화)
+# robotarm_pallet.TrayLayout.optimize_transfer 는 수평 거리(mm)만 줄입니다.
+# TransferSequencer 는 모든 칸 위(올라간 높이)와 바닥 자세를 기구학 모델(ik_batch)로 한 번에 풀어 두고,
+# 구간마다 "직선 이동 시간"과 "관절별 사다리꼴 이동 시간" 중 느린 쪽을 이동 시간으로 씁니다.
+# 이 시간 행렬로 robotarm_pallet.solve_open_path (≤12 작업 Held-Karp, 그 이상 최근접 이웃 + 2-opt) 를 풉니다.
+#
+# 역기구학이 수렴하지 않은 칸(작업 범위 밖, 좌표계 설정 오류 등)이 작업에 들어 있으면 sequence() 는 ValueError 를 냅니다.
+# 관절 시간과 직선 시간만의 추정이 섞인 비용으로 순서를 바꾸지 않기 위함이며, unreachable() 로 미리 확인할 수 있습니다.
+#
+# 사용 예)
+#   seq = TransferSequencer(TrayLayout(), q_ref=pose_desk[(0, 6)], frame_rpy=USER_FRAME_RPY,
+#                           q_seed={t: pose_desk[(0, t)] for t in (1, 2, 3)})   # 테이블별 역기구학 시작 자세
+#   plan = seq.sequence([(1, 2, a) for a in range(1, 7)], start=(0.0, 0.0))
+#   print(plan["order"], plan["time"], plan["baseline_time"])
+#   rounds = seq.plan_rounds([(1, 2), (3, 1), (2, 3)])   # cycle_2 한 바퀴
+
+import numpy as np
+from robotarm_kinematics import RobotArm, ik_batch, rpy_to_rotation
+from robotarm_pallet import TrayLayout, solve_open_path, path_cost
+from robotarm_program import trapezoid_time
+from robotarm_timing import JOINT_VEL_LIMIT_DEG, JOINT_ACC_LIMIT_DEG # 관절 최고 속도 / 가속도 (robotarm_timing 과 공유)
+
+
+DEFAULT_Q_SEED = (0.0, 0.0, 90.0, 0.0, 90.0, 0.0) # 역기구학이 풀리지 않은 칸을 다시 풀 때 쓰는 기본 시작 자세
+
+
+class TransferSequencer:
+    """
+    (집을 테이블, 놓을 테이블, 칸) 작업 목록의 순서를 예상 이동 시간이 가장 짧게 정합니다.
+
+    칸 하나 옮기기 = 집을 칸 위 → 내려가기 → 집기 → 올라가기 → 놓을 칸 위 → 내려가기 → 놓기 → 올라가기.
+    순서와 무관한 부분(내려가기/올라가기/그리퍼/집기→놓기 이동)은 작업 시간으로 따로 더하고,
+    순서에 따라 달라지는 "놓은 칸 위 → 다음 집을 칸 위" 이동 시간만 최적화합니다.
+
+    Args:
+        layout (TrayLayout): 칸 위치 모델 (사용자 좌표계 x, y mm).
+        q_ref (array-like): 사용자 좌표계 원점 (0, 0) 위에 있을 때의 관절 각도 (deg). 자세(툴 방향)도 이 값을 유지합니다.
+        q_seed (dict or array-like or None): 칸 역기구학 시작 자세. {테이블: 관절 각도} 면 테이블별, 배열이면 전체 공통,
+            None 이면 q_ref. 원점/툴 방향은 바꾸지 않으며, 풀리지 않은 칸은 q_ref 와 DEFAULT_Q_SEED 로 다시 풉니다.
+        frame_rpy (array-like): 사용자 좌표계 회전 (rx, ry, rz) deg, 베이스 기준.
+        robot (RobotArm or None): 기구학 모델. None 이면 기본 RB5-850 모델.
+        lin_speed (float): 직선 이동 속도 (mm/s).
+        lin_acc (float): 직선 이동 가속도 (mm/s^2).
+        lift (float): 칸 위 ↔ 바닥 높이 차 (mm).
+        grip_time (float): 그리퍼 동작 1회 시간 (s).
+        overhead (float): 이동 명령 1회당 추가 시간 (명령 전송 / 완료 확인, s).
+        joint_vel (array-like or None): 관절 최고 속도 (deg/s).
+        joint_acc (array-like or None): 관절 가속도 (deg/s^2).
+    """
+
+    def __init__(self, layout=None, q_ref=DEFAULT_Q_SEED, frame_rpy=(0.0, 0.0, 0.0), robot=None, q_seed=None,
+                 lin_speed=500.0, lin_acc=500.0, lift=50.0, grip_time=0.1, overhead=0.0,
+                 joint_vel=None, joint_acc=None):
+        self.layout = layout if layout is not None else TrayLayout()
+        self.robot = robot if robot is not None else RobotArm(num_axes=6)
+        self.q_ref = np.asarray(q_ref, dtype=float)
+        self.q_seed = q_seed
+        self.lin_speed = lin_speed
+        self.lin_acc = lin_acc
+        self.lift = lift
+        self.grip_time = grip_time
+        self.overhead = overhead
+        self.joint_vel = JOINT_VEL_LIMIT_DEG if joint_vel is None else np.asarray(joint_vel, dtype=float)
+        self.joint_acc = JOINT_ACC_LIMIT_DEG if joint_acc is None else np.asarray(joint_acc, dtype=float)
+
+        T_ref = self.robot.fk_batch(self.q_ref)[0, -1]
+        self.origin = T_ref[:3, 3].copy()
+        self.tool_rot = T_ref[:3, :3].copy()
+        self.R = rpy_to_rotation(frame_rpy, degrees=True)
+        self._solve_slots()
+
+    # ====== 칸 자세 (한 번만 계산) ======
+
+    def to_base(self, xyz):
+        """사용자 좌표계 오프셋 (..., 3) → 베이스 좌표 위치 (..., 3)."""
+        return self.origin + np.asarray(xyz, dtype=float) @ self.R.T
+
+    def _solve_slots(self):
+        """
+        모든 (테이블, 칸) 의 위/바닥 관절 각도를 ik_batch 한 번으로 풉니다.
+
+        self.q_slot[table, area, level] (level 0: 위, 1: 바닥), self.ik_ok[table, area, level]
+        """
+        lay = self.layout
+        n_t, n_a = lay.poses.shape[:2]
+        tables = np.repeat(lay.tables, lay.n_slots)
+        areas = np.tile(np.arange(1, lay.n_slots + 1), len(lay.tables))
+        xy = lay.xy_many(tables, areas)
+
+        xyz = np.zeros((2, len(xy), 3))
+        xyz[:, :, :2] = xy
+        xyz[1, :, 2] = -self.lift
+        targets = self.to_base(xyz.reshape(-1, 3))
+        q, ok = ik_batch(self.robot, self._seeds(np.tile(tables, 2)), targets, self.tool_rot)
+        # 시작 자세에 따라 다른 팔 형태로 가다가 수렴하지 않는 칸은 다른 시작 자세로 한 번 더
+        for seed in (self.q_ref, DEFAULT_Q_SEED):
+            if ok.all():
+                break
+            retry = np.flatnonzero(~ok)
+            q_r, ok_r = ik_batch(self.robot, seed, targets[retry], self.tool_rot)
+            q[retry[ok_r]] = q_r[ok_r]
+            ok[retry[ok_r]] = True
+
+        self.q_slot = np.full((n_t, n_a, 2, self.robot.num_axes), np.nan)
+        self.ik_ok = np.zeros((n_t, n_a, 2), dtype=bool)
+        for level in range(2):
+            sl = slice(level * len(xy), (level + 1) * len(xy))
+            self.q_slot[tables, areas, level] = q[sl]
+            self.ik_ok[tables, areas, level] = ok[sl]
+
+    def _seeds(self, tables):
+        """칸별 역기구학 시작 자세 (N, n)."""
+        if self.q_seed is None:
+            return self.q_ref
+        if isinstance(self.q_seed, dict):
+            return np.array([self.q_seed.get(int(t), self.q_ref) for t in tables], dtype=float)
+        return np.asarray(self.q_seed, dtype=float)
+
+    def unreachable(self):
+        """역기구학이 수렴하지 않은 (테이블, 칸, 높이) 목록. 높이 0: 위, 1: 바닥."""
+        lay = self.layout
+        return [(t, a, lv) for t in lay.tables for a in range(1, lay.n_slots + 1) for lv in range(2)
+                if not self.ik_ok[t, a, lv]]
+
+    # ====== 이동 시간 ======
+
+    def move_time(self, xy_a, xy_b, q_a, q_b, ok):
+        """
+        칸 위 a → 칸 위 b 직선 이동 예상 시간 (s). 배열로 넣으면 원소별로 계산합니다.
+
+        직선 시간(사다리꼴, lin_speed/lin_acc)과 관절별 사다리꼴 시간의 최댓값을 씁니다.
+        ok 가 False 인 원소는 관절 시간을 빼고 직선 시간만 씁니다.
+        """
+        dist = np.linalg.norm(np.asarray(xy_b, dtype=float) - np.asarray(xy_a, dtype=float), axis=-1)
+        t_lin = trapezoid_time(dist, self.lin_speed, self.lin_acc)
+        dq = np.nan_to_num(np.abs(np.asarray(q_b) - np.asarray(q_a)))
+        # 관절마다 한계가 다르므로 관절 축별로 계산한 뒤 가장 느린 관절 기준
+        t_joint = np.max(np.stack([trapezoid_time(dq[..., j], self.joint_vel[j], self.joint_acc[j])
+                                   for j in range(dq.shape[-1])], axis=-1), axis=-1)
+        t = np.maximum(t_lin, np.where(ok, t_joint, 0.0))
+        return np.where(dist > 1e-9, t + self.overhead, 0.0)
+
+    def _lift_time(self, table, area):
+        """칸에서 내려가기 + 올라가기 시간 (관절 시간 포함)."""
+        q_up, q_dn = self.q_slot[table, area]
+        ok = self.ik_ok[table, area].all()
+        dq = np.nan_to_num(np.abs(q_dn - q_up))
+        t_joint = max(trapezoid_time(dq[j], self.joint_vel[j], self.joint_acc[j]) for j in range(len(dq)))
+        t = trapezoid_time(self.lift, self.lin_speed, self.lin_acc)
+        return 2.0 * (max(t, t_joint if ok else 0.0) + self.overhead)
+
+    def job_time(self, src, dst, area):
+        """순서와 무관한 작업 1개 시간: 집기(내려가기/그리퍼/올라가기) + 집을 칸 → 놓을 칸 + 놓기."""
+        lay = self.layout
+        t_move = self.move_time(lay.xy(src, area), lay.xy(dst, area), self.q_slot[src, area, 0],
+                                self.q_slot[dst, area, 0], self.ik_ok[src, area, 0] & self.ik_ok[dst, area, 0])
+        return float(self._lift_time(src, area) + self._lift_time(dst, area) + 2.0 * self.grip_time + t_move)
+
+    def cost_matrix(self, jobs, start=(0.0, 0.0), start_q=None):
+        """
+        작업 사이 이동 시간 행렬.
+
+        Args:
+            jobs (list): [(src, dst, area), ...]
+            start (tuple): 시작 위치 (사용자 좌표계 x, y, 칸 위 높이).
+            start_q (array-like or None): 시작 관절 각도. None 이면 q_ref (원점 위) 기준으로 풉니다.
+        Returns:
+            tuple: (cost (n,n) 놓기 i → 집기 j, start_cost (n,) 시작 → 집기 j)
+        Raises:
+            ValueError: start_q 가 없고 시작 위치가 역기구학으로 풀리지 않을 때.
+        """
+        jobs = np.asarray(jobs, dtype=int).reshape(-1, 3)
+        src, dst, area = jobs[:, 0], jobs[:, 1], jobs[:, 2]
+        lay = self.layout
+        pick_xy, place_xy = lay.xy_many(src, area), lay.xy_many(dst, area)
+        pick_q, place_q = self.q_slot[src, area, 0], self.q_slot[dst, area, 0]
+        pick_ok, place_ok = self.ik_ok[src, area, 0], self.ik_ok[dst, area, 0]
+
+        cost = self.move_time(place_xy[:, None], pick_xy[None], place_q[:, None], pick_q[None],
+                              place_ok[:, None] & pick_ok[None])
+
+        start_xy = np.asarray(start, dtype=float)
+        if start_q is None:
+            q0, ok0 = ik_batch(self.robot, self.q_ref, self.to_base([start_xy[0], start_xy[1], 0.0]), self.tool_rot)
+            if not ok0[0]:
+                raise ValueError(f"시작 위치 {tuple(start_xy)} 가 역기구학으로 풀리지 않습니다.")
+            start_q, start_ok = q0[0], True
+        else:
+            start_q, start_ok = np.asarray(start_q, dtype=float), True
+        start_cost = self.move_time(start_xy, pick_xy, start_q, pick_q, start_ok & pick_ok)
+        return cost, start_cost
+
+    # ====== 순서 계획 ======
+
+    def sequence(self, jobs, start=(0.0, 0.0), start_q=None):
+        """
+        작업 순서를 정합니다. 작업 사이 선후 조건은 없다고 봅니다 (같은 라운드 안의 칸들).
+
+        Returns:
+            dict: order (작업 목록, 순서대로), index (jobs 인덱스 순서), time (예상 s),
+                  baseline_time (주어진 순서 그대로일 때 s), travel_time / baseline_travel_time
+                  (순서에 따라 달라지는 칸 사이 이동 s),
+                  end (마지막 놓은 칸 위치 x, y), end_q (그 관절 각도).
+        Raises:
+            ValueError: 작업의 칸(위 / 바닥) 또는 시작 위치가 역기구학으로 풀리지 않을 때.
+                직선 시간만으로 대신 추정한 비용으로 순서를 바꾸지 않습니다.
+        """
+        jobs = [tuple(int(v) for v in job) for job in jobs]
+        if not jobs:
+            return {"order": [], "index": [], "time": 0.0, "baseline_time": 0.0, "travel_time": 0.0,
+                    "baseline_travel_time": 0.0, "end": tuple(start), "end_q": start_q}
+        missing = sorted({(t, a) for src, dst, a in jobs for t in (src, dst) if not self.ik_ok[t, a].all()})
+        if missing:
+            raise ValueError(f"역기구학으로 풀리지 않는 칸 {len(missing)}개 (테이블, 칸): {missing}")
+        cost, start_cost = self.cost_matrix(jobs, start, start_q)
+        fixed = sum(self.job_time(*job) for job in jobs)
+
+        given = list(range(len(jobs)))
+        base_travel = path_cost(cost, start_cost, given)
+        index, travel = solve_open_path(cost, start_cost)
+        if travel >= base_travel - 1e-9: # 같으면 원래 순서 유지
+            index, travel = given, base_travel
+
+        src, dst, area = jobs[index[-1]]
+        return {"order": [jobs[i] for i in index], "index": index,
+                "time": fixed + travel, "baseline_time": fixed + base_travel,
+                "travel_time": travel, "baseline_travel_time": base_travel,
+                "end": tuple(float(v) for v in self.layout.xy(dst, area)),
+                "end_q": self.q_slot[dst, area, 0].copy()}
+
+    def plan_rounds(self, rounds, start=(0.0, 0.0)):
+        """
+        라운드(src → dst 테이블의 모든 칸) 를 차례로 계획합니다. 라운드 순서는 그대로 두고
+        (앞 라운드가 비운 칸에 다음 라운드가 놓으므로) 라운드 안의 칸 순서만 바꿉니다.
+        각 라운드는 앞 라운드가 끝난 위치에서 시작합니다.
+
+        Args:
+            rounds (list): [(src, dst), ...]
+            start (tuple): 첫 라운드 시작 위치 (x, y).
+        Returns:
+            dict: rounds (라운드별 sequence 결과 + src, dst, areas), time, baseline_time, saved_pct,
+                  travel_saved_pct (칸 사이 이동 시간만 비교).
+        """
+        results = []
+        pos, q = tuple(start), None
+        for src, dst in rounds:
+            jobs = [(src, dst, a) for a in range(1, self.layout.n_slots + 1)]
+            plan = self.sequence(jobs, pos, q)
+            plan.update(src=src, dst=dst, areas=[job[2] for job in plan["order"]])
+            results.append(plan)
+            pos, q = plan["end"], plan["end_q"]
+        total = sum(p["time"] for p in results)
+        base = sum(p["baseline_time"] for p in results)
+        travel = sum(p["travel_time"] for p in results)
+        base_travel = sum(p["baseline_travel_time"] for p in results)
+        return {"rounds": results, "time": total, "baseline_time": base,
+                "saved_pct": 100.0 * (base - total) / base if base > 0 else 0.0,
+                "travel_saved_pct": 100.0 * (base_travel - travel) / base_travel if base_travel > 0 else 0.0}
+
+
+def format_plan(plan):
+    """plan_rounds() 결과를 라운드별 한 줄로 만듭니다."""
+    lines = []
+    for p in plan["rounds"]:
+        lines.append(f"테이블 {p['src']} → {p['dst']} 칸 순서 {p['areas']} | "
+                     f"{p['time']:.2f} s (기본 순서 {p['baseline_time']:.2f} s)")
+    lines.append(f"합계 {plan['time']:.2f} s (기본 순서 {plan['baseline_time']:.2f} s, {plan['saved_pct']:.1f} % 단축, "
+                 f"칸 사이 이동 {plan['travel_saved_pct']:.1f} % 단축)")
+    return "\n".join(lines)
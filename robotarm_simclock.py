@@ -0,0 +1,102 @@
+# 시뮬레이션 시계 모듈
+# 시뮬레이션 코루틴에서 asyncio.sleep(dt) 대신 clock.sleep(dt) 를 쓰면
+# 실시간 / 가상시간(최대 속도) / 배속 모드를 바꿔가며 같은 코드를 돌릴 수 있습니다.
+#
+#   clock = make_clock("virtual")
+#   await clock.sleep(0.05)   # 실제로 기다리지 않고 가상 시간만 0.05초 진행
+#   clock.now()               # 시뮬레이션 경과 시간 (sec)
+
+import time
+import heapq
+import asyncio
+
+
+class RealTimeClock:
+    """실제 시간과 같은 속도로 진행하는 시계."""
+
+    def __init__(self):
+        self._t0 = time.monotonic()
+
+    def now(self):
+        return time.monotonic() - self._t0
+
+    async def sleep(self, dt):
+        await asyncio.sleep(dt)
+
+
+class ScaledClock:
+    """
+    실제 시간보다 scale 배 빠르게(또는 느리게) 진행하는 시계.
+
+    scale=4.0 이면 시뮬레이션 4초가 실제 1초에 진행됩니다. 뷰어와 함께 빠르게 확인할 때 사용합니다.
+    """
+
+    def __init__(self, scale=1.0):
+        if scale <= 0:
+            raise ValueError("scale 은 0보다 커야 합니다.")
+        self.scale = scale
+        self._t0 = time.monotonic()
+
+    def now(self):
+        return (time.monotonic() - self._t0) * self.scale
+
+    async def sleep(self, dt):
+        await asyncio.sleep(dt / self.scale)
+
+
+class VirtualClock:
+    """
+    실제로 기다리지 않는 가상 시간 시계 (이산 사건 방식).
+
+    sleep(dt) 를 호출한 코루틴들을 깨어날 시각 순서로 힙에 넣고,
+    실행 가능한 태스크가 모두 다음 sleep 에 도달하면 가장 이른 시각으로 시간을 건너뜁니다.
+    여러 시뮬레이션 태스크가 동시에 돌아도 가상 시간 순서가 유지됩니다.
+    실제 I/O 를 기다리는 태스크와 섞어 쓰지 마세요 (뷰어 등은 끄고 사용).
+    """
+
+    def __init__(self, start=0.0, settle_yields=3):
+        self._now = start
+        self._heap = []
+        self._seq = 0
+        self._driver = None
+        self.settle_yields = settle_yields # 시간을 건너뛰기 전에 다른 태스크에 양보할 횟수
+
+    def now(self):
+        return self._now
+
+    async def sleep(self, dt):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        heapq.heappush(self._heap, (self._now + max(dt, 0.0), self._seq, fut))
+        self._seq += 1
+        if self._driver is None or self._driver.done():
+            self._driver = loop.create_task(self._drive())
+        await fut
+
+    async def _drive(self):
+        while self._heap:
+            # 방금 깨어난 태스크들이 다음 sleep 을 등록할 때까지 양보
+            for _ in range(self.settle_yields):
+                await asyncio.sleep(0)
+            wake_t, _, fut = heapq.heappop(self._heap)
+            if wake_t > self._now:
+                self._now = wake_t
+            if not fut.done():
+                fut.set_result(None)
+
+
+def make_clock(mode="realtime", scale=1.0):
+    """
+    모드 이름으로 시계를 만듭니다.
+
+    Args:
+        mode (str): "realtime" | "virtual" | "scaled"
+        scale (float): "scaled" 모드 배속.
+    """
+    if mode == "realtime":
+        return RealTimeClock()
+    if mode == "virtual":
+        return VirtualClock()
+    if mode == "scaled":
+        return ScaledClock(scale)
+    raise ValueError(f"알 수 없는 시계 모드: {mode}")
@@ -0,0 +1,157 @@
+# 로봇 실시간 상태(텔레메트리) 수집 모듈
+# rb.asyncio.CobotData 를 쉬지 않고(또는 지정 주기로) 요청해서
+# 미리 할당해 둔 NumPy 링 버퍼에 계속 덮어씁니다.
+#
+# 사용 예)
+#   ring = TelemetryRing(capacity=2048)
+#   await stream_telemetry(rb.asyncio.CobotData(ROBOT_IP), ring, rate_hz=100.0,
+#                          is_running=lambda: GLOBAL.running)
+#   stamp, q, tcp = ring.latest()
+
+import time
+import asyncio
+import numpy as np
+
+
+class TelemetryRing:
+    """
+    고정 크기 텔레메트리 링 버퍼.
+
+    쓰는 쪽(stream_telemetry)은 하나뿐이라는 가정으로 잠금 없이 동작합니다.
+    행을 먼저 채운 뒤 count 를 올리므로, 읽는 쪽은 count 로 확인된 행만 봅니다.
+    latest()/window() 는 버퍼의 view 를 돌려주므로 샘플마다 새 배열을 만들지 않습니다.
+    view 는 capacity 개의 샘플이 더 들어오면 덮어써지므로 오래 보관하려면 np.copy 하세요.
+    """
+
+    def __init__(self, capacity=2048):
+        self.capacity = capacity
+        self.stamp = np.zeros(capacity)           # time.monotonic() (sec)
+        self.robot_time = np.zeros(capacity)      # 제어기 타이머 (sec)
+        self.q = np.zeros((capacity, 6))          # 지령 관절 각도 jnt_ref (deg)
+        self.tcp = np.zeros((capacity, 6))        # 지령 TCP tcp_ref (mm, deg)
+        self.count = 0                            # 지금까지 기록된 샘플 수 (계속 증가)
+
+    def push(self, stamp, q, tcp=None, robot_time=0.0):
+        """샘플 1개를 기록합니다. 쓰는 쪽(스트리머)에서만 호출하세요."""
+        i = self.count % self.capacity
+        self.stamp[i] = stamp
+        self.robot_time[i] = robot_time
+        self.q[i] = q
+        if tcp is not None:
+            self.tcp[i] = tcp
+        self.count += 1 # 행을 다 쓴 뒤에 공개
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def _segments(self):
+        """기록된 샘플을 시간순으로 나눈 (start, stop) 구간들. 각 구간 안에서 stamp 는 단조 증가합니다."""
+        count = self.count
+        n = min(count, self.capacity)
+        if n == 0:
+            return ()
+        end = count % self.capacity # 다음 쓰기 위치 (= 가장 오래된 샘플 위치)
+        if count <= self.capacity:
+            return ((0, end if end else n),)
+        if end == 0:
+            return ((0, self.capacity),)
+        return ((end, self.capacity), (0, end))
+
+    def latest_index(self):
+        """가장 최근 샘플의 버퍼 인덱스. 아직 샘플이 없으면 -1."""
+        if self.count == 0:
+            return -1
+        return (self.count - 1) % self.capacity
+
+    def latest(self):
+        """가장 최근 샘플 (stamp, q, tcp). q, tcp 는 버퍼 view 입니다. 샘플이 없으면 None."""
+        i = self.latest_index()
+        if i < 0:
+            return None
+        return self.stamp[i], self.q[i], self.tcp[i]
+
+    def latest_q(self):
+        """가장 최근 관절 각도 view. 샘플이 없으면 None."""
+        i = self.latest_index()
+        if i < 0:
+            return None
+        return self.q[i]
+
+    def window(self, seconds, now=None):
+        """
+        최근 seconds 초 동안의 샘플 구간을 버퍼 slice 로 돌려줍니다.
+
+        링 버퍼가 한 바퀴 돈 경우 구간이 둘로 나뉠 수 있으므로 slice 의 튜플(1~2개)을 반환합니다.
+        오래된 순서대로 정렬되어 있습니다.
+
+        예)
+            for s in ring.window(0.5):
+                process(ring.stamp[s], ring.q[s])
+        """
+        segments = self._segments()
+        if not segments:
+            return ()
+        if now is None:
+            now = time.monotonic()
+
+        t_min = now - seconds
+        result = []
+        for start, stop in segments:
+            # 각 구간 안에서는 stamp 가 단조 증가하므로 이진 탐색
+            first = start + int(np.searchsorted(self.stamp[start:stop], t_min, side="left"))
+            if first < stop:
+                result.append(slice(first, stop))
+        return tuple(result)
+
+    def nearest_index(self, stamp):
+        """
+        stamp(time.monotonic 기준)에 가장 가까운 샘플의 버퍼 인덱스. 샘플이 없으면 -1.
+
+        카메라 프레임처럼 다른 스레드에서 찍은 시각과 관절 값을 맞출 때 사용합니다.
+        """
+        best = -1
+        best_diff = np.inf
+        for start, stop in self._segments():
+            seg = self.stamp[start:stop]
+            j = int(np.searchsorted(seg, stamp))
+            for k in (j - 1, j):
+                if 0 <= k < stop - start:
+                    diff = abs(seg[k] - stamp)
+                    if diff < best_diff:
+                        best_diff = diff
+                        best = start + k
+        return best
+
+
+async def stream_telemetry(data_channel, ring, rate_hz=None, is_running=lambda: True, on_sample=None):
+    """
+    데이터 채널에서 상태를 계속 받아 ring 에 기록하는 코루틴.
+
+    Args:
+        data_channel (rb.asyncio.CobotData): 비동기 데이터 채널.
+        ring (TelemetryRing): 기록할 링 버퍼.
+        rate_hz (float or None): 요청 주기(Hz). None 이면 응답이 오는 즉시 다음 요청 (back-to-back).
+        is_running (callable): False 를 반환하면 루프를 종료합니다.
+        on_sample (callable or None): 샘플 기록 직후 on_sample(ring) 호출.
+    """
+    period = 1.0 / rate_hz if rate_hz else 0.0
+    next_t = time.monotonic()
+
+    while is_running():
+        data = await data_channel.request_data()
+        stamp = time.monotonic()
+        if data is not None:
+            sdata = data.sdata
+            ring.push(stamp, sdata.jnt_ref, sdata.tcp_ref, sdata.time)
+            if on_sample is not None:
+                on_sample(ring)
+
+        if period > 0:
+            next_t += period
+            delay = next_t - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            next_t = time.monotonic() # 밀린 주기는 따라잡지 않고 버림
+        # 다른 태스크에 실행 양보
+        await asyncio.sleep(0)
@@ -0,0 +1,213 @@
+# 관절 이동 시간 계획 (사다리꼴 / S-curve, 관절 동기화)
+# move_j(q, vel, acc) 를 오프라인에서 흉내 낼 때 쓰는 시간 계산입니다.
+# 스크립트가 넘기는 vel / acc 와 관절별 최고 속도 / 가속도(필요하면 저크) 한계를 함께 적용하고,
+# 모든 관절이 같은 진행률 s(t) 로 동시에 출발해서 동시에 도착하도록 맞춥니다.
+#
+# 동기화 방법: 관절 k 의 이동 거리를 d_k 라 하면 진행률(0→1) 프로파일의 속도 V, 가속도 A, 저크 J 는
+#   V = min_k v_k / d_k,  A = min_k a_k / d_k,  J = min_k j_k / d_k
+# 로 정합니다. 그러면 어느 관절도 자기 한계를 넘지 않고, 한계에 걸리는 관절이 이동 시간을 정합니다.
+#
+# 프로파일: jerk 가 None 이면 사다리꼴(robotarm_program.trapezoid_time 과 같은 시간),
+# 값을 주면 7 구간 S-curve (저크 → 등가속 → 저크 → 등속 → 대칭 감속). 최고 속도 / 가속도에 못 미치는 짧은 이동도 닫힌 식으로 계산합니다.
+# 모든 계산은 구간 N 개를 배열로 한 번에 처리합니다.
+#
+# 사용 예)
+#   motion = plan_joint_moves(q_a, q_b, vel=150, acc=150)            # q_a, q_b: (6,) 또는 (N, 6)
+#   print(motion.duration, motion.total_time)
+#   q = motion.q_at(0.3)[0]                                            # 0.3 s 때 관절 각도
+#   t = profile_time(np.array([10.0, 200.0]), vel=100, acc=200, jerk=2000)
+#   python robotarm_timing.py                                          # 예전 시뮬레이터 추정과 비교 + 처리 속도
+
+import sys
+import time
+import numpy as np
+
+# 관절 최고 속도 / 가속도 (deg/s, deg/s^2). RB5-850 사양서 근사값이며 제어기 설정에 맞게 바꿔 쓰세요.
+JOINT_VEL_LIMIT_DEG = np.array([180.0, 180.0, 180.0, 180.0, 180.0, 180.0])
+JOINT_ACC_LIMIT_DEG = np.array([400.0, 400.0, 400.0, 400.0, 400.0, 400.0])
+
+
+def _profile(distance, vel, acc, jerk=None):
+    """
+    정지 → 정지 대칭 프로파일의 구간 값 (원소별).
+
+    Returns:
+        tuple: (전체 시간, 저크 구간 시간, 가속 구간 시간(저크 포함), 최고 속도, 최고 가속도) 배열.
+    """
+    d = np.asarray(distance, dtype=float)
+    v = np.asarray(vel, dtype=float)
+    a = np.asarray(acc, dtype=float)
+    j = np.full_like(a, np.inf) if jerk is None else np.asarray(jerk, dtype=float)
+    d, v, a, j = np.broadcast_arrays(d, v, a, j)
+    inf_j = np.isinf(j)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 최고 속도까지 가는 경우: 가속 중 최고 가속도에 닿는지 (v j >= a^2)
+        a_full = inf_j | (v * j >= a * a)
+        tj_v = np.where(a_full, a / j, np.sqrt(v / j))
+        ta_v = np.where(a_full, v / a + tj_v, 2.0 * tj_v)
+        cruise = d >= v * ta_v
+        # 등속 구간 없음, 최고 가속도에는 닿음: vp^2 / a + vp a / j = d
+        r = np.where(inf_j, 0.0, a / j)
+        vp_a = 0.5 * a * (-r + np.sqrt(r * r + 4.0 * d / a))
+        reach_a = inf_j | (vp_a * j >= a * a)
+        # 최고 가속도에도 못 닿음: d = 2 j tj^3
+        tj_n = np.cbrt(d / (2.0 * j))
+
+        t_jerk = np.where(cruise, tj_v, np.where(reach_a, r, tj_n))
+        t_acc = np.where(cruise, ta_v, np.where(reach_a, vp_a / a + r, 2.0 * tj_n))
+        v_peak = np.where(cruise, v, np.where(reach_a, vp_a, j * tj_n * tj_n))
+        duration = np.where(cruise, d / v + ta_v, 2.0 * t_acc)
+        a_peak = np.where(t_acc > t_jerk, v_peak / (t_acc - t_jerk), 0.0)
+    zero = d <= 0.0
+    return tuple(np.where(zero, 0.0, x) for x in (duration, t_jerk, t_acc, v_peak, a_peak))
+
+
+def profile_time(distance, vel, acc, jerk=None):
+    """
+    정지 → 정지 이동 시간. jerk 가 None 이면 robotarm_program.trapezoid_time 과 같습니다.
+
+    Args:
+        distance (float or np.ndarray): 이동 거리 (mm 또는 deg).
+        vel, acc (float or np.ndarray): 최고 속도 / 가속도.
+        jerk (float or np.ndarray or None): 최고 저크 (None 이면 사다리꼴).
+    Returns:
+        float or np.ndarray: 이동 시간 (s).
+    """
+    t = _profile(np.abs(np.asarray(distance, dtype=float)), vel, acc, jerk)[0]
+    return float(t) if t.ndim == 0 else t
+
+
+def _ramp(t, t_jerk, t_acc, v_peak, a_peak):
+    """가속 구간 [0, t_acc] 의 이동 거리 (저크 → 등가속 → 저크)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jerk = np.where(t_jerk > 0.0, a_peak / t_jerk, 0.0)
+    first = lambda x: jerk * x ** 3 / 6.0
+    mid = first(t_jerk) + 0.5 * a_peak * t_jerk * (t - t_jerk) + 0.5 * a_peak * (t - t_jerk) ** 2
+    # 마지막 저크 구간은 속도 곡선이 가속 구간 가운데 점 대칭이라는 점을 이용
+    last = v_peak * t - 0.5 * v_peak * t_acc + first(np.maximum(t_acc - t, 0.0))
+    return np.where(t < t_jerk, first(t), np.where(t <= t_acc - t_jerk, mid, last))
+
+
+class JointMotion:
+    """
+    관절 이동 N 개의 동기화 프로파일 (plan_joint_moves 결과).
+
+    Attributes:
+        q_start, q_end (np.ndarray): (N, 관절 수) deg.
+        duration (np.ndarray): (N,) 이동 시간 (s).
+    """
+
+    def __init__(self, q_start, q_end, params):
+        self.q_start = q_start
+        self.q_end = q_end
+        self.duration, self._t_jerk, self._t_acc, self._v_peak, self._a_peak = params
+
+    def __len__(self):
+        return len(self.duration)
+
+    @property
+    def total_time(self):
+        """N 개를 차례로 실행한 전체 시간 (s)."""
+        return float(self.duration.sum())
+
+    def fraction(self, t):
+        """
+        시각 t (구간 시작 기준, s) 의 진행률 0~1.
+
+        Args:
+            t (float or np.ndarray): 스칼라면 결과 (N,), (M,) 배열이면 (N, M).
+        """
+        t = np.asarray(t, dtype=float)
+        shape = (-1,) + (1,) * t.ndim
+        T, tj, ta, vp, ap = (x.reshape(shape) for x in
+                             (self.duration, self._t_jerk, self._t_acc, self._v_peak, self._a_peak))
+        t = np.clip(t, 0.0, T)
+        s = np.where(t <= ta, _ramp(t, tj, ta, vp, ap),
+                     np.where(t < T - ta, 0.5 * vp * ta + vp * (t - ta), 1.0 - _ramp(T - t, tj, ta, vp, ap)))
+        return np.where(T > 0.0, np.clip(s, 0.0, 1.0), 1.0)
+
+    def q_at(self, t):
+        """시각 t 의 관절 각도. 스칼라면 (N, 관절 수), (M,) 배열이면 (N, M, 관절 수)."""
+        s = self.fraction(t)[..., None]
+        dq = self.q_end - self.q_start
+        if s.ndim == 3:
+            return self.q_start[:, None] + s * dq[:, None]
+        return self.q_start + s * dq
+
+    def joint_peaks(self):
+        """관절별 최고 속도 / 가속도 (N, 관절 수) — 한계 확인용."""
+        dist = np.abs(self.q_end - self.q_start)
+        return dist * self._v_peak[:, None], dist * self._a_peak[:, None]
+
+
+def plan_joint_moves(q_start, q_end, vel=None, acc=None, jerk=None,
+                     joint_vel=JOINT_VEL_LIMIT_DEG, joint_acc=JOINT_ACC_LIMIT_DEG, joint_jerk=None):
+    """
+    move_j(q_end, vel, acc) 이동 N 개의 동기화 프로파일을 한 번에 계산합니다.
+
+    Args:
+        q_start, q_end (array-like): (관절 수,) 또는 (N, 관절 수) deg.
+        vel, acc (float or None): 스크립트가 넘기는 관절 속도 (deg/s) / 가속도 (deg/s^2). None 이면 관절 한계만 적용.
+        jerk (float or None): 관절 저크 (deg/s^3). jerk 와 joint_jerk 가 모두 None 이면 사다리꼴.
+        joint_vel, joint_acc (array-like): 관절별 최고 속도 / 가속도.
+        joint_jerk (array-like or None): 관절별 최고 저크.
+    Returns:
+        JointMotion: 구간 N 개의 프로파일.
+    """
+    q0 = np.atleast_2d(np.asarray(q_start, dtype=float))
+    q1 = np.atleast_2d(np.asarray(q_end, dtype=float))
+    q0, q1 = np.broadcast_arrays(q0, q1)
+    dist = np.abs(q1 - q0)
+
+    def limit(value, per_joint):
+        if value is None and per_joint is None:
+            return None
+        lim = np.full(dist.shape[-1], np.inf)
+        if per_joint is not None:
+            lim = np.minimum(lim, np.asarray(per_joint, dtype=float))
+        if value is not None:
+            lim = np.minimum(lim, float(value))
+        # 진행률 프로파일 한계 = 관절마다 (한계 / 거리) 중 최솟값, 움직이지 않는 관절은 제외
+        with np.errstate(divide="ignore"):
+            norm = np.min(np.where(dist > 0.0, lim / dist, np.inf), axis=-1)
+        return np.where(np.isfinite(norm), norm, 1.0)
+
+    moving = np.any(dist > 0.0, axis=-1)
+    params = _profile(moving.astype(float), limit(vel, joint_vel), limit(acc, joint_acc), limit(jerk, joint_jerk))
+    return JointMotion(q0, q1, params)
+
+
+# ====== 비교 / 처리 속도 ======
+
+def _main():
+    # async_4_realtime_sim_jac scenario_cycle_2 의 테이블 자세 사이 move_j (vel 150, acc 150)
+    poses = np.array([[-166.67, 37.03, 94.11, -41.15, 89.96, 76.46],
+                      [-138.44, 51.74, 65.89, -27.64, 89.96, 48.44],
+                      [-88.57, 15.13, 131.94, -57.08, 89.96, -1.42]])
+    vel, acc = (float(sys.argv[1]), float(sys.argv[2])) if len(sys.argv) > 2 else (150.0, 150.0)
+    jerk = float(sys.argv[3]) if len(sys.argv) > 3 else 4.0 * acc
+    pairs = [(a, b) for a in range(3) for b in range(3) if a != b]
+    q_a = poses[[a for a, _ in pairs]]
+    q_b = poses[[b for _, b in pairs]]
+    old = np.max(np.abs(q_b - q_a), axis=1) / vel # 예전 sim_move_j: 최대 거리 / 속도
+    trap = plan_joint_moves(q_a, q_b, vel, acc).duration
+    scurve = plan_joint_moves(q_a, q_b, vel, acc, jerk=jerk).duration
+    print(f"move_j vel {vel:.0f} deg/s, acc {acc:.0f} deg/s^2, jerk {jerk:.0f} deg/s^3 (S-curve)")
+    print(f"  {'구간':<8} {'예전':>8} {'사다리꼴':>8} {'S-curve':>8}")
+    for (a, b), o, t, s in zip(pairs, old, trap, scurve):
+        print(f"  {a + 1} → {b + 1}   {o:8.3f} {t:8.3f} {s:8.3f}")
+
+    n = 100000
+    rng = np.random.default_rng(0)
+    q_a = rng.uniform(-180.0, 180.0, (n, 6))
+    q_b = rng.uniform(-180.0, 180.0, (n, 6))
+    for label, j in (("사다리꼴", None), ("S-curve", jerk)):
+        t0 = time.perf_counter()
+        motion = plan_joint_moves(q_a, q_b, vel, acc, jerk=j)
+        elapsed = time.perf_counter() - t0
+        print(f"{label} {n} 구간: {elapsed * 1000:.1f} ms ({n / elapsed / 1e6:.2f} M 구간/s), "
+              f"합계 {motion.total_time:.0f} s")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,259 @@
+# 이동 함수 구간 계측 (span) + Chrome trace 내보내기
+# robot_move_linear / robot_move_startpoint / mmove_j / mmove_l_relative 의 명령 전송, 시작/완료 대기,
+# rc.error() 확인 시간을 단조 시계(time.perf_counter_ns)로 재서 미리 할당한 링 버퍼에 기록합니다.
+# 기본은 꺼져 있고(span() 이 아무것도 하지 않는 공용 객체를 반환), enable() 또는 환경 변수 ROBOTARM_TRACE=1 로 켭니다.
+#
+# - 기록: span 1개 = 튜플 1개를 링 버퍼 칸에 대입 (capacity 를 넘으면 오래된 것부터 덮어씀, 메모리 일정)
+# - 내보내기: export_chrome_trace() → chrome://tracing / https://ui.perfetto.dev 에서 열기
+#   같은 스레드의 "move" 구간 사이 빈 시간은 "idle" 구간으로 함께 내보냅니다.
+# - 오버헤드: bench_trace.py 로 측정 (켜진 span 1개 수 µs 이하, 꺼진 span 은 그보다 훨씬 작음)
+#
+# 사용 예)
+#   import robotarm_trace as trace
+#   trace.enable()
+#   with trace.span("mmove_j", "move"):
+#       with trace.span("send"):
+#           robot.move_j(...)
+#   trace.export_chrome_trace("trace.json")
+#   print(trace.format_summary())
+
+import os
+import json
+import time
+import threading
+import numpy as np
+
+TRACE_ENV = "ROBOTARM_TRACE"
+DEFAULT_CAPACITY = 65536
+MOVE = "move"   # 이동 함수 전체 구간 (idle 계산 기준)
+STEP = "step"   # 이동 함수 안의 세부 구간
+IDLE = "idle"
+
+_now = time.perf_counter_ns
+
+
+class Span:
+    """with 문으로 쓰는 구간 1개. 끝날 때 Tracer 버퍼에 (이름, 분류, 시작, 끝, 스레드, 인자) 를 기록합니다."""
+
+    __slots__ = ("tracer", "name", "cat", "args", "t0")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = _now()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        t1 = _now()
+        if exc_type is not None:
+            self.args = dict(self.args or (), error=exc_type.__name__)
+        self.tracer.add(self.name, self.cat, self.t0, t1, self.args)
+        return False
+
+
+class _NullSpan:
+    """계측이 꺼져 있을 때 span() 이 돌려주는 공용 객체 (아무것도 하지 않음)."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    span 링 버퍼.
+
+    Args:
+        capacity (int): 보관할 span 수. 넘치면 가장 오래된 것부터 덮어씁니다.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = int(capacity)
+        self._buf = [None] * self.capacity
+        self._n = 0 # 지금까지 기록한 span 수 (버퍼 위치 = _n % capacity)
+        self.t_origin = _now()
+
+    def span(self, name, cat=STEP, **args):
+        return Span(self, name, cat, args or None)
+
+    def add(self, name, cat, t0, t1, args=None):
+        """이미 잰 구간을 기록합니다 (t0, t1: perf_counter_ns)."""
+        # GIL 아래에서 _n 증가와 칸 대입이 섞여도 칸 하나를 잃을 뿐 버퍼는 깨지지 않음
+        n = self._n
+        self._n = n + 1
+        self._buf[n % self.capacity] = (name, cat, t0, t1, threading.get_ident(), args)
+
+    def mark(self, name, **args):
+        """시점 이벤트 (길이 0)."""
+        t = _now()
+        self.add(name, "mark", t, t, args or None)
+
+    def __len__(self):
+        return min(self._n, self.capacity)
+
+    @property
+    def dropped(self):
+        """버퍼가 넘쳐 덮어쓴 span 수."""
+        return max(self._n - self.capacity, 0)
+
+    def spans(self):
+        """보관 중인 span 목록 (시작 시각 순)."""
+        if self._n <= self.capacity:
+            items = self._buf[:self._n]
+        else:
+            i = self._n % self.capacity
+            items = self._buf[i:] + self._buf[:i]
+        return sorted((s for s in items if s is not None), key=lambda s: s[2])
+
+    def since(self, n):
+        """
+        기록 번호 n 이후에 기록된 span (기록 순 = 끝난 순) 과 현재 기록 번호.
+        덮어써서 없어진 span 은 건너뜁니다. 실시간 분석기(CycleAnalyzer.update)가 새 span 만 가져갈 때 사용합니다.
+
+        Returns:
+            tuple: (span list, 다음에 넘길 기록 번호)
+        """
+        end = self._n
+        start = max(n, end - self.capacity)
+        return [self._buf[i % self.capacity] for i in range(start, end)], end
+
+    def clear(self):
+        self._buf = [None] * self.capacity
+        self._n = 0
+
+    def idle_gaps(self, min_us=50.0):
+        """
+        스레드별로 연속된 MOVE 구간 사이의 빈 시간.
+
+        Returns:
+            list: (이전 구간 이름, 다음 구간 이름, 시작 ns, 끝 ns, 스레드) 목록.
+        """
+        last = {}
+        gaps = []
+        for name, cat, t0, t1, tid, _ in self.spans():
+            if cat != MOVE:
+                continue
+            prev = last.get(tid)
+            if prev is not None and t0 - prev[1] >= min_us * 1000.0:
+                gaps.append((prev[0], name, prev[1], t0, tid))
+            if prev is None or t1 > prev[1]:
+                last[tid] = (name, t1)
+        return gaps
+
+    def summary(self):
+        """
+        이름별 통계 (ms).
+
+        Returns:
+            dict: (분류, 이름) → {"n", "total_ms", "mean_ms", "p50_ms", "p95_ms", "max_ms"}
+        """
+        groups = {}
+        for name, cat, t0, t1, _, _ in self.spans():
+            groups.setdefault((cat, name), []).append(t1 - t0)
+        for prev, nxt, t0, t1, _ in self.idle_gaps():
+            groups.setdefault((IDLE, f"{prev} → {nxt}"), []).append(t1 - t0)
+        out = {}
+        for key, values in groups.items():
+            d = np.asarray(values, dtype=float) / 1e6
+            p50, p95 = np.percentile(d, [50, 95])
+            out[key] = {"n": len(d), "total_ms": float(d.sum()), "mean_ms": float(d.mean()),
+                        "p50_ms": float(p50), "p95_ms": float(p95), "max_ms": float(d.max())}
+        return out
+
+    def format_summary(self):
+        rows = sorted(self.summary().items(), key=lambda kv: -kv[1]["total_ms"])
+        lines = [f"계측 span {len(self)}개 (덮어씀 {self.dropped})"]
+        for (cat, name), s in rows:
+            lines.append(f"  [{cat:<4}] {name:<36} n {s['n']:5d} | 합계 {s['total_ms']:10.1f} ms | "
+                         f"p50 {s['p50_ms']:8.2f} | p95 {s['p95_ms']:8.2f} | 최대 {s['max_ms']:8.2f}")
+        return "\n".join(lines)
+
+    def chrome_events(self):
+        """Chrome trace 이벤트 목록 (ts / dur 단위 µs)."""
+        pid = os.getpid()
+        origin = self.t_origin
+        events = []
+        for name, cat, t0, t1, tid, args in self.spans():
+            ev = {"name": name, "cat": cat, "ph": "X" if t1 > t0 or cat != "mark" else "i",
+                  "ts": (t0 - origin) / 1000.0, "pid": pid, "tid": tid}
+            if ev["ph"] == "X":
+                ev["dur"] = (t1 - t0) / 1000.0
+            else:
+                ev["s"] = "t"
+            if args:
+                ev["args"] = {k: v if isinstance(v, (int, float, str, bool)) or v is None else str(v)
+                              for k, v in args.items()}
+            events.append(ev)
+        for prev, nxt, t0, t1, tid in self.idle_gaps():
+            events.append({"name": IDLE, "cat": IDLE, "ph": "X", "ts": (t0 - origin) / 1000.0,
+                           "dur": (t1 - t0) / 1000.0, "pid": pid, "tid": tid, "args": {"after": prev, "before": nxt}})
+        return events
+
+    def export_chrome_trace(self, path):
+        """Chrome trace JSON 파일로 저장하고 경로를 반환합니다."""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.chrome_events(), "displayTimeUnit": "ms",
+                       "otherData": {"dropped": self.dropped}}, f)
+        return path
+
+
+# ====== 모듈 전역 계측기 ======
+
+_tracer = None
+
+
+def enable(capacity=DEFAULT_CAPACITY):
+    """계측을 켜고 Tracer 를 반환합니다 (이미 켜져 있으면 그대로)."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(capacity)
+    return _tracer
+
+
+def disable():
+    """계측을 끄고 마지막 Tracer 를 반환합니다 (기록은 그대로 남음)."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer():
+    """켜져 있으면 Tracer, 아니면 None."""
+    return _tracer
+
+
+def span(name, cat=STEP, **args):
+    """계측이 켜져 있으면 Span, 꺼져 있으면 NULL_SPAN."""
+    tracer = _tracer
+    if tracer is None:
+        return NULL_SPAN
+    return Span(tracer, name, cat, args or None)
+
+
+def mark(name, **args):
+    if _tracer is not None:
+        _tracer.mark(name, **args)
+
+
+def export_chrome_trace(path="trace.json"):
+    """켜져 있으면 저장하고 경로, 아니면 None."""
+    return None if _tracer is None else _tracer.export_chrome_trace(path)
+
+
+def format_summary():
+    return "계측 꺼짐" if _tracer is None else _tracer.format_summary()
+
+
+if os.environ.get(TRACE_ENV, "").strip().lower() in ("1", "true", "yes", "on"):
+    enable()
@@ -0,0 +1,195 @@
+# 3D 로봇 자세 뷰어 (별도 프로세스)
+# 제어용 asyncio 루프와 분리된 프로세스에서 matplotlib 을 돌리고,
+# 관절 각도는 공유 메모리(SharedPose)로 전달합니다.
+#
+# - 정적 배경(축, 눈금)은 한 번만 그려서 저장하고, 링크 선과 엔드이펙터만 blit 으로 갱신
+# - 자세 변화가 threshold_deg 보다 작으면 프레임을 건너뜀
+# - 주기적으로 실제 FPS 와 프레임 시간을 출력
+#
+# 사용 예)
+#   viewer = PoseViewer()
+#   viewer.start()
+#   viewer.publish(GLOBAL.q)   # 제어 루프에서 수시로 호출 (복사 6개 값, 매우 가벼움)
+#   viewer.stop()
+
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class SharedPose:
+    """
+    관절 각도 공유 메모리 버퍼 (쓰는 쪽 1개, 읽는 쪽 여러 개).
+
+    [0] 에 시퀀스 번호, [1:] 에 관절 각도를 저장합니다.
+    쓰는 동안 시퀀스를 홀수로 두는 seqlock 방식이라 잠금 없이 찢어진 값을 걸러냅니다.
+    """
+
+    def __init__(self, name=None, num_axes=6):
+        size = (num_axes + 1) * 8
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.buf = np.ndarray((num_axes + 1,), dtype=np.float64, buffer=self.shm.buf)
+        if self.owner:
+            self.buf[:] = 0.0
+        self.name = self.shm.name
+        self._last = np.zeros(num_axes) # 마지막으로 온전히 읽은 값
+
+    def write(self, q):
+        seq = self.buf[0]
+        self.buf[0] = seq + 1 # 홀수: 쓰는 중
+        self.buf[1:] = q
+        self.buf[0] = seq + 2 # 짝수: 쓰기 완료
+
+    def read(self, out, max_retries=1000):
+        """
+        out 에 최신 관절 각도를 복사하고 시퀀스 번호를 반환합니다. 쓰는 중이면 다시 읽습니다.
+        max_retries 번 안에 온전한 값을 못 읽으면(쓰는 프로세스가 쓰다가 죽은 경우 등)
+        마지막으로 읽은 값을 out 에 넣고 None 을 반환합니다.
+        """
+        for _ in range(max_retries):
+            seq1 = self.buf[0]
+            out[:] = self.buf[1:]
+            if seq1 % 2 == 0 and self.buf[0] == seq1:
+                self._last[:] = out
+                return seq1
+        out[:] = self._last
+        return None
+
+    def close(self):
+        # numpy view 를 먼저 놓아야 공유 메모리를 닫을 수 있음
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def viewer_main(shm_name, stop_event, threshold_deg=0.05, max_fps=30.0, report_sec=5.0,
+                dh_param_file=None, title="Real-time Robot Simulation"):
+    """뷰어 프로세스 본체. PoseViewer.start() 가 별도 프로세스로 실행합니다."""
+    import matplotlib
+    matplotlib.use('TkAgg') # [중요] Matplotlib 충돌 방지 (Qt 에러 해결용)
+    import matplotlib.pyplot as plt
+    from robotarm_kinematics import RobotArm
+
+    pose = SharedPose(name=shm_name)
+    robot_sim = RobotArm(num_axes=6, dh_param_file=dh_param_file)
+
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_subplot(111, projection='3d')
+    plot_range = 1000
+    ax.set_xlim([-plot_range, plot_range])
+    ax.set_ylim([-plot_range, plot_range])
+    ax.set_zlim([0, 1200])
+    ax.set_xlabel('X [mm]')
+    ax.set_ylabel('Y [mm]')
+    ax.set_zlabel('Z [mm]')
+    ax.set_title(title)
+    ax.view_init(elev=20, azim=45)
+
+    # animated=True: 배경 그리기에서 제외하고 blit 으로만 그림
+    line_robot, = ax.plot([], [], [], 'o-', lw=3, markersize=6, color='black', animated=True)
+    ee_marker, = ax.plot([], [], [], 'X', markersize=12, color='cyan', animated=True)
+
+    background = None
+
+    def on_draw(event):
+        # 창 크기 변경, 시점 회전 등으로 전체 다시 그리기가 일어나면 배경을 다시 저장
+        nonlocal background
+        background = fig.canvas.copy_from_bbox(fig.bbox)
+        draw_dynamic()
+
+    def draw_dynamic():
+        ax.draw_artist(line_robot)
+        ax.draw_artist(ee_marker)
+
+    fig.canvas.mpl_connect('draw_event', on_draw)
+    plt.show(block=False)
+    fig.canvas.draw()
+
+    q = np.zeros(6)
+    q_drawn = np.full(6, np.inf)
+    min_period = 1.0 / max_fps
+    frames = skipped = 0
+    frame_time_sum = 0.0
+    t_report = time.perf_counter()
+
+    while not stop_event.is_set() and plt.fignum_exists(fig.number):
+        t0 = time.perf_counter()
+        pose.read(q)
+
+        if np.max(np.abs(q - q_drawn)) >= threshold_deg and background is not None:
+            points = robot_sim.link_positions(q)[0]
+            line_robot.set_data(points[:, 0], points[:, 1])
+            line_robot.set_3d_properties(points[:, 2])
+            ee_marker.set_data(points[-1:, 0], points[-1:, 1])
+            ee_marker.set_3d_properties(points[-1:, 2])
+
+            fig.canvas.restore_region(background)
+            draw_dynamic()
+            fig.canvas.blit(fig.bbox)
+            q_drawn[:] = q
+            frames += 1
+            frame_time_sum += time.perf_counter() - t0
+        else:
+            skipped += 1
+
+        fig.canvas.flush_events()
+
+        now = time.perf_counter()
+        if now - t_report >= report_sec:
+            elapsed = now - t_report
+            frame_ms = frame_time_sum / frames * 1000.0 if frames else 0.0
+            print(f"[viewer] {frames / elapsed:.1f} FPS, frame {frame_ms:.2f} ms, skipped {skipped}")
+            frames = skipped = 0
+            frame_time_sum = 0.0
+            t_report = now
+
+        remain = min_period - (time.perf_counter() - t0)
+        if remain > 0:
+            time.sleep(remain)
+
+    plt.close(fig)
+    pose.close()
+
+
+class PoseViewer:
+    """
+    뷰어 프로세스를 띄우고 관절 각도를 공유 메모리로 넘겨주는 제어 루프 쪽 객체.
+
+    Args:
+        threshold_deg (float): 이보다 작은 자세 변화는 다시 그리지 않음 (deg).
+        max_fps (float): 최대 화면 갱신 주기.
+        report_sec (float): FPS 출력 주기 (s).
+        dh_param_file (str or None): RobotArm DH 파라미터 파일.
+    """
+
+    def __init__(self, threshold_deg=0.05, max_fps=30.0, report_sec=5.0, dh_param_file=None):
+        self.pose = SharedPose()
+        self.kwargs = dict(threshold_deg=threshold_deg, max_fps=max_fps,
+                           report_sec=report_sec, dh_param_file=dh_param_file)
+        ctx = mp.get_context("spawn") # Tk 는 fork 된 프로세스에서 불안정하므로 spawn 사용
+        self.stop_event = ctx.Event()
+        self.process = ctx.Process(target=viewer_main, args=(self.pose.name, self.stop_event),
+                                   kwargs=self.kwargs, daemon=True)
+
+    def start(self):
+        self.process.start()
+
+    def publish(self, q):
+        self.pose.write(q)
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self, timeout=2.0):
+        self.stop_event.set()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.pose.close()
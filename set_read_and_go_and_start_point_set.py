@@ -1,9 +1,8 @@
-# txt 에서 위치 읽고, 위치로 move j로 이동합니다.
+# 자세 라이브러리에서 위치 읽고, 위치로 move j로 이동합니다.
 
-import os
 import rbpodo as rb
 import robotarm_functions as ra_fs
-import numpy as np
+from robotarm_poses import load_library
 
 # ====== 메인 루틴 ======
 def _main():
@@ -25,9 +24,8 @@ def _main():
     # robot.set_operation_mode(rc, rb.OperationMode.Simulation)
     robot.set_speed_bar(rc, 0.3)
 
-    filename = "point_start.txt"
-
-    jointarray = np.loadtxt(filename)
+    # 라이브러리에 없으면 기존 point_start.txt 를 한 번 가져와 저장
+    jointarray = load_library().get("start", txt="point_start.txt")
     # print("\n파일에서 불러온 jointarray:")
     # print(jointarray)
 
@@ -0,0 +1,43 @@
+# 현재 조인트를 읽고, 자세 라이브러리(poses.bin)에 '<로봇 IP>:<이름>' 으로 저장합니다.
+# files/show.py, show10.py, show10-2.py 는 시작할 때 자기 ROBOT_IP 의 initiate / desk_N 을 읽어
+# 코드에 적힌 기본 자세 대신 사용합니다. (로봇마다 이름이 달라 다른 로봇의 티칭 값을 읽지 않음)
+#
+# 사용 예)
+#   python set_robot_pose_set.py desk_3                # IP_robotarm.txt 의 로봇, 3번 데스크 자세 저장
+#   python set_robot_pose_set.py initiate 192.168.0.23 # 로봇 IP 를 직접 지정
+
+import sys
+import rbpodo as rb
+import robotarm_functions as ra_fs
+from robotarm_poses import load_library, robot_pose_name, JOINT
+
+# ====== 메인 루틴 ======
+def _main():
+    if len(sys.argv) < 2:
+        print("사용법: python set_robot_pose_set.py <자세 이름(desk_N / initiate)> [로봇 IP]")
+        return
+
+    pose = sys.argv[1]
+    # 인자가 없으면 파일에서 IP 주소 읽기
+    robot_ip = sys.argv[2] if len(sys.argv) > 2 else ra_fs.read_robot_ip()
+    if robot_ip is None:
+        print("로봇 IP 주소를 읽을 수 없어 프로그램을 종료합니다.")
+        return
+
+    name = robot_pose_name(robot_ip, pose)
+    print(f"\n✅ 로봇 IP: {robot_ip}, 저장 이름: '{name}'")
+
+    # 로봇 연결
+    robot = rb.Cobot(robot_ip)
+    rc = rb.ResponseCollector()
+
+    joint = ra_fs.read_joint(rc, robot)
+
+    # 자세 라이브러리 (파일 끝에 레코드 1개만 추가, 이전 값은 기록으로 남음)
+    poses = load_library()
+    poses.put(name, joint, kind=JOINT, note="set_robot_pose_set")
+    print(f"데이터 저장 완료 ✅ ({poses.path}, '{name}' 기록 {len(poses.history(name))}개)")
+
+
+if __name__ == "__main__":
+    _main()
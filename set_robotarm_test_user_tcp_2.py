@@ -1,8 +1,9 @@
-# tcp의 위치를 txt에서 읽어오는 구조로 변경했습니다.
+# tcp의 위치를 자세 라이브러리('tool_tcp', 없으면 point_tcp.txt)에서 읽어오는 구조로 변경했습니다.
 # 하지만 move_l_rel에서 적용되지 않는 것 같아서 추가적인 보완이 필요
 
 import rbpodo as rb
 import numpy as np
+from robotarm_poses import load_library, TOOL
 
 # ====== 로봇 IP 읽기 ======
 def read_robot_ip(filename="IP_robotarm.txt"):
@@ -156,9 +157,7 @@ def _main():
         rc.error().throw_if_not_empty()
 
 
-    filename = "point_tcp.txt"
-
-    tool_tcp_info = np.loadtxt(filename)
+    tool_tcp_info = load_library().get("tool_tcp", txt="point_tcp.txt", kind=TOOL)
     print(tool_tcp_info)
 
     robot.set_tcp_info(rc, tool_tcp_info)
@@ -1,8 +1,9 @@
-# 시작지점 관절을 txt에서 읽어오고, move j로 움직이고 그위치에 tcp를 수정한뒤 그 위치를 유저 0 기준 좌표로 선정하는 코드입니다.
+# 시작지점 관절을 자세 라이브러리에서 읽어오고, move j로 움직이고 그위치에 tcp를 수정한뒤 그 위치를 유저 0 기준 좌표로 선정하는 코드입니다.
 
 import numpy as np
 import robotarm_functions as ra_fs
 import rbpodo as rb
+from robotarm_poses import load_library
 
 # ====== 메인 루틴 ======
 def _main():
@@ -24,9 +25,8 @@ def _main():
     # robot.set_operation_mode(rc, rb.OperationMode.Simulation)
     robot.set_speed_bar(rc, 0.7)
 
-    filename = "point_ready.txt"
-
-    jointarray = np.loadtxt(filename)
+    # 라이브러리에 없으면 기존 point_ready.txt 를 한 번 가져와 저장
+    jointarray = load_library().get("ready", txt="point_ready.txt")
     # print("\n파일에서 불러온 jointarray:")
     # print(jointarray)
 
@@ -1,9 +1,8 @@
-# 현재 조인트를 읽고, txt파일에 씁니다.
+# 현재 조인트를 읽고, 자세 라이브러리(poses.bin)에 'start' 로 저장합니다.
 
-import os
 import rbpodo as rb
 import robotarm_functions as ra_fs
-import numpy as np
+from robotarm_poses import load_library, JOINT
 
 # ====== 메인 루틴 ======
 def _main():
@@ -30,27 +29,17 @@ def _main():
 
     robot.set_user_coordinate(rc, 0, joint)
 
-    # 저장할 파일 이름
-    filename = "point_start.txt"
+    # 자세 라이브러리 (파일 끝에 레코드 1개만 추가, 이전 값은 기록으로 남음)
+    poses = load_library()
 
     # 예시로 관절 초기값들
     data = ra_fs.read_joint(rc, robot)
 
-    # 1️⃣ 파일 존재 확인 및 저장
-    if not os.path.exists(filename):
-        print(f"'{filename}' 파일이 없어서 새로 생성합니다.")
-        with open(filename, "w") as f:
-            np.savetxt(f, [data], fmt="%.6f")
-    else:
-        print(f"'{filename}' 파일이 존재합니다. 데이터 덮어쓰기.")
-        with open(filename, "w") as f:
-            np.savetxt(f, [data], fmt="%.6f")
-
-    print("데이터 저장 완료 ✅")
-
-    # 2️⃣ 파일에서 불러오기 (jointarray에 저장)
-    jointarray = np.loadtxt(filename)
-    print("\n파일에서 불러온 jointarray:")
+    poses.put("start", data, kind=JOINT, note="set_start_point_set")
+    print(f"데이터 저장 완료 ✅ ({poses.path}, 'start' 기록 {len(poses.history('start'))}개)")
+
+    jointarray = poses.get("start")
+    print("\n라이브러리에서 불러온 jointarray:")
     print(jointarray)
 
 
@@ -6,6 +6,7 @@
 import rbpodo as rb
 import numpy as np
 import time
+from robotarm_gripper import PulseScheduler
 
 # ====== 로봇 IP 읽기 ======
 def read_robot_ip(filename="IP_robotarm.txt"):
@@ -23,22 +24,13 @@ def read_robot_ip(filename="IP_robotarm.txt"):
 
 
 # ====== 그리퍼 제어 함수 ======
-def grip(command, robot, rc):
-    """그리퍼 제어: 'grab' 또는 'release'"""
-    try:
-        if command == "release":
-            print("🔹 그리퍼: 릴리즈 동작")
-            robot.set_dout_bit_combination(rc, 0, 3, 1, rb.Endian.LittleEndian)
-            time.sleep(0.1)
-            robot.set_dout_bit_combination(rc, 0, 3, 0, rb.Endian.LittleEndian)
-
-        elif command == "grab":
-            print("🔹 그리퍼: 집기 동작")
-            robot.set_dout_bit_combination(rc, 0, 3, 2, rb.Endian.LittleEndian)
-            time.sleep(0.1)
-            robot.set_dout_bit_combination(rc, 0, 3, 0, rb.Endian.LittleEndian)
-    except Exception as e:
-        print(f"그리퍼 제어 오류: {e}")
+def grip(command, gripper):
+    """그리퍼 제어: 'grab' 또는 'release'. 펄스(100 ms)를 예약하고 바로 반환합니다."""
+    if command == "release":
+        print("🔹 그리퍼: 릴리즈 동작")
+    elif command == "grab":
+        print("🔹 그리퍼: 집기 동작")
+    return gripper.grip(command)
 
 
 # ====== 메인 루틴 ======
@@ -126,14 +118,16 @@ def _main():
 
     print("\n✅ 모든 조인트 테스트 완료.")
 
+    gripper = PulseScheduler(robot, rc)
     try:    
         # ====== 그리퍼 테스트 (각 관절 테스트 후 3회) ======
         for j in range(3):
             print(f"  ➜ 그리퍼 테스트 {j+1}/3")
-            grip("grab", robot, rc)
+            grip("grab", gripper).wait()
             time.sleep(0.1)
-            grip("release", robot, rc)
+            grip("release", gripper).wait()
             time.sleep(0.1)
+        print(gripper.format_stats()) # 실제 펄스 폭
     except Exception as e:
         print(f"⚠️ 로봇 제어 오류 (Joint {i}): {e}")
         try:
@@ -141,6 +135,7 @@ def _main():
         except:
             pass
     finally:
+        gripper.stop()
         time.sleep(0.5)  # 관절 간 안전 간격
         
     print("\n✅ 공압 동작 테스트 완료.")